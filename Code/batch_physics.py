@@ -0,0 +1,165 @@
+import numpy as np
+
+from player import Player
+
+
+class BatchPhysics:
+    """Player physics for N independent agents on one course, using NumPy arrays.
+
+    Every step reproduces Player.jump() followed by Player.move() for all
+    agents at once: input acceleration, friction, velocity clamping, gravity
+    and landing on the first platform (in list order) that satisfies
+    check_standing_on_platform or check_platform_collision.
+    """
+
+    def __init__(self, platforms, count, x, y, bucket_width=200, player=None):
+        # Physics constants come from a Player so both engines stay in sync
+        player = player or Player(x, y)
+        self.width = player.width
+        self.height = player.height
+        self.acceleration_x = player.acceleration_x
+        self.friction = player.friction
+        self.gravity = player.gravity
+        self.jump_strength = player.jump_strength
+        self.max_velocity_x = player.max_velocity_x
+        self.max_velocity_y = player.max_velocity_y
+
+        self.count = count
+        self.x = np.full(count, x, dtype=np.float64)
+        self.y = np.full(count, y, dtype=np.float64)
+        self.velocity_x = np.zeros(count, dtype=np.float64)
+        self.velocity_y = np.zeros(count, dtype=np.float64)
+        self.on_ground = np.zeros(count, dtype=bool)
+        self.facing_right = np.ones(count, dtype=bool)
+        self.jump_count = np.zeros(count, dtype=np.int64)
+
+        self.bucket_width = bucket_width
+        self.set_platforms(platforms)
+
+    def set_platforms(self, platforms):
+        """Store the course and build the per-bucket candidate platform table"""
+        self.platform_x = np.array([p.x for p in platforms], dtype=np.float64)
+        self.platform_y = np.array([p.y for p in platforms], dtype=np.float64)
+        self.platform_width = np.array([p.width for p in platforms], dtype=np.float64)
+
+        # A platform can only touch an agent whose x lies in [px - width, px + platform_width]
+        reach_min = self.platform_x - self.width
+        reach_max = self.platform_x + self.platform_width
+
+        if len(platforms):
+            self.bucket_origin = np.floor(reach_min.min() / self.bucket_width) * self.bucket_width
+            bucket_count = int((reach_max.max() - self.bucket_origin) // self.bucket_width) + 1
+        else:
+            self.bucket_origin = 0.0
+            bucket_count = 1
+
+        # candidates[b] lists (in original list order) the platforms reachable from bucket b,
+        # padded with -1; keeping list order preserves Player.move's first-match rule
+        buckets = [[] for _ in range(bucket_count)]
+        first = ((reach_min - self.bucket_origin) // self.bucket_width).astype(int)
+        last = ((reach_max - self.bucket_origin) // self.bucket_width).astype(int)
+        for index in range(len(platforms)):
+            for bucket in range(first[index], last[index] + 1):
+                buckets[bucket].append(index)
+
+        depth = max(1, max(len(bucket) for bucket in buckets))
+        self.candidates = np.full((bucket_count, depth), -1, dtype=np.int64)
+        for bucket, indices in enumerate(buckets):
+            self.candidates[bucket, :len(indices)] = indices
+
+    def step(self, left=False, right=False, jump=False, min_velocity_x=None):
+        """Advance every agent one frame.
+
+        left/right/jump are scalars or boolean arrays of length N. min_velocity_x
+        reproduces GameWindow's scroll push (velocity_x = max(velocity_x, scroll_speed)).
+        """
+        left = np.broadcast_to(np.asarray(left, dtype=bool), (self.count,))
+        right = np.broadcast_to(np.asarray(right, dtype=bool), (self.count,))
+        jump = np.broadcast_to(np.asarray(jump, dtype=bool), (self.count,))
+
+        # Player.jump()
+        jumping = jump & self.on_ground
+        self.velocity_y[jumping] = self.jump_strength
+        self.jump_count += jumping
+
+        if min_velocity_x is not None:
+            np.maximum(self.velocity_x, min_velocity_x, out=self.velocity_x)
+
+        # Horizontal input (same operation order as Player.move)
+        push = self.acceleration_x * 1.2
+        self.velocity_x[left] -= push
+        self.velocity_x[right] += push
+        self.facing_right[left] = False
+        self.facing_right[right] = True
+
+        # Friction when no movement key is held
+        coasting = ~(left | right) & (self.velocity_x != 0)
+        friction = np.minimum(np.abs(self.velocity_x[coasting]), self.friction)
+        self.velocity_x[coasting] -= np.where(self.velocity_x[coasting] > 0, friction, -friction)
+
+        # Clamp velocities
+        np.clip(self.velocity_x, -self.max_velocity_x, self.max_velocity_x, out=self.velocity_x)
+        np.clip(self.velocity_y, -self.max_velocity_y, self.max_velocity_y, out=self.velocity_y)
+
+        # Gravity only when airborne
+        self.velocity_y[~self.on_ground] += self.gravity
+
+        self.x += self.velocity_x
+        self.y += self.velocity_y
+
+        self.resolve_platforms()
+
+    def resolve_platforms(self):
+        """Land agents on the first candidate platform they stand on or fall onto"""
+        bucket = ((self.x - self.bucket_origin) // self.bucket_width).astype(np.int64)
+        in_range = (bucket >= 0) & (bucket < len(self.candidates))
+        candidates = self.candidates[np.clip(bucket, 0, len(self.candidates) - 1)]
+        valid = (candidates >= 0) & in_range[:, None]
+        candidates = np.where(valid, candidates, 0)
+
+        platform_x = self.platform_x[candidates]
+        platform_y = self.platform_y[candidates]
+        platform_width = self.platform_width[candidates]
+
+        x = self.x[:, None]
+        feet = (self.y + self.height)[:, None]
+        velocity_y = self.velocity_y[:, None]
+
+        # Shared x-bounds test of check_standing_on_platform / check_platform_collision
+        within_x = ~((x + self.width < platform_x) | (x > platform_x + platform_width))
+        standing = np.abs(feet - platform_y) <= 2
+        landing = (velocity_y >= 0) & (feet >= platform_y) & (feet - velocity_y < platform_y)
+        hits = valid & within_x & (standing | landing)
+
+        landed = hits.any(axis=1)
+        first = hits.argmax(axis=1)
+        top = platform_y[np.arange(self.count), first]
+
+        self.on_ground = landed
+        self.velocity_y[landed] = 0
+        self.y[landed] = top[landed] - self.height
+
+    def state(self, index):
+        """Return (x, y, velocity_x, velocity_y, on_ground) of one agent"""
+        return (float(self.x[index]), float(self.y[index]), float(self.velocity_x[index]),
+                float(self.velocity_y[index]), bool(self.on_ground[index]))
+
+
+def build_course(seed, length, window=None):
+    """Generate a course of the given length (pixels) and return all its platforms in order"""
+    from game_window import GameWindow
+
+    window = window or GameWindow(headless=True, seed=seed)
+    window.rng.seed(seed)
+    window.reset_game()
+
+    platforms = list(window.platforms)
+    seen = set(map(id, platforms))
+    while window.camera_offset_x < length:
+        window.camera_offset_x += window.SCREEN_WIDTH // 2
+        window.generate_new_elements()
+        for platform in window.platforms:
+            if id(platform) not in seen:
+                seen.add(id(platform))
+                platforms.append(platform)
+    return platforms
@@ -0,0 +1,1419 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Benchmarks never open a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+def bench_env_steps(args):
+    """Steps per second of a single headless GameEnv with a simple scripted policy"""
+    from game_env import GameEnv
+
+    env = GameEnv(seed=args.seed)
+    steps = 0
+    episodes = 0
+    start = time.perf_counter()
+    while steps < args.steps:
+        env.reset(args.seed + episodes)
+        episodes += 1
+        done = False
+        while not done and steps < args.steps:
+            # Run right and jump every 40 frames
+            _, _, done, _ = env.step(5 if steps % 40 == 0 else 2)
+            steps += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"env_steps: {steps} steps, {episodes} episodes in {elapsed:.2f}s "
+          f"-> {steps / elapsed:,.0f} steps/s")
+
+
+def bench_physics_equivalence(args):
+    """Check BatchPhysics against scalar Player.move() agent by agent (exits non-zero on mismatch)"""
+    import random
+    import pygame
+    from batch_physics import BatchPhysics, build_course
+    from player import Player
+
+    agents = 64
+    frames = min(args.steps, 2000)
+    platforms = build_course(args.seed, 20000)
+    rng = random.Random(args.seed)
+    inputs = [[(rng.random() < 0.2, rng.random() < 0.6, rng.random() < 0.05) for _ in range(agents)]
+              for _ in range(frames)]
+
+    players = [Player(100, 505) for _ in range(agents)]
+    batch = BatchPhysics(platforms, agents, 100, 505)
+    mismatches = 0
+    for frame in range(frames):
+        scroll = 3 if frame % 3 else None
+        for index, player in enumerate(players):
+            left, right, jump = inputs[frame][index]
+            if jump:
+                player.jump()
+            player.move(platforms, {pygame.K_LEFT: left, pygame.K_RIGHT: right}, min_velocity_x=scroll)
+
+        left, right, jump = (np.array(column) for column in zip(*inputs[frame]))
+        batch.step(left, right, jump, min_velocity_x=scroll)
+
+        for index, player in enumerate(players):
+            expected = (player.x, player.y, player.velocity_x, player.velocity_y, player.on_ground)
+            if batch.state(index) != expected:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"frame {frame} agent {index}: batch {batch.state(index)} != player {expected}")
+
+    print(f"physics_equivalence: {agents} agents x {frames} frames, {mismatches} mismatching states")
+    if mismatches:
+        sys.exit(1)
+
+
+def bench_batch_physics(args):
+    """Agent-steps per second of BatchPhysics compared with scalar Player.move()"""
+    import pygame
+    from batch_physics import BatchPhysics, build_course
+    from player import Player
+
+    platforms = build_course(args.seed, 50000)
+    keys = {pygame.K_LEFT: False, pygame.K_RIGHT: True}
+
+    players = [Player(100, 505) for _ in range(100)]
+    frames = max(1, args.steps // len(players))
+    start = time.perf_counter()
+    for _ in range(frames):
+        for player in players:
+            player.velocity_x = max(player.velocity_x, 3)
+            player.move(platforms, keys)
+    scalar_rate = frames * len(players) / (time.perf_counter() - start)
+    print(f"batch_physics: scalar Player.move -> {scalar_rate:,.0f} agent-steps/s")
+
+    for agents in (1000, 10000):
+        batch = BatchPhysics(platforms, agents, 100, 505)
+        right = np.ones(agents, dtype=bool)
+        jump = np.random.default_rng(args.seed).random((200, agents)) < 0.02
+        start = time.perf_counter()
+        for frame in range(200):
+            batch.step(False, right, jump[frame], min_velocity_x=3)
+        rate = 200 * agents / (time.perf_counter() - start)
+        print(f"batch_physics: {agents} agents -> {rate:,.0f} agent-steps/s ({rate / scalar_rate:.0f}x)")
+
+
+def bench_snapshot(args):
+    """Cost of snapshot()/restore() versus deepcopy, plus a restore-and-replay determinism check"""
+    import copy
+    import random
+    from game_env import GameEnv
+
+    env = GameEnv(seed=args.seed)
+    env.reset()
+    rng = random.Random(args.seed)
+    # Move into the generated part of the course first
+    for _ in range(600):
+        _, _, done, _ = env.step(rng.choice([2, 2, 5]))
+        if done:
+            env.reset()
+
+    count = 10000
+    start = time.perf_counter()
+    for _ in range(count):
+        snapshot = env.snapshot()
+    snapshot_us = (time.perf_counter() - start) / count * 1e6
+
+    start = time.perf_counter()
+    for _ in range(count):
+        env.restore(snapshot)
+    restore_us = (time.perf_counter() - start) / count * 1e6
+
+    window = env.window
+    state = (window.player, window.platforms, window.coins, window.obstacles, window.moving_obstacles,
+             window.game_manager.death_causes, window.game_manager.data_points, window.rng)
+    start = time.perf_counter()
+    for _ in range(100):
+        copy.deepcopy(state)
+    deepcopy_us = (time.perf_counter() - start) / 100 * 1e6
+
+    print(f"snapshot: snapshot {snapshot_us:.1f}us, restore {restore_us:.1f}us, "
+          f"deepcopy {deepcopy_us:.1f}us ({deepcopy_us / (snapshot_us + restore_us):.0f}x slower); "
+          f"{len(window.platforms)} platforms, {len(window.coins)} coins, {len(window.obstacles)} obstacles")
+
+    # Forking must be exact: replaying the same inputs from a restore gives the same trajectory
+    actions = [rng.choice([0, 2, 2, 5]) for _ in range(300)]
+
+    def rollout():
+        trace = []
+        for action in actions:
+            _, reward, done, _ = env.step(action)
+            trace.append((window.player.x, window.player.y, reward, window.game_manager.score, done))
+            if done:
+                break
+        return trace
+
+    first = rollout()
+    env.restore(snapshot)
+    second = rollout()
+    print(f"snapshot: replay after restore {'matches' if first == second else 'DIFFERS'} "
+          f"over {len(first)} frames")
+    if first != second:
+        sys.exit(1)
+
+
+def bench_swept_collision(args):
+    """Frames per second at coarser steps, plus tunneling and 1x-equivalence checks of coarse steps"""
+    import pygame
+    from game_env import GameEnv
+    from obstacle import Obstacle
+    from platform_obj import Platform
+    from player import Player
+
+    keys = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+
+    # Falling at terminal velocity onto a thin platform: 8 frames move the feet 120px past a 10px slab
+    platform = Platform(0, 300, 200, 10)
+    player = Player(50, 300 - 50 - 20)
+    player.on_ground = False
+    player.velocity_y = player.max_velocity_y
+    end_overlap = Player(50, player.y)
+    end_overlap.y += player.max_velocity_y * 8
+    naive_lands = end_overlap.get_rect().colliderect(platform.get_rect())
+    player.move([platform], keys, steps=8)
+    swept_lands = player.on_ground
+    print(f"swept_collision: 8-frame fall onto 10px platform: end-of-step overlap "
+          f"{'lands' if naive_lands else 'tunnels'}, swept {'lands' if swept_lands else 'tunnels'}")
+
+    # Running at full speed through a thin obstacle
+    env = GameEnv(seed=args.seed, frame_skip=8)
+    env.reset()
+    window = env.window
+    window.current_delay = 0
+    player = window.player
+    player.velocity_x = player.max_velocity_x
+    obstacle = Obstacle(player.x + player.width + 20, player.y, 10, player.height)
+    window.obstacles.append(obstacle)
+    env.step(2)
+    naive_hit = player.get_rect().colliderect(obstacle.get_rect())
+    swept_hit = window.game_manager.game_over
+    print(f"swept_collision: 8-frame dash through 10px obstacle: end-of-step overlap "
+          f"{'hits' if naive_hit else 'tunnels'}, swept {'hits' if swept_hit else 'tunnels'}")
+    if not (swept_lands and swept_hit):
+        sys.exit(1)
+
+    # Equivalence: seeded courses and inputs (held for 8 frames, jumps at step starts) played through
+    # GameWindow.update() with single frames and with coarse steps must agree at every step boundary:
+    # the start delay, scroll push and speed ramp included. World generation draws from the level RNG
+    # once per step, so it's turned off and each course is a fixed set of platforms without coins or
+    # obstacles.
+    import random
+    from game_window import GameWindow
+
+    def play(window, seed, frame_skip, frames=1200):
+        rng = random.Random(seed)
+        window.reset_game(seed)
+        window.generate_new_elements = window.generate_obstacles = lambda: None
+        window.platforms = []
+        x = 0
+        for _ in range(60):
+            width = rng.randint(80, 300)
+            window.platforms.append(Platform(x, rng.randint(350, 500), width, 20))
+            x += width + rng.randint(30, 160)
+        window.coins.clear()
+        window.obstacles = []
+        window.moving_obstacles = []
+        player = window.player
+        player.x = window.platforms[0].x + 10
+        player.y = window.platforms[0].y - player.height
+        player.velocity_x = player.velocity_y = 0
+        player.on_ground = True
+        states = []
+        for _ in range(frames // 8):
+            window.held_keys = {pygame.K_LEFT: rng.random() < 0.3, pygame.K_RIGHT: rng.random() < 0.5}
+            if rng.random() < 0.3:
+                player.jump()
+            for _ in range(8 // frame_skip):
+                window.update(frame_skip)
+            game_over = window.game_manager.game_over
+            cause = next((cause for cause, count in window.game_manager.death_causes.items() if count), '')
+            if game_over:
+                # Single frames stop on the frame the game ends, coarse steps at the end of that step
+                states.append(cause)
+                break
+            states.append((player.x, player.y, player.velocity_x, player.velocity_y, player.on_ground,
+                           window.camera_offset_x, window.scroll_speed))
+        return states
+
+    windows = {frame_skip: GameWindow(headless=True, seed=args.seed) for frame_skip in (1, 2, 4, 8)}
+    trials = 100
+    for frame_skip in (2, 4, 8):
+        differing = sum(play(windows[1], args.seed + trial, 1) != play(windows[frame_skip], args.seed + trial,
+                                                                        frame_skip)
+                        for trial in range(trials))
+        print(f"swept_collision: {frame_skip}x steps vs single frames over {trials} seeded games: "
+              f"{differing} differ")
+        if differing:
+            sys.exit(1)
+
+    # Throughput: same simulated frame budget at 1x-8x step sizes
+    base_rate = None
+    for frame_skip in (1, 2, 4, 8):
+        env = GameEnv(seed=args.seed, frame_skip=frame_skip)
+        frames = 0
+        deaths = 0
+        start = time.perf_counter()
+        while frames < args.steps:
+            env.reset(args.seed + deaths)
+            done = False
+            step = 0
+            while not done and frames < args.steps:
+                _, _, done, _ = env.step(5 if step % max(1, 40 // frame_skip) == 0 else 2)
+                frames += frame_skip
+                step += 1
+            deaths += done
+        rate = frames / (time.perf_counter() - start)
+        base_rate = base_rate or rate
+        print(f"swept_collision: {frame_skip}x steps -> {rate:,.0f} frames/s "
+              f"({rate / base_rate:.1f}x), {deaths} games ended")
+
+
+def bench_replay(args):
+    """Replay size per minute, headless playback speed and keyframe seek latency/exactness"""
+    import random
+    import struct
+    import pygame
+    from game_window import GameWindow
+    from replay import INPUT_JUMP, ReplayPlayer, ReplayRecorder
+
+    # Keyframes every 2 seconds (default: 20) so that short scripted games still exercise seeking
+    keyframe_interval = 120
+    window = GameWindow(headless=True, seed=args.seed)
+    rng = random.Random(args.seed)
+    frames = min(args.steps, 36000)
+    sessions = []
+    recorded = 0
+    start = time.perf_counter()
+    while recorded < frames:
+        # Record back-to-back games, each its own replay, with human-like held keys and jumps
+        window.held_keys[pygame.K_LEFT] = False
+        window.held_keys[pygame.K_RIGHT] = False
+        window.reset_game(rng.randrange(2 ** 32))
+        window.recorder = ReplayRecorder(window.seed, window.FPS, keyframe_interval)
+        trajectory = []
+        right = True
+        while not window.game_manager.game_over and recorded < frames:
+            window.input_bits = 0
+            if rng.random() < 0.05:
+                right = rng.random() < 0.9
+            if rng.random() < 0.03 and window.player.on_ground:
+                window.player.jump()
+                window.input_bits |= INPUT_JUMP
+            window.held_keys[pygame.K_RIGHT] = right
+            window.update()
+            window.recorder.end_frame(window, window.frame_input_bits())
+            player = window.player
+            trajectory.append((player.x, player.y, player.velocity_x, player.velocity_y,
+                               window.camera_offset_x, window.scroll_speed))
+            recorded += 1
+        sessions.append((window.recorder.to_bytes(), trajectory))
+    record_seconds = time.perf_counter() - start
+
+    minutes = recorded / window.FPS / 60
+    replay_bytes = sum(len(data) for data, _ in sessions)
+    input_bytes = sum(len(data) - sum(length for _, _, length in ReplayPlayer(data).index)
+                      for data, _ in sessions)
+    trajectory_bytes = recorded * struct.calcsize('<6d')
+    print(f"replay: recorded {len(sessions)} games, {recorded} frames ({minutes:.1f} min) in {record_seconds:.1f}s")
+    print(f"replay: {replay_bytes / minutes / 1024:.1f} KB/min with a keyframe every {keyframe_interval} frames "
+          f"({input_bytes / minutes / 1024:.2f} KB/min without keyframes) vs "
+          f"{trajectory_bytes / minutes / 1024:,.0f} KB/min for a per-frame trajectory")
+
+    played = 0
+    mismatches = 0
+    seeks = 0
+    seek_seconds = 0.0
+    start = time.perf_counter()
+    players = []
+    for data, trajectory in sessions:
+        # Playback runs without a recorder, so a recorder that touched the game (e.g. re-seeding the
+        # level generator at keyframes) would show up as a diverging frame
+        replay = ReplayPlayer(data)
+        diverged = False
+        for state in trajectory:
+            replay.step()
+            window = replay.window
+            player = window.player
+            diverged = diverged or state != (player.x, player.y, player.velocity_x, player.velocity_y,
+                                             window.camera_offset_x, window.scroll_speed)
+        played += replay.frame
+        mismatches += diverged
+        players.append(replay)
+    elapsed = time.perf_counter() - start
+    print(f"replay: played back {played} frames at {played / elapsed:,.0f} frames/s, "
+          f"{mismatches} games diverging from the recorded game")
+
+    # Seek to random frames (backwards and forwards) and compare with the recording
+    for replay, (_, trajectory) in zip(players, sessions):
+        for _ in range(3):
+            target = rng.randrange(1, len(trajectory) + 1)
+            start = time.perf_counter()
+            replay.seek(target)
+            seek_seconds += time.perf_counter() - start
+            seeks += 1
+            window = replay.window
+            state = window.player
+            if (state.x, state.y, state.velocity_x, state.velocity_y,
+                    window.camera_offset_x, window.scroll_speed) != trajectory[target - 1]:
+                mismatches += 1
+    print(f"replay: {seeks} random seeks, {seek_seconds / seeks * 1000:.2f}ms each, "
+          f"{mismatches} mismatching states in total")
+    if mismatches:
+        sys.exit(1)
+
+
+def bench_stats_split(args):
+    """Bytes and time for summary queries on a legacy mixed stats file versus the split summary file"""
+    import csv
+    import random
+    import tempfile
+    import pandas as pd
+    from stats_store import SUMMARY_COLUMNS, migrate, read_stats
+
+    rng = random.Random(args.seed)
+    sessions = max(1000, args.steps // 5)
+    with tempfile.TemporaryDirectory() as directory:
+        legacy = os.path.join(directory, 'game_stats.csv')
+        with open(legacy, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(SUMMARY_COLUMNS)
+            for session in range(sessions):
+                # Summary row first, then a sample every 10 seconds of play (as GameManager wrote them)
+                length = rng.expovariate(1 / 60)
+                writer.writerow([f"{session:014d}", '2025-05-11 12:00:00', round(length * 150, 2),
+                                 int(length / 5), int(length / 2), int(length / 2) * 10, round(length, 2),
+                                 rng.choice(['falling', 'obstacle', 'left_behind'])])
+                for sample in range(int(length // 10)):
+                    writer.writerow([f"{session:014d}", '2025-05-11 12:00:00', sample * 1500, sample * 2,
+                                     sample * 5, sample * 20, 0, ''])
+
+        start = time.perf_counter()
+        unique = pd.read_csv(legacy).drop_duplicates(subset=['session_id'])
+        legacy_seconds = time.perf_counter() - start
+        legacy_bytes = os.path.getsize(legacy)
+
+        summary = os.path.join(directory, 'sessions.csv')
+        _, samples = migrate(legacy, summary, os.path.join(directory, 'samples.csv'))
+        start = time.perf_counter()
+        split = read_stats(summary)
+        split_seconds = time.perf_counter() - start
+        summary_bytes = os.path.getsize(summary)
+
+    print(f"stats_split: {sessions} sessions, {samples} samples")
+    print(f"stats_split: legacy file {legacy_bytes / 1e6:.1f}MB read+dedupe in {legacy_seconds * 1000:.0f}ms; "
+          f"summary file {summary_bytes / 1e6:.1f}MB ({summary_bytes / legacy_bytes:.0%} of the bytes) "
+          f"read in {split_seconds * 1000:.0f}ms")
+    if len(split) != len(unique):
+        sys.exit(1)
+
+
+def bench_stats_ingest(args):
+    """Memory and parse time of the typed stats schema versus inferred dtypes (5M rows by default)"""
+    import tempfile
+    import pandas as pd
+    from stats_store import HAVE_PYARROW, load_typed, read_stats, write_dataframe
+
+    rows = args.steps * 100
+    rng = np.random.default_rng(args.seed)
+    seconds = rng.integers(0, 365 * 86400, rows)
+    df = pd.DataFrame({
+        'session_id': (20250101000000 + np.arange(rows)).astype(str),
+        'timestamp': (pd.Timestamp('2025-01-01') + pd.to_timedelta(seconds, unit='s')).strftime('%Y-%m-%d %H:%M:%S'),
+        'distance_traveled': rng.uniform(100, 5000, rows).round(2),
+        'coins_collected': rng.integers(0, 50, rows),
+        'jump_count': rng.integers(0, 100, rows),
+        'score': rng.integers(0, 1000, rows),
+        'completion_time': rng.uniform(1, 300, rows).round(2),
+        'death_cause': rng.choice(['falling', 'obstacle', 'left_behind'], rows),
+    })
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'sessions.csv')
+        write_dataframe(path, 'summary', df)
+        del df
+        print(f"stats_ingest: {rows:,} rows, {os.path.getsize(path) / 1e6:.0f}MB file")
+
+        # What StatsWindow.load_data did before: inferred dtypes, then a guessing datetime parse
+        start = time.perf_counter()
+        inferred = read_stats(path)
+        inferred['timestamp'] = pd.to_datetime(inferred['timestamp'])
+        inferred_seconds = time.perf_counter() - start
+        inferred_mb = inferred.memory_usage(deep=True).sum() / 1e6
+        print(f"stats_ingest: inferred dtypes {inferred_seconds:.2f}s, {inferred_mb:,.0f}MB in memory")
+        del inferred
+
+        for engine in ['c'] + (['pyarrow'] if HAVE_PYARROW else []):
+            start = time.perf_counter()
+            typed = load_typed(path, engine=engine)
+            typed_seconds = time.perf_counter() - start
+            typed_mb = typed.memory_usage(deep=True).sum() / 1e6
+            print(f"stats_ingest: typed schema ({engine} engine) {typed_seconds:.2f}s "
+                  f"({inferred_seconds / typed_seconds:.1f}x faster), {typed_mb:,.0f}MB in memory "
+                  f"({typed_mb / inferred_mb:.0%})")
+            if len(typed) != rows:
+                sys.exit(1)
+            del typed
+
+
+def bench_quantile_sketch(args):
+    """Sketch percentiles versus exact ones, sketch size, and merged per-day sketches versus one overall sketch"""
+    from quantile_sketch import QuantileSketch, RELATIVE_ACCURACY
+
+    sessions = args.steps * 10
+    rng = np.random.default_rng(args.seed)
+    # Heavy-tailed like real sessions: most die early, a few run for minutes
+    data = {
+        'completion_time': rng.exponential(60, sessions).round(2),
+        'score': rng.integers(0, 50, sessions) * 10 + rng.exponential(300, sessions).astype(int),
+        'distance': rng.lognormal(6, 1, sessions).round(2),
+    }
+    days = 30
+    failed = False
+    for metric, values in data.items():
+        start = time.perf_counter()
+        daily = [QuantileSketch() for _ in range(days)]
+        for i, value in enumerate(values.tolist()):
+            daily[i % days].add(value)
+        add_seconds = time.perf_counter() - start
+        overall = QuantileSketch()
+        for sketch in daily:
+            overall.merge(sketch)
+
+        errors = []
+        for p, estimate in overall.percentiles().items():
+            exact = np.percentile(values, p, method='lower')
+            errors.append(abs(estimate - exact) / exact if exact else abs(estimate))
+        print(f"quantile_sketch: {metric:>15} {sessions:,} values, {len(overall.buckets)} buckets, "
+              f"{add_seconds / sessions * 1e6:.2f}us/add, max relative error {max(errors):.3%} "
+              f"(bound {RELATIVE_ACCURACY:.0%})")
+        failed = failed or max(errors) > RELATIVE_ACCURACY + 1e-9
+
+        # Merging per-day sketches must give exactly the sketch of all the values
+        single = QuantileSketch()
+        for value in values.tolist():
+            single.add(value)
+        failed = failed or single.buckets != overall.buckets or single.percentiles() != overall.percentiles()
+
+        # Ranks (for sessions below the leaderboards' top k): never below the true rank, and
+        # only above it by the values within the relative accuracy of the ranked one
+        descending = np.sort(values)[::-1]
+        for value in rng.choice(values, 200).tolist():
+            true_rank = int((descending > value).sum()) + 1
+            best_rank = int((descending > value * overall.gamma).sum()) + 1
+            failed = failed or not best_rank <= overall.rank(value) <= true_rank
+    if failed:
+        sys.exit(1)
+
+
+def bench_rollups(args):
+    """Rollup update cost and trend query time versus resampling every session, plus an exactness check"""
+    import tempfile
+    import pandas as pd
+    from rollups import Rollups
+    from stats_store import read_stats, write_dataframe
+
+    sessions = args.steps * 2
+    rng = np.random.default_rng(args.seed)
+    seconds = np.sort(rng.integers(0, 3 * 365 * 86400, sessions))
+    df = pd.DataFrame({
+        'timestamp': pd.Timestamp('2023-01-01') + pd.to_timedelta(seconds, unit='s'),
+        'distance_traveled': rng.uniform(100, 5000, sessions).round(2),
+        'coins_collected': rng.integers(0, 50, sessions),
+        'jump_count': rng.integers(0, 100, sessions),
+        'score': rng.integers(0, 1000, sessions),
+    })
+
+    rollups = Rollups()
+    start = time.perf_counter()
+    for row in df.to_dict('records'):
+        rollups.add(row)
+    add_seconds = time.perf_counter() - start
+    print(f"rollups: {sessions:,} sessions over 3 years, {add_seconds / sessions * 1e6:.1f}us per save, "
+          f"{sum(len(buckets) for buckets in rollups.buckets.values()):,} buckets")
+
+    with tempfile.TemporaryDirectory() as directory:
+        # What a trend chart has to load: the rollups sidecar instead of every session
+        rollups_path = os.path.join(directory, 'rollups.json')
+        rollups.save(rollups_path)
+        stats_path = os.path.join(directory, 'sessions.csv')
+        write_dataframe(stats_path, 'summary', df)
+        start = time.perf_counter()
+        Rollups.load(rollups_path)
+        load_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        read_stats(stats_path, parse_dates=['timestamp'])
+        read_seconds = time.perf_counter() - start
+        print(f"rollups: sidecar {os.path.getsize(rollups_path) / 1e6:.1f}MB loads in {load_seconds * 1000:.0f}ms, "
+              f"sessions file {os.path.getsize(stats_path) / 1e6:.1f}MB reads in {read_seconds * 1000:.0f}ms")
+
+    failed = False
+    for granularity, rule in (('hourly', 'h'), ('daily', 'D'), ('weekly', 'W-MON')):
+        start = time.perf_counter()
+        times, means = rollups.series(granularity, 'distance', 'mean')
+        _, maxima = rollups.series(granularity, 'score', 'max')
+        rollup_seconds = time.perf_counter() - start
+
+        # What the chart would need without rollups: a pass over every session
+        start = time.perf_counter()
+        resampled = df.set_index('timestamp').resample(rule, label='left', closed='left')
+        exact_means = resampled['distance_traveled'].mean().dropna()
+        exact_maxima = resampled['score'].max().dropna()
+        resample_seconds = time.perf_counter() - start
+
+        print(f"rollups: {granularity:>7} {len(times):,} points in {rollup_seconds * 1000:.1f}ms "
+              f"(resampling all sessions {resample_seconds * 1000:.1f}ms)")
+        failed = failed or list(exact_means.index) != times or \
+            not np.allclose(exact_means.values, means) or not np.array_equal(exact_maxima.values, maxima)
+    if failed:
+        sys.exit(1)
+
+
+def bench_sidecars(args):
+    """Sidecars after tournament and single-game writes match a rebuild from the stats files"""
+    import json
+    import tempfile
+    from datetime import datetime, timedelta
+    import tournament
+    from game_manager import SIDECARS, GameManager
+    from stats_store import SUMMARY_FILE
+
+    seeds = list(range(args.seed, args.seed + 24))
+    results, _ = tournament.run_tournament(seeds, 'jumper', workers=2, max_frames=1200)
+    # Rows from next week too, so one batch rotates the active file into a segment
+    next_week = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d %H:%M:%S')
+    late = [dict(result, summary=dict(result['summary'], session_id=f"late{result['seed']}", timestamp=next_week))
+            for result in results[16:]]
+
+    def state(index):
+        # Comparable contents (heap order in a loaded leaderboard depends on its history)
+        if hasattr(index, 'boards'):
+            return index.sessions, {metric: index.top(metric) for metric in index.boards}
+        return json.loads(json.dumps(index.buckets if hasattr(index, 'buckets') else
+                                     {'overall': {m: sk.to_dict() for m, sk in index.overall.items()},
+                                      'daily': {d: {m: sk.to_dict() for m, sk in sketches.items()}
+                                                for d, sketches in index.daily.items()}}))
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            began = time.perf_counter()
+            tournament.write_results(results[:8])
+            tournament.write_results(results[8:16])
+            batch_seconds = time.perf_counter() - began
+            # A finished game's save goes through the same path
+            GameManager.write_stats_rows([results[0]['summary'] | {'session_id': 'single'}], [])
+            tournament.write_results(late)
+            mismatched = [sidecar.__name__ for sidecar, path in SIDECARS
+                          if state(sidecar.load(path)) != state(sidecar.rebuild(SUMMARY_FILE))]
+        finally:
+            os.chdir(cwd)
+    print(f"sidecars: {len(results) + len(late) + 1} sessions in 4 writes (16 sessions in {batch_seconds * 1000:.0f}ms); "
+          f"{', '.join(mismatched) or 'no sidecar'} differs from a rebuild")
+    if mismatched:
+        sys.exit(1)
+
+
+def bench_plot_downsample(args):
+    """Agg draw time of StatsWindow-sized plots with every point versus LTTB / density binning"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from plot_downsample import downsample_line, downsample_scatter, marker_sizes
+
+    points = args.steps * 4
+    rng = np.random.default_rng(args.seed)
+    x = np.arange(points)
+    y = rng.normal(1000, 100, points).cumsum() / 100
+    spike = points // 3
+    y[spike] += 1e4  # A single-session peak must survive
+    scatter_x = rng.lognormal(6, 1, points)
+    scatter_y = scatter_x * rng.uniform(0.5, 1.5, points)
+    scatter_x[0], scatter_y[0] = scatter_x.max() * 2, 0  # And so must an outlier
+
+    def draw(plot):
+        fig, ax = plt.subplots(figsize=(8, 4))
+        start = time.perf_counter()
+        drawn = plot(ax)
+        fig.canvas.draw()
+        elapsed = time.perf_counter() - start
+        plt.close(fig)
+        return elapsed, drawn
+
+    full_line, _ = draw(lambda ax: ax.plot(x, y, 'g-o', linewidth=2))
+
+    def lttb_line(ax):
+        reduced_x, reduced_y = downsample_line(x, y, ax)
+        ax.plot(reduced_x, reduced_y, 'g-o', linewidth=2)
+        return reduced_x
+    reduced_line, line_x = draw(lttb_line)
+    print(f"plot_downsample: line of {points:,} points {full_line * 1000:.0f}ms, "
+          f"LTTB {len(line_x):,} points {reduced_line * 1000:.0f}ms")
+
+    full_scatter, _ = draw(lambda ax: ax.scatter(scatter_x, scatter_y, alpha=0.7, s=80))
+
+    def binned_scatter(ax):
+        binned_x, binned_y, counts, _ = downsample_scatter(scatter_x, scatter_y, ax)
+        ax.scatter(binned_x, binned_y, alpha=0.7, s=marker_sizes(counts, 8))
+        return binned_x, binned_y
+    reduced_scatter, (binned_x, binned_y) = draw(binned_scatter)
+    print(f"plot_downsample: scatter of {points:,} points {full_scatter * 1000:.0f}ms, "
+          f"density binned {len(binned_x):,} cells {reduced_scatter * 1000:.0f}ms")
+
+    if spike not in line_x or binned_x.max() != scatter_x.max():
+        print("plot_downsample: peak or outlier lost")
+        sys.exit(1)
+
+
+def bench_session_index(args):
+    """One session's samples through the byte-offset index versus reading and filtering every samples file"""
+    import tempfile
+    import pandas as pd
+    from game_manager import GameManager
+    from session_index import SessionIndex
+    from stats_segments import load_manifest, sample_segment_paths
+    from stats_store import prepare_stats_files, read_stats
+
+    sessions = args.steps // 5
+    weeks = 8
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        summary_path = os.path.join(directory, 'sessions.csv')
+        path = os.path.join(directory, 'samples.csv')
+        prepare_stats_files(summary_path, path)
+        append_seconds = []
+        written = {}
+        for session in range(sessions):
+            # One write per finished game, as GameManager.save_game_stats does; sessions span several weeks,
+            # so the summary and samples files are closed into segments along the way
+            session_id = str(20250106000000 + session)
+            ended = pd.Timestamp('2025-01-06') + pd.Timedelta(seconds=session * weeks * 7 * 86400 // sessions)
+            rows = [{'session_id': session_id, 'timestamp': ended.strftime('%Y-%m-%d %H:%M:%S'),
+                     'distance_traveled': sample * 150.0, 'coins_collected': sample, 'jump_count': sample * 3,
+                     'score': sample * 20} for sample in range(int(rng.integers(1, 60)))]
+            summary = dict(rows[-1], completion_time=len(rows) * 10.0, death_cause='falling')
+            start = time.perf_counter()
+            GameManager.write_stats_rows([summary], rows, summary_path, path)
+            append_seconds.append(time.perf_counter() - start)
+            written[session_id] = [{column: str(value) for column, value in row.items()} for row in rows]
+        # A write must not get slower as the history grows
+        early = np.median(append_seconds[:100]) * 1e6
+        late = np.median(append_seconds[-100:]) * 1e6
+        segment_files = sample_segment_paths(summary_path)
+        segment_bytes = sum(os.path.getsize(segment) for segment in segment_files)
+        print(f"session_index: {sessions:,} sessions over {weeks} weeks, {(segment_bytes + os.path.getsize(path)) / 1e6:.1f}MB "
+              f"samples: {len(segment_files)} closed segments, {os.path.getsize(path) / 1e6:.1f}MB still active; "
+              f"indexed write {early:.0f}us for the first sessions, {late:.0f}us for the last")
+
+        lookups = [str(20250106000000 + session) for session in rng.integers(0, sessions, 20)]
+        start = time.perf_counter()
+        index = SessionIndex.load(path, summary_path)
+        load_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        indexed = [index.read_session(session_id) for session_id in lookups]
+        indexed_seconds = (time.perf_counter() - start) / len(lookups)
+
+        start = time.perf_counter()
+        scanned = []
+        for session_id in lookups[:3]:
+            samples = pd.concat([read_stats(file, dtype=str) for file in segment_files + [path]])
+            scanned.append(samples[samples['session_id'] == session_id].to_dict('records'))
+        scan_seconds = (time.perf_counter() - start) / len(scanned)
+
+        print(f"session_index: index loads in {load_seconds * 1000:.0f}ms, lookup {indexed_seconds * 1000:.2f}ms; "
+              f"full scan {scan_seconds * 1000:.0f}ms per lookup")
+        # Every session is in exactly one segment (or the active file), rows in the order written
+        expected = [written[session_id] for session_id in lookups]
+        closed_rows = sum(segment.get('sample_rows', 0) for segment in load_manifest(summary_path))
+        if indexed != expected or indexed[:len(scanned)] != scanned or late > early * 3 or \
+                len(segment_files) < weeks - 1 or closed_rows + len(read_stats(path)) != \
+                sum(len(rows) for rows in written.values()):
+            sys.exit(1)
+
+
+def bench_stats_segments(args):
+    """Last-30-days query through the segment manifest versus loading one unsegmented history file"""
+    import tempfile
+    import pandas as pd
+    from stats_aggregates import OverviewAggregate
+    from stats_segments import close_active, load_manifest, load_sessions, overview_aggregate, segment_paths
+    from stats_store import load_typed, write_dataframe
+
+    rows = args.steps * 4
+    rng = np.random.default_rng(args.seed)
+    seconds = np.sort(rng.integers(0, 3 * 365 * 86400, rows))
+    timestamps = pd.Timestamp('2023-01-02') + pd.to_timedelta(seconds, unit='s')
+    df = pd.DataFrame({
+        'session_id': (20230101000000 + np.arange(rows)).astype(str),
+        'timestamp': timestamps.strftime('%Y-%m-%d %H:%M:%S'),
+        'distance_traveled': rng.uniform(100, 5000, rows).round(2),
+        'coins_collected': rng.integers(0, 50, rows),
+        'jump_count': rng.integers(0, 100, rows),
+        'score': rng.integers(0, 1000, rows),
+        'completion_time': rng.uniform(1, 300, rows).round(2),
+        'death_cause': rng.choice(['falling', 'obstacle', 'left_behind'], rows),
+    })
+    start = timestamps[-1] - pd.Timedelta(days=30)
+
+    with tempfile.TemporaryDirectory() as directory:
+        active = os.path.join(directory, 'sessions.csv')
+        write_dataframe(active, 'summary', df)
+        history_bytes = os.path.getsize(active)
+        began = time.perf_counter()
+        full = load_typed(active)
+        full = full[full['timestamp'] >= start]
+        full_seconds = time.perf_counter() - began
+
+        began = time.perf_counter()
+        close_active(active)
+        rotate_seconds = time.perf_counter() - began
+        segments = load_manifest(active)
+        segment_bytes = sum(segment['bytes'] for segment in segments)
+
+        began = time.perf_counter()
+        recent = load_sessions(start, active_file=active)
+        recent_seconds = time.perf_counter() - began
+        read = len(segment_paths(start, active_file=active)) - 1  # Minus the (empty) active file
+
+        # The Overview: merged per-segment partials versus aggregating the whole history
+        began = time.perf_counter()
+        overview = overview_aggregate(active).summary()
+        overview_seconds = time.perf_counter() - began
+        began = time.perf_counter()
+        history = load_sessions(active_file=active)
+        OverviewAggregate.from_dataframe(history).summary()
+        history_seconds = time.perf_counter() - began
+        total = len(history)
+
+    print(f"stats_segments: {rows:,} sessions over 3 years, {history_bytes / 1e6:.1f}MB as one file; "
+          f"{len(segments)} weekly segments, {segment_bytes / 1e6:.1f}MB compressed (split in {rotate_seconds:.1f}s)")
+    print(f"stats_segments: last 30 days ({len(recent):,} sessions): one file {full_seconds * 1000:.0f}ms, "
+          f"segments {recent_seconds * 1000:.0f}ms reading {read} of {len(segments)}")
+    print(f"stats_segments: Overview from segment partials {overview_seconds * 1000:.0f}ms vs "
+          f"loading the history {history_seconds * 1000:.0f}ms")
+    # Against the float64 source rows (the stats files hold float32 distances and times)
+    expected = OverviewAggregate.from_dataframe(df).summary()
+    mismatched = [key for key in expected if not np.isclose(overview[key], expected[key], rtol=1e-6)]
+    if mismatched:
+        print(f"stats_segments: Overview differs in {', '.join(mismatched)}")
+    if mismatched or total != rows or len(recent) != len(full) or not (recent['session_id'].values == full['session_id'].values).all():
+        sys.exit(1)
+
+
+def bench_live_stats(args):
+    """Picking up one new session: watcher poll and in-place redraw versus reloading and replotting"""
+    import tempfile
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    from stats_segments import load_sessions
+    from stats_store import SUMMARY_COLUMNS, append_rows, write_dataframe
+    from stats_watcher import StatsWatcher
+
+    rows = args.steps
+    rng = np.random.default_rng(args.seed)
+    df = pd.DataFrame({
+        'session_id': (20240101000000 + np.arange(rows)).astype(str),
+        'timestamp': (pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(rows) * 60, unit='s'))
+        .strftime('%Y-%m-%d %H:%M:%S'),
+        'distance_traveled': rng.uniform(100, 5000, rows).round(2),
+        'coins_collected': rng.integers(0, 50, rows),
+        'jump_count': rng.integers(0, 100, rows),
+        'score': rng.integers(0, 1000, rows),
+        'completion_time': rng.uniform(1, 300, rows).round(2),
+        'death_cause': rng.choice(['falling', 'obstacle', 'left_behind'], rows),
+    })
+    new_row = dict(df.iloc[-1], session_id='live', timestamp='2099-01-01 00:00:00')
+
+    with tempfile.TemporaryDirectory() as directory:
+        active = os.path.join(directory, 'sessions.csv')
+        write_dataframe(active, 'summary', df)
+        watcher = StatsWatcher(active)
+        began = time.perf_counter()
+        idle = watcher.poll()
+        idle_seconds = time.perf_counter() - began
+        append_rows(active, SUMMARY_COLUMNS, [new_row])
+
+        began = time.perf_counter()
+        new = watcher.poll()
+        poll_seconds = time.perf_counter() - began
+        began = time.perf_counter()
+        reloaded = load_sessions(active_file=active)
+        reload_seconds = time.perf_counter() - began
+
+    # The same scatter either rebuilt from scratch or pointed at the longer data
+    x = reloaded['distance_traveled'].to_numpy()
+    y = reloaded['score'].to_numpy()
+    fig, ax = plt.subplots(figsize=(8, 4))
+    scatter = ax.scatter(x[:-1], y[:-1], s=80)
+    ax.set_title('Score vs Distance')
+    fig.canvas.draw()
+    began = time.perf_counter()
+    scatter.set_offsets(np.column_stack([x, y]))
+    ax.update_datalim(scatter.get_offsets()[-1:])
+    ax.autoscale_view()
+    fig.canvas.draw()
+    update_seconds = time.perf_counter() - began
+    began = time.perf_counter()
+    fig.clear()
+    ax = fig.add_subplot()
+    ax.scatter(x, y, s=80)
+    ax.set_title('Score vs Distance')
+    fig.canvas.draw()
+    rebuild_seconds = time.perf_counter() - began
+    plt.close(fig)
+
+    print(f"live_stats: {rows:,} sessions; idle poll {idle_seconds * 1e6:.0f}us, "
+          f"poll with one new session {poll_seconds * 1000:.1f}ms vs full reload {reload_seconds * 1000:.0f}ms")
+    print(f"live_stats: scatter update {update_seconds * 1000:.0f}ms vs rebuild {rebuild_seconds * 1000:.0f}ms")
+    if idle is not None or new is None or list(new['session_id'].astype(str)) != ['live'] or len(reloaded) != rows + 1:
+        sys.exit(1)
+
+
+def bench_frame_governor(args):
+    """Render cost at each effects quality level, and how fast the governor reacts to load"""
+    from frame_governor import QUALITY_LEVELS, UPGRADE_FRAMES, WINDOW_FRAMES, FrameGovernor
+    from game_window import GameWindow
+
+    # A coin combo every frame: the heaviest particle load the game produces
+    window = GameWindow(seed=args.seed)
+    frames = 300
+    costs = []
+    for level in range(len(QUALITY_LEVELS)):
+        window.governor.set_level(level)
+        window.particles = []
+        began = time.perf_counter()
+        for _ in range(frames):
+            window.create_coin_collect_particles(window.player.x + 200, 300)
+            window.update_particles()
+            window.render()
+        costs.append((time.perf_counter() - began) * 1000 / frames)
+
+    # Synthetic frame times: two seconds over budget, then comfortably under it
+    governor = FrameGovernor(window.FPS)
+    levels = [governor.level]
+    for frame_ms in [24.0] * 120 + [5.0] * (UPGRADE_FRAMES * len(QUALITY_LEVELS) + 60):
+        governor.record(frame_ms)
+        levels.append(governor.level)
+    lowest = len(QUALITY_LEVELS) - 1
+    down = levels.index(lowest)
+    up = levels.index(0, down)
+
+    for level, cost in zip(QUALITY_LEVELS, costs):
+        print(f"frame_governor: {level['name']:>6} quality render {cost:.2f}ms/frame")
+    print(f"frame_governor: {QUALITY_LEVELS[lowest]['name']} after {down} slow frames "
+          f"({WINDOW_FRAMES} per step), back to {QUALITY_LEVELS[0]['name']} {up - 120} frames after the load; "
+          f"telemetry {governor.telemetry()}")
+    if down != WINDOW_FRAMES * lowest or costs[-1] > costs[0]:
+        sys.exit(1)
+
+
+def bench_render_scale(args):
+    """Frame render cost at each internal resolution and window size, and runtime resolution switching"""
+    from frame_governor import RESOLUTION_LEVELS, UPGRADE_FRAMES, WINDOW_FRAMES
+    from game_window import GameWindow
+
+    frames = 200
+    for window_size in [(800, 600), (1600, 1200)]:
+        costs = []
+        for level in RESOLUTION_LEVELS:
+            window = GameWindow(seed=args.seed, render_scale=level['render_scale'], window_size=window_size)
+            for _ in range(frames):
+                window.update()
+            began = time.perf_counter()
+            for _ in range(frames):
+                window.render()
+            costs.append(f"{level['render_scale']:g}x {(time.perf_counter() - began) * 1000 / frames:.2f}ms")
+        print(f"render_scale: {window_size[0]}x{window_size[1]} window: {', '.join(costs)} per frame")
+
+    # Automatic: squeeze the fill budget so the real fill cost exceeds it, then relax it
+    window = GameWindow(seed=args.seed)
+    governor = window.resolution_governor
+    budget = governor.budget_ms
+    governor.budget_ms = 1e-6
+    for _ in range(WINDOW_FRAMES * len(RESOLUTION_LEVELS)):
+        window.render()
+    lowered = window.world_surface.get_size()
+    governor.budget_ms = budget * 1000
+    for _ in range(UPGRADE_FRAMES * len(RESOLUTION_LEVELS)):
+        window.render()
+    restored = window.world_surface.get_size()
+    print(f"render_scale: automatic target went to {lowered[0]}x{lowered[1]} when over the fill budget, "
+          f"back to {restored[0]}x{restored[1]} with headroom ({governor.downgrades} down, {governor.upgrades} up)")
+    if lowered != (400, 300) or restored != (800, 600) or window.world_surface is not window.screen:
+        sys.exit(1)
+
+
+def bench_memory_soak(args):
+    """Headless soak: one long session (steps x 10 frames), failing if entity counts or traced memory grow"""
+    from game_window import GameWindow
+    from memory_monitor import MemoryMonitor, growth
+
+    frames_per_step = 10
+    window = GameWindow(headless=True, seed=args.seed)
+    monitor = MemoryMonitor(window, interval_ms=60000, trace=True)
+    window.game_manager.start_timer()
+    respawns = 0
+    began = time.perf_counter()
+    for _ in range(args.steps):
+        window.update(frames_per_step)
+        if window.game_manager.game_over:
+            # Keep the session going: put the player back on screen above the course
+            respawns += 1
+            window.game_manager.game_over = False
+            window.player.x = window.camera_offset_x + 200
+            window.player.y = 100
+            window.player.velocity_y = 0
+        monitor.tick(frames_per_step)
+    elapsed = time.perf_counter() - began
+    samples = list(monitor.samples)
+    hours = monitor.game_time() / 3600000
+
+    failed = False
+    # data_points holds the session's samples until it is saved, so it grows by design
+    for name in [name for name in samples[0]['counts'] if name != 'data_points']:
+        early, late = growth(samples, name)
+        grew = late > early * 1.5 + 10
+        failed |= grew
+        print(f"memory_soak: {name:>16} max {early:>4} early, {late:>4} late{'  GROWING' if grew else ''}")
+    early, late = growth(samples, 'traced_kb')
+    # Allow for the session's data points (under half a KB each)
+    allowance = (samples[-1]['counts']['data_points'] - samples[len(samples) // 3]['counts']['data_points']) // 2
+    grew = late - early > 256 + allowance
+    failed |= grew
+    print(f"memory_soak: traced {early}KB early, {late}KB late{'  GROWING' if grew else ''}; "
+          f"RSS {samples[0]['rss_kb'] / 1024:.1f}MB -> {samples[-1]['rss_kb'] / 1024:.1f}MB")
+
+    # A restart must bring everything back to a fresh game's size
+    window.reset_game(args.seed)
+    fresh = GameWindow(headless=True, seed=args.seed)
+    restarted = monitor.sample()['counts']
+    expected = MemoryMonitor(fresh).sample()['counts']
+    if restarted != expected:
+        failed = True
+        print(f"memory_soak: after reset_game() {restarted}, fresh game {expected}")
+    print(f"memory_soak: {hours:.1f} simulated hours ({respawns} respawns) in {elapsed:.1f}s, "
+          f"{len(samples)} samples{', FAILED' if failed else ''}")
+    if failed:
+        sys.exit(1)
+
+
+def bench_restart(args):
+    """Restart-to-first-frame latency: reset_game() versus starting a new GameWindow"""
+    import statistics
+    from game_manager import GameManager
+    from game_window import GameWindow
+    from player import Player
+
+    def first_frame(window):
+        window.update()
+        window.render()
+
+    runs = 30
+    cold = []
+    for run in range(runs // 3):
+        began = time.perf_counter()
+        window = GameWindow(seed=args.seed + run)
+        first_frame(window)
+        cold.append(time.perf_counter() - began)
+
+    restarts = []
+    for run in range(runs):
+        for _ in range(120):
+            window.update()  # Play a little so there is state to throw away
+        began = time.perf_counter()
+        window.reset_game(args.seed + run)
+        first_frame(window)
+        restarts.append(time.perf_counter() - began)
+
+    # What every restart used to redo: a new Player (sprite load) and GameManager (stats file checks)
+    began = time.perf_counter()
+    for _ in range(runs):
+        Player(100, 505)
+    player_ms = (time.perf_counter() - began) * 1000 / runs
+    began = time.perf_counter()
+    for _ in range(runs):
+        GameManager(window.get_ticks, window.get_time)
+    manager_ms = (time.perf_counter() - began) * 1000 / runs
+
+    print(f"restart: first frame after reset_game() {statistics.median(restarts) * 1000:.2f}ms, "
+          f"after a new GameWindow {statistics.median(cold) * 1000:.1f}ms (medians)")
+    print(f"restart: no longer redone per restart: Player() {player_ms:.2f}ms, GameManager() {manager_ms:.2f}ms")
+
+    # The reused objects must start exactly like new ones (headless, so the clocks agree)
+    window = GameWindow(headless=True, seed=args.seed + 1)
+    for _ in range(300):
+        window.update()
+    window.reset_game(args.seed)
+    restarted = window.snapshot().to_dict()
+    fresh = GameWindow(headless=True, seed=args.seed).snapshot().to_dict()
+    for state in (restarted, fresh):
+        # Reachability audit counters deliberately run across games
+        del state['window']['checked_segments'], state['window']['unreachable_segments']
+    if restarted != fresh:
+        print("restart: reset_game() state differs from a new game")
+        sys.exit(1)
+
+
+def bench_sim_thread(args):
+    """Simulation tick regularity under render stalls, serial versus on a SimulationThread, and the overlap achieved"""
+    import statistics
+    from game_window import GameWindow
+    from replay import ReplayPlayer
+    from sim_thread import SimulationThread
+
+    seconds = 3
+
+    def stall(frame):
+        # Every 10th frame takes 40ms longer: 20ms waiting (the GIL is released) and 20ms of Python work
+        if frame % 10 == 0:
+            time.sleep(0.02)
+            end = time.perf_counter() + 0.02
+            while time.perf_counter() < end:
+                pass
+
+    def tick_gaps(tick_times):
+        gaps = [(b - a) * 1000 for a, b in zip(tick_times, tick_times[1:])]
+        return len(tick_times) / seconds, statistics.median(gaps), max(gaps)
+
+    def play(window, frame, post):
+        # Hold right, jump every 40 frames, restart after game over
+        if frame == 0:
+            post(('keys', False, True))
+        if frame % 40 == 0:
+            post(('jump', time.perf_counter()))
+        if window.game_manager.game_over:
+            post(('restart', args.seed + frame))
+
+    # Serial: each stall delays the next update
+    window = GameWindow(seed=args.seed)
+    window.game_manager.start_timer()
+    tick_times = []
+    frame = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        window.input_bits = 0
+        play(window, frame, window.apply_command)
+        window.update()
+        tick_times.append(time.perf_counter())
+        window.recorder.end_frame(window, window.frame_input_bits())
+        window.render()
+        stall(frame)
+        window.clock.tick(window.FPS)
+        frame += 1
+    rate, median_gap, max_gap = tick_gaps(tick_times)
+    print(f"sim_thread: serial   {frame / seconds:.1f} frames/s, {rate:.1f} ticks/s, "
+          f"tick gap median {median_gap:.1f}ms max {max_gap:.1f}ms")
+
+    # Threaded: the simulation keeps its rate while frames stall
+    window = GameWindow(seed=args.seed)
+    window.game_manager.start_timer()
+    simulation = SimulationThread(window)
+    simulation.start()
+    frame = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        frame_start = time.perf_counter()
+        play(window, frame, simulation.post)
+        window.render(simulation.latest)
+        stall(frame)
+        simulation.record_frame(frame_start, time.perf_counter())
+        window.clock.tick(window.FPS)
+        frame += 1
+    simulation.stop()
+    rate, median_gap, max_gap = tick_gaps([start for start, _ in simulation.busy])
+    print(f"sim_thread: threaded {frame / seconds:.1f} frames/s, {simulation.ticks / seconds:.1f} ticks/s, "
+          f"tick gap median {median_gap:.1f}ms max {max_gap:.1f}ms")
+    print(f"sim_thread: {simulation.summary()}")
+
+    # Input applied on the simulation thread must still replay exactly
+    replay = ReplayPlayer(window.recorder.to_bytes())
+    replay.play()
+    final = replay.window.player
+    player = window.player
+    if (final.x, final.y, final.velocity_x, final.velocity_y) != (player.x, player.y, player.velocity_x,
+                                                                  player.velocity_y):
+        print("sim_thread: replay of the threaded session ends in a different state")
+        sys.exit(1)
+
+
+def bench_frame_pacing(args):
+    """Frame interval jitter, dropped frames, input latency and CPU use of each pacing mode"""
+    import random
+    import pygame
+    from frame_pacing import PACING_MODES, FramePacer
+    from game_window import GameWindow
+    from sim_thread import SimulationThread
+
+    seconds = 3
+
+    def play(window, pacer, rng, simulation=None):
+        # A jump every half second, read by handle_events() like a real key press, and 2-10ms of
+        # varying work per frame on top of the game
+        cpu_start = time.process_time()
+        began = time.perf_counter()
+        frame = 0
+        while time.perf_counter() - began < seconds:
+            if frame % 30 == 0:
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+            if simulation is None:
+                window.handle_events()
+                window.update()
+                window.recorder.end_frame(window, window.frame_input_bits())
+                window.render()
+            else:
+                window.handle_events(simulation.post)
+                window.render(simulation.latest)
+            end = time.perf_counter() + rng.uniform(0.002, 0.010)
+            while time.perf_counter() < end:
+                pass
+            window.governor.record(pacer.wait())
+            if window.game_manager.game_over:
+                window.apply_command(('restart', rng.randrange(2 ** 32))) if simulation is None \
+                    else simulation.post(('restart', rng.randrange(2 ** 32)))
+            frame += 1
+        return (time.process_time() - cpu_start) / (time.perf_counter() - began)
+
+    def show(label, report, cpu):
+        print(f"frame_pacing: {label:<16} {report['fps']:5.1f} FPS, interval median {report['median_ms']:.2f}ms "
+              f"p95 {report['p95_ms']:.2f}ms p99 {report['p99_ms']:.2f}ms max {report['max_ms']:.1f}ms, "
+              f"jitter {report['jitter_ms']:.2f}ms, {report['dropped']} dropped, "
+              f"input to screen {report.get('input_ms', float('nan')):.1f}ms "
+              f"(max {report.get('input_max_ms', float('nan')):.1f}ms), CPU {cpu:.0%}")
+
+    failures = []
+    for mode in PACING_MODES:
+        window = GameWindow(seed=args.seed)
+        window.game_manager.start_timer()
+        window.pacer = pacer = FramePacer(window.clock, window.FPS, mode)
+        cpu = play(window, pacer, random.Random(args.seed))
+        report = pacer.report()
+        show(mode, report, cpu)
+        if 'input_ms' not in report:
+            failures.append(mode)
+
+    # The simulation thread applies input on its next tick, which shows in the frame after that
+    window = GameWindow(seed=args.seed)
+    window.game_manager.start_timer()
+    window.pacer = pacer = FramePacer(window.clock, window.FPS, 'hybrid')
+    window.simulation = simulation = SimulationThread(window)
+    simulation.start()
+    cpu = play(window, pacer, random.Random(args.seed), simulation)
+    simulation.stop()
+    window.simulation = None
+    report = pacer.report()
+    show('hybrid, threaded', report, cpu)
+    if 'input_ms' not in report:
+        failures.append('hybrid, threaded')
+
+    if failures:
+        print(f"frame_pacing: no input latency measured with {', '.join(failures)}")
+        sys.exit(1)
+
+
+def bench_density(args):
+    """How frame time scales with live entity count in stress runs at 1x, 10x and 100x world density"""
+    import statistics
+    import pygame
+    from game_window import GameWindow
+
+    frames = min(args.steps, 600)
+    warmup = 120  # Let the course fill the look-ahead window first
+    results = []
+    stale = 0  # Moving obstacles left behind by the cull
+    for density in (1, 10, 100):
+        window = GameWindow(seed=args.seed, density=density)
+        window.stress = True  # Play on after deaths at 1x too, so every density runs the same frames
+        window.game_manager.start_timer()
+        # No keys held (the scroll pushes the player along), a jump every 40 frames
+        window.held_keys = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+        update_ms = []
+        render_ms = []
+        live = []
+        for frame in range(warmup + frames):
+            if frame % 40 == 0:
+                window.apply_command(('jump', time.perf_counter()))
+            began = time.perf_counter()
+            window.update()
+            updated = time.perf_counter()
+            window.render()
+            rendered = time.perf_counter()
+            if frame >= warmup:
+                update_ms.append((updated - began) * 1000)
+                render_ms.append((rendered - updated) * 1000)
+                live.append(len(window.platforms) + len(window.coins) - window.coins.collected_count()
+                            + len(window.obstacles) + len(window.moving_obstacles) + len(window.particles))
+            # Culled at 800px behind the camera; allow a screen more for the camera moving after the cull
+            stale = max(stale, sum(obstacle.max_x < window.camera_offset_x - 1600
+                                   for obstacle in window.moving_obstacles))
+        update = statistics.median(update_ms)
+        render = statistics.median(render_ms)
+        entities = statistics.mean(live)
+        results.append((density, entities))
+        print(f"density: {density:>3}x {entities:8,.0f} live entities (max {max(live):,}), "
+              f"update {update:6.2f}ms, render {render:6.2f}ms, frame {update + render:6.2f}ms "
+              f"(p99 {sorted(u + r for u, r in zip(update_ms, render_ms))[int(len(live) * 0.99)]:.2f}ms), "
+              f"{(update + render) / entities * 1000:.1f}ms per 1000 entities")
+
+    # The multiplier must actually multiply the world
+    if results[1][1] < results[0][1] * 5:
+        print("density: 10x density has fewer than 5x the live entities")
+        sys.exit(1)
+    if stale:
+        print(f"density: {stale} moving obstacles far behind the camera were never culled")
+        sys.exit(1)
+
+
+def bench_coin_field(args):
+    """Vectorized coin pickup and template patterns versus per-coin Python, plus exactness checks"""
+    import math
+    import random
+    import pygame
+    from coin_field import COIN_RADIUS, PATTERN_TYPES, CoinField
+
+    rng = random.Random(args.seed)
+
+    def reference_pattern(start_x, start_y, pattern_type, count):
+        # The per-coin math add_coin_pattern() used before coins had templates
+        if pattern_type == "single":
+            return [(start_x, start_y)]
+        if pattern_type == "line":
+            return [(start_x + i * 30, start_y) for i in range(count)]
+        if pattern_type == "arc":
+            return [(start_x + i * 30, start_y - int(50 * abs(math.sin(3.14 * i / (count - 1)))))
+                    for i in range(count)]
+        if pattern_type == "zigzag":
+            return [(start_x + i * 30, start_y + (20 if i % 2 == 0 else -20)) for i in range(count)]
+        return [(start_x, start_y - i * 30) for i in range(count)]
+
+    def build(pattern_count):
+        field = CoinField()
+        coins = []
+        x = 0.0
+        for _ in range(pattern_count):
+            x += rng.randint(20, 120) + rng.random()
+            pattern = (rng.choice(PATTERN_TYPES), x, rng.randint(300, 500) + rng.choice([0, 0.5]), rng.randint(3, 8))
+            field.add_pattern(pattern[1], pattern[2], pattern[0], pattern[3])
+            coins.extend(reference_pattern(pattern[1], pattern[2], pattern[0], pattern[3]))
+        return field, coins
+
+    # Template patterns must place coins exactly where the per-coin math did
+    field, coins = build(500)
+    mismatches = int(sorted(coins, key=lambda coin: coin[0]) != list(zip(field.x.tolist(), field.y.tolist())))
+
+    # Pickup must match pygame.Rect.colliderect() against each coin's rect
+    for i in rng.sample(range(len(field)), len(field) // 4):
+        field.collected[i] = True
+    for _ in range(5000):
+        player = pygame.Rect(rng.uniform(-50, field.x[-1] + 50), rng.uniform(250, 550), 30, 50)
+        expected = [i for i, (x, y) in enumerate(zip(field.x.tolist(), field.y.tolist()))
+                    if not field.collected[i] and pygame.Rect(x - COIN_RADIUS, y - COIN_RADIUS, COIN_RADIUS * 2,
+                                                              COIN_RADIUS * 2).colliderect(player)]
+        if field.overlapping(player.x, player.y, player.width, player.height) != expected:
+            mismatches += 1
+    print(f"coin_field: templates and 5000 pickup tests against pygame rects, {mismatches} mismatches")
+
+    class Coin:
+        # The per-coin object the field replaced
+        def __init__(self, x, y):
+            self.x = x
+            self.y = y
+            self.radius = COIN_RADIUS
+            self.collected = False
+
+    for pattern_count in (20, 200, 2000):
+        field, coins = build(pattern_count)
+        objects = [Coin(x, y) for x, y in coins]
+        players = [pygame.Rect(rng.uniform(0, field.x[-1]), rng.uniform(300, 500), 30, 50) for _ in range(2000)]
+
+        start = time.perf_counter()
+        for player in players:
+            for coin in objects:
+                if not coin.collected and pygame.Rect(coin.x - coin.radius, coin.y - coin.radius,
+                                                      coin.radius * 2, coin.radius * 2).colliderect(player):
+                    pass
+        loop_us = (time.perf_counter() - start) / len(players) * 1e6
+        start = time.perf_counter()
+        for player in players:
+            field.overlapping(player.x, player.y, player.width, player.height)
+        field_us = (time.perf_counter() - start) / len(players) * 1e6
+        print(f"coin_field: {len(field):>6} coins: pickup test per-coin {loop_us:8.1f}us, "
+              f"field {field_us:5.1f}us ({loop_us / field_us:.0f}x)")
+
+    # Generating patterns: per-coin objects versus bulk templates
+    patterns = [(rng.choice(PATTERN_TYPES), rng.uniform(0, 1e5), rng.randint(300, 500), rng.randint(3, 8))
+                for _ in range(2000)]
+    start = time.perf_counter()
+    objects = []
+    for pattern_type, x, y, count in patterns:
+        objects.extend(Coin(cx, cy) for cx, cy in reference_pattern(x, y, pattern_type, count))
+    objects_us = (time.perf_counter() - start) / len(patterns) * 1e6
+    start = time.perf_counter()
+    field = CoinField()
+    for pattern_type, x, y, count in sorted(patterns, key=lambda pattern: pattern[1]):
+        # Culled like a game does, a couple of screens behind the newest pattern
+        field.cull(x - 2000)
+        field.add_pattern(x, y, pattern_type, count)
+    field_us = (time.perf_counter() - start) / len(patterns) * 1e6
+    print(f"coin_field: adding a pattern: per-coin objects {objects_us:.1f}us, field template {field_us:.1f}us")
+    if mismatches:
+        sys.exit(1)
+
+
+BENCHMARKS = {
+    'env_steps': bench_env_steps,
+    'physics_equivalence': bench_physics_equivalence,
+    'batch_physics': bench_batch_physics,
+    'snapshot': bench_snapshot,
+    'swept_collision': bench_swept_collision,
+    'replay': bench_replay,
+    'stats_split': bench_stats_split,
+    'stats_ingest': bench_stats_ingest,
+    'quantile_sketch': bench_quantile_sketch,
+    'rollups': bench_rollups,
+    'sidecars': bench_sidecars,
+    'plot_downsample': bench_plot_downsample,
+    'session_index': bench_session_index,
+    'stats_segments': bench_stats_segments,
+    'live_stats': bench_live_stats,
+    'frame_governor': bench_frame_governor,
+    'render_scale': bench_render_scale,
+    'memory_soak': bench_memory_soak,
+    'restart': bench_restart,
+    'sim_thread': bench_sim_thread,
+    'frame_pacing': bench_frame_pacing,
+    'density': bench_density,
+    'coin_field': bench_coin_field,
+}
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="CoinDash benchmark harness")
+    parser.add_argument('benchmarks', nargs='*',
+                        help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}")
+    parser.add_argument('--steps', type=int, default=50000, help="simulation steps per benchmark")
+    parser.add_argument('--seed', type=int, default=0, help="base RNG seed")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import math
+
+import numpy as np
+import pygame
+
+
+COIN_RADIUS = 10
+COIN_VALUE = 10
+COIN_COLOR = (255, 215, 0)  # Gold color
+COIN_SPACING = 30  # Distance between the coins of a pattern
+ARC_RADIUS = 50
+
+PATTERN_TYPES = ("single", "line", "arc", "zigzag", "vertical")
+EMPTY = np.zeros(0)
+
+
+def pattern_offsets(pattern_type, count):
+    """(dx, dy) arrays of a coin pattern's coins from its start position"""
+    i = np.arange(count)
+    if pattern_type == "single":
+        return np.zeros(1), np.zeros(1)
+    if pattern_type == "line":
+        return i * float(COIN_SPACING), np.zeros(count)
+    if pattern_type == "arc":
+        # Half circle, from 0 to pi (the same float math as the original per-coin loop)
+        dy = [-int(ARC_RADIUS * abs(math.sin(3.14 * n / (count - 1)))) for n in range(count)]
+        return i * float(COIN_SPACING), np.array(dy, dtype=np.float64)
+    if pattern_type == "zigzag":
+        return i * float(COIN_SPACING), np.where(i % 2 == 0, 20.0, -20.0)
+    if pattern_type == "vertical":
+        return np.zeros(count), i * -float(COIN_SPACING)
+    return EMPTY, EMPTY
+
+
+# Offset templates of every pattern the level generator uses (3-8 coins); other sizes are added on first use
+TEMPLATES = {(pattern_type, count): pattern_offsets(pattern_type, count)
+             for pattern_type in PATTERN_TYPES for count in range(3, 9)}
+
+
+def template(pattern_type, count):
+    """Cached pattern_offsets()"""
+    key = (pattern_type, count)
+    offsets = TEMPLATES.get(key)
+    if offsets is None:
+        offsets = TEMPLATES[key] = pattern_offsets(pattern_type, count)
+    return offsets
+
+
+class CoinField:
+    """All coins of a course as NumPy columns: x, y, radius, value and a collected mask.
+
+    Coins are kept sorted by x, so the coins near any x range are one
+    searchsorted() away and the ones far behind the camera are a prefix.
+    `boxes` holds each coin's pickup rect (left, top, right, bottom) the way
+    pygame.Rect truncates it, computed in bulk when coins are added. Only
+    `collected` is ever changed in place; adding and culling coins build new
+    arrays, so a snapshot can share the other columns and copy just the mask.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Remove all coins"""
+        self.x = EMPTY
+        self.y = EMPTY
+        self.radius = EMPTY
+        self.value = np.zeros(0, dtype=np.int64)
+        self.collected = np.zeros(0, dtype=bool)
+        self.boxes = np.zeros((0, 4))
+        self.max_radius = COIN_RADIUS
+
+    def __len__(self):
+        return len(self.x)
+
+    def add(self, x, y, radius=COIN_RADIUS, value=COIN_VALUE):
+        """Add coins at the positions in the x and y arrays"""
+        if not len(x):
+            return
+        count = len(x)
+        x = np.asarray(x, dtype=np.float64)
+        self.max_radius = max(self.max_radius, radius)
+        in_order = not len(self.x) or x[0] >= self.x[-1] and (count == 1 or np.all(x[1:] >= x[:-1]))
+        self.x = np.concatenate((self.x, x))
+        self.y = np.concatenate((self.y, np.asarray(y, dtype=np.float64)))
+        self.radius = np.concatenate((self.radius, np.full(count, radius, dtype=np.float64)))
+        self.value = np.concatenate((self.value, np.full(count, value, dtype=np.int64)))
+        self.collected = np.concatenate((self.collected, np.zeros(count, dtype=bool)))
+        self.boxes = np.concatenate((self.boxes, pickup_boxes(x, self.y[-count:], self.radius[-count:])))
+        if not in_order:
+            # Stable, so coins at the same x keep the order they were added in
+            order = np.argsort(self.x, kind='stable')
+            self.set_columns(self.x[order], self.y[order], self.radius[order], self.value[order],
+                             self.collected[order], self.boxes[order])
+
+    def add_pattern(self, start_x, start_y, pattern_type, count):
+        """Add a pattern of coins ("single", "line", "arc", "zigzag" or "vertical") starting at the given position"""
+        dx, dy = template(pattern_type, count)
+        self.add(start_x + dx, start_y + dy)
+
+    def columns(self):
+        """The (x, y, radius, value, boxes) arrays, which are never changed in place (for snapshots)"""
+        return self.x, self.y, self.radius, self.value, self.boxes
+
+    def set_columns(self, x, y, radius, value, collected, boxes=None):
+        """Replace all coins (columns already sorted by x; boxes are computed when not given)"""
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.value = value
+        self.collected = collected
+        self.max_radius = max(COIN_RADIUS, radius.max()) if len(radius) else COIN_RADIUS
+        self.boxes = pickup_boxes(x, y, radius) if boxes is None else boxes
+
+    def cull(self, min_x):
+        """Drop the coins left of min_x"""
+        start = self.x.searchsorted(min_x)
+        if start:
+            self.x = self.x[start:]
+            self.y = self.y[start:]
+            self.radius = self.radius[start:]
+            self.value = self.value[start:]
+            self.collected = self.collected[start:]
+            self.boxes = self.boxes[start:]
+
+    def span(self, left, right):
+        """(start, end) index range of the coins with left <= x <= right"""
+        return int(self.x.searchsorted(left)), int(self.x.searchsorted(right, 'right'))
+
+    def overlapping(self, left, top, width, height):
+        """Indices of the uncollected coins touching a pygame.Rect(left, top, width, height)
+
+        Coin boxes are truncated to integers the way pygame.Rect does, so the
+        result is exactly what colliderect() against each coin's rect gives.
+        """
+        margin = self.max_radius + 1
+        start, end = self.span(left - margin, left + width + margin)
+        if start == end:
+            return []
+        boxes = self.boxes[start:end]
+        hit = ((boxes[:, 0] < left + width) & (boxes[:, 2] > left) & (boxes[:, 1] < top + height)
+               & (boxes[:, 3] > top) & ~self.collected[start:end])
+        return (hit.nonzero()[0] + start).tolist()
+
+    def near(self, left, right):
+        """Indices of the uncollected coins whose box reaches into [left, right] on x"""
+        margin = self.max_radius
+        start, end = self.span(left - margin, right + margin)
+        x = self.x[start:end]
+        radius = self.radius[start:end]
+        keep = (x + radius >= left) & (x - radius <= right) & ~self.collected[start:end]
+        return (keep.nonzero()[0] + start).tolist()
+
+    def collect(self, i):
+        """Mark coin i as collected and return (value, x, y)"""
+        self.collected[i] = True
+        return int(self.value[i]), float(self.x[i]), float(self.y[i])
+
+    def collected_count(self):
+        """Number of collected coins still in the field"""
+        return int(np.count_nonzero(self.collected))
+
+    def visible(self, left, right):
+        """(x, y, radius) arrays of the uncollected coins with left <= x <= right (copies)"""
+        start, end = self.span(left, right)
+        keep = ~self.collected[start:end]
+        return self.x[start:end][keep], self.y[start:end][keep], self.radius[start:end][keep]
+
+
+def pickup_boxes(x, y, radius):
+    """(left, top, right, bottom) rows of pygame.Rect(x - radius, y - radius, 2 * radius, 2 * radius)"""
+    boxes = np.empty((len(x), 4))
+    boxes[:, 0] = np.trunc(x - radius)
+    boxes[:, 1] = np.trunc(y - radius)
+    size = np.trunc(radius * 2)
+    boxes[:, 2] = boxes[:, 0] + size
+    boxes[:, 3] = boxes[:, 1] + size
+    return boxes
+
+
+def draw_coins(screen, coins, camera_offset_x, scale=1):
+    """Draw the (x, y, radius) arrays from CoinField.visible() with camera offset (scale < 1 for a
+    low-resolution target)"""
+    x, y, radius = coins
+    draw_x = (x - camera_offset_x) * scale
+    # Only draw coins on screen
+    on_screen = (draw_x >= -radius * 2 * scale) & (draw_x <= screen.get_width())
+    for cx, cy, size in zip(draw_x[on_screen].astype(int).tolist(), (y[on_screen] * scale).astype(int).tolist(),
+                            np.maximum(1, np.round(radius[on_screen] * scale)).astype(int).tolist()):
+        pygame.draw.circle(screen, COIN_COLOR, (cx, cy), size)
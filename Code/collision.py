@@ -0,0 +1,48 @@
+INFINITY = float('inf')
+
+
+def boxes_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+    """Whether two axis-aligned boxes overlap"""
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def sweep_aabb(ax, ay, aw, ah, dx, dy, bx, by, bw, bh):
+    """Time of impact in [0, 1] of box A moving by (dx, dy) against static box B, or None.
+
+    Uses the slab method: the entry and exit times along each axis are
+    intersected, so thin boxes are hit even when A passes completely through
+    them within a single step.
+    """
+    if boxes_overlap(ax, ay, aw, ah, bx, by, bw, bh):
+        return 0.0
+
+    if dx == 0:
+        if not (ax < bx + bw and bx < ax + aw):
+            return None
+        x_entry, x_exit = -INFINITY, INFINITY
+    else:
+        t1 = (bx - (ax + aw)) / dx
+        t2 = (bx + bw - ax) / dx
+        x_entry, x_exit = min(t1, t2), max(t1, t2)
+
+    if dy == 0:
+        if not (ay < by + bh and by < ay + ah):
+            return None
+        y_entry, y_exit = -INFINITY, INFINITY
+    else:
+        t1 = (by - (ay + ah)) / dy
+        t2 = (by + bh - ay) / dy
+        y_entry, y_exit = min(t1, t2), max(t1, t2)
+
+    entry = max(x_entry, y_entry)
+    exit_time = min(x_exit, y_exit)
+    if entry >= exit_time or entry > 1 or exit_time <= 0:
+        return None
+    return max(entry, 0.0)
+
+
+def path_bounds(path, width, height):
+    """Bounding box (left, top, right, bottom) of a box of the given size along a path of points"""
+    xs = [point[0] for point in path]
+    ys = [point[1] for point in path]
+    return min(xs), min(ys), max(xs) + width, max(ys) + height
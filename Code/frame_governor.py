@@ -0,0 +1,105 @@
+from collections import deque
+
+
+# Effects quality levels, best first. The governor moves one level at a time.
+QUALITY_LEVELS = [
+    {'name': 'high', 'particles_per_coin': 8, 'max_particles': 400, 'draw_particles': True, 'hud_interval': 1},
+    {'name': 'medium', 'particles_per_coin': 4, 'max_particles': 64, 'draw_particles': True, 'hud_interval': 3},
+    {'name': 'low', 'particles_per_coin': 0, 'max_particles': 0, 'draw_particles': False, 'hud_interval': 6},
+]
+
+# Internal render resolutions (share of the 800x600 world), tried in order when filling pixels is slow
+RESOLUTION_LEVELS = [
+    {'name': 'full', 'render_scale': 1.0},
+    {'name': 'three-quarter', 'render_scale': 0.75},
+    {'name': 'half', 'render_scale': 0.5},
+]
+FILL_BUDGET_SHARE = 0.5  # Drawing and upscaling the world may take half the frame budget
+
+WINDOW_FRAMES = 30  # Frame times averaged for each decision (half a second at 60 FPS)
+HEADROOM = 0.6  # Step back up once frames take less than this share of the budget...
+UPGRADE_FRAMES = 180  # ...for this many frames in a row (3 seconds), so levels don't flap
+
+
+class FrameGovernor:
+    """Picks an effects quality level from recent frame times.
+
+    Frame times are the work done per frame (Clock.get_rawtime(), without
+    the tick delay). When the average over the last WINDOW_FRAMES frames
+    goes over the budget (1000 / FPS ms) quality drops one level; after
+    UPGRADE_FRAMES frames under HEADROOM of the budget it rises one level.
+    Each change starts a fresh window, so one slow frame never counts twice.
+    The same rules pick the internal render resolution from the fill cost
+    alone, with RESOLUTION_LEVELS and a share of the budget.
+    """
+
+    def __init__(self, fps=60, levels=QUALITY_LEVELS, budget_share=1.0):
+        self.budget_ms = 1000 / fps * budget_share
+        self.levels = levels
+        self.level = 0
+        self.frame_times = deque(maxlen=WINDOW_FRAMES)
+        self.fast_frames = 0  # Consecutive frames under the headroom threshold
+        # Telemetry
+        self.downgrades = 0
+        self.upgrades = 0
+        self.frames_at_level = [0] * len(levels)
+
+    @property
+    def settings(self):
+        """Settings of the current quality level"""
+        return self.levels[self.level]
+
+    @property
+    def quality(self):
+        """Name of the current quality level"""
+        return self.settings['name']
+
+    def record(self, frame_ms):
+        """Record one frame's work time and adjust the quality level; returns True on a change"""
+        self.frames_at_level[self.level] += 1
+        self.frame_times.append(frame_ms)
+        self.fast_frames = self.fast_frames + 1 if frame_ms < self.budget_ms * HEADROOM else 0
+
+        if len(self.frame_times) == self.frame_times.maxlen and self.level < len(self.levels) - 1:
+            if sum(self.frame_times) / len(self.frame_times) > self.budget_ms:
+                self.set_level(self.level + 1)
+                self.downgrades += 1
+                return True
+        if self.fast_frames >= UPGRADE_FRAMES and self.level > 0:
+            self.set_level(self.level - 1)
+            self.upgrades += 1
+            return True
+        return False
+
+    def set_level(self, level):
+        """Switch to a quality level, starting a fresh measurement window"""
+        self.level = max(0, min(level, len(self.levels) - 1))
+        self.frame_times.clear()
+        self.fast_frames = 0
+
+    def particle_budget(self, active, scale=1):
+        """How many particles a coin pickup may add with `active` particles alive
+
+        scale multiplies both the per-coin count and the cap (stress runs).
+        """
+        settings = self.settings
+        return max(0, min(round(settings['particles_per_coin'] * scale),
+                          round(settings['max_particles'] * scale) - active))
+
+    def average_ms(self):
+        """Average work time over the current window (None before the first frame)"""
+        if not self.frame_times:
+            return None
+        return sum(self.frame_times) / len(self.frame_times)
+
+    def telemetry(self):
+        """Current quality and how the session got there, as plain data"""
+        return {
+            'quality': self.quality,
+            'level': self.level,
+            'frame_ms': self.average_ms(),
+            'budget_ms': self.budget_ms,
+            'downgrades': self.downgrades,
+            'upgrades': self.upgrades,
+            'frames_at_level': {level['name']: frames for level, frames in zip(self.levels, self.frames_at_level)},
+        }
@@ -0,0 +1,105 @@
+import os
+import statistics
+import time
+from collections import deque
+
+
+# How frames wait for their slot: 'sleep' is Clock.tick() (can oversleep by a scheduler quantum),
+# 'busy' is Clock.tick_busy_loop() (exact, but keeps a core busy), 'hybrid' sleeps until
+# SPIN_MS before the deadline and spins the rest
+PACING_MODES = ('sleep', 'busy', 'hybrid')
+PACING = os.environ.get('COINDASH_PACING', 'sleep')
+SPIN_MS = 2.0
+MAX_FRAMES = 3600  # Frame timestamps kept (a minute at 60 FPS)
+MAX_LATENCIES = 600  # Input latency samples kept
+DROP_FACTOR = 1.5  # A frame taking this many frame periods or more missed its slot
+
+
+def percentile(values, share):
+    """Value below which `share` of the sorted values fall"""
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+class FramePacer:
+    """Waits out each frame's remaining budget and records frame timestamps and input latency.
+
+    wait() replaces Clock.tick(): it paces the frame with the chosen mode and
+    returns the frame's work time in ms (Clock.get_rawtime() for the clock
+    based modes), for the FrameGovernor. Every frame boundary is timestamped,
+    so report() can show the distribution of frame intervals, jitter and
+    dropped frames. record_latency() collects the time from reading an input
+    event to the first flipped frame that shows its effect.
+    """
+
+    def __init__(self, clock, fps=60, mode=PACING):
+        if mode not in PACING_MODES:
+            raise ValueError(f"unknown pacing mode {mode!r} (expected one of {', '.join(PACING_MODES)})")
+        self.clock = clock
+        self.fps = fps
+        self.mode = mode
+        self.period = 1 / fps
+        self.timestamps = deque(maxlen=MAX_FRAMES)  # perf_counter() at the end of each wait()
+        self.latencies = deque(maxlen=MAX_LATENCIES)  # Input to shown frame, in ms
+        self.frame_start = time.perf_counter()
+
+    def wait(self):
+        """Wait for the next frame slot; returns this frame's work time in ms"""
+        if self.mode == 'sleep':
+            self.clock.tick(self.fps)
+            work_ms = self.clock.get_rawtime()
+        elif self.mode == 'busy':
+            self.clock.tick_busy_loop(self.fps)
+            work_ms = self.clock.get_rawtime()
+        else:
+            now = time.perf_counter()
+            work_ms = (now - self.frame_start) * 1000
+            deadline = self.frame_start + self.period
+            remaining = deadline - now - SPIN_MS / 1000
+            if remaining > 0:
+                time.sleep(remaining)
+            while time.perf_counter() < deadline:
+                pass
+            self.clock.tick()  # Keeps Clock.get_fps() meaningful
+        self.frame_start = time.perf_counter()
+        self.timestamps.append(self.frame_start)
+        return work_ms
+
+    def record_latency(self, input_time):
+        """Note that a frame showing the effect of input read at perf_counter() input_time was just flipped"""
+        self.latencies.append((time.perf_counter() - input_time) * 1000)
+
+    def report(self):
+        """Frame interval distribution, dropped frames and input latency, as plain data"""
+        timestamps = list(self.timestamps)
+        intervals = sorted((b - a) * 1000 for a, b in zip(timestamps, timestamps[1:]))
+        period_ms = self.period * 1000
+        report = {'mode': self.mode, 'frames': len(intervals), 'target_ms': period_ms}
+        if intervals:
+            report.update({
+                'fps': len(intervals) / (timestamps[-1] - timestamps[0]),
+                'median_ms': percentile(intervals, 0.5),
+                'p95_ms': percentile(intervals, 0.95),
+                'p99_ms': percentile(intervals, 0.99),
+                'max_ms': intervals[-1],
+                # Spread of the intervals around the target
+                'jitter_ms': statistics.pstdev(intervals, period_ms),
+                'dropped': sum(round(interval / period_ms) - 1 for interval in intervals
+                               if interval >= period_ms * DROP_FACTOR),
+            })
+        if self.latencies:
+            latencies = sorted(self.latencies)
+            report['input_ms'] = percentile(latencies, 0.5)
+            report['input_max_ms'] = latencies[-1]
+        return report
+
+    def summary(self):
+        """report() as one line of text"""
+        report = self.report()
+        if not report['frames']:
+            return f"Frame pacing ({self.mode}): no frames"
+        line = (f"Frame pacing ({report['mode']}): {report['fps']:.1f} FPS, interval median "
+                f"{report['median_ms']:.1f}ms p99 {report['p99_ms']:.1f}ms max {report['max_ms']:.1f}ms, "
+                f"jitter {report['jitter_ms']:.2f}ms, {report['dropped']} dropped")
+        if 'input_ms' in report:
+            line += f"; input to screen {report['input_ms']:.1f}ms (max {report['input_max_ms']:.1f}ms)"
+        return line
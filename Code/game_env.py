@@ -0,0 +1,161 @@
+import numpy as np
+import pygame
+
+from game_window import GameWindow
+
+
+# Discrete actions as (left, right, jump)
+ACTIONS = [
+    (False, False, False),  # 0: no-op
+    (True, False, False),  # 1: left
+    (False, True, False),  # 2: right
+    (False, False, True),  # 3: jump
+    (True, False, True),  # 4: left + jump
+    (False, True, True),  # 5: right + jump
+]
+ACTION_NAMES = ["noop", "left", "right", "jump", "left_jump", "right_jump"]
+
+
+class GameEnv:
+    """Gym-style reset()/step(action) environment over a headless GameWindow.
+
+    Observations are float32 vectors built from the player state and the
+    nearest platforms, coins and obstacles ahead of the player. Rewards come
+    from the change in score and distance each step. With frame_skip > 1
+    each step advances that many frames with swept collision checks.
+    """
+
+    # Number of nearby entities of each kind included in an observation
+    NEAREST_PLATFORMS = 3
+    NEAREST_COINS = 3
+    NEAREST_OBSTACLES = 3
+
+    # Player state (6) + platforms (dx, dy, width) + coins (dx, dy) + obstacles (dx, dy, width, height)
+    OBSERVATION_SIZE = 6 + NEAREST_PLATFORMS * 3 + NEAREST_COINS * 2 + NEAREST_OBSTACLES * 4
+
+    def __init__(self, seed=None, max_steps=None, score_weight=0.1, distance_weight=1.0, death_penalty=-10.0,
+                 frame_skip=1):
+        self.window = GameWindow(headless=True, seed=seed)
+        self.seed = seed
+        self.max_steps = max_steps
+        self.frame_skip = frame_skip  # Frames simulated per step
+
+        # Reward shaping
+        self.score_weight = score_weight
+        self.distance_weight = distance_weight  # Per meter of distance
+        self.death_penalty = death_penalty
+
+        self.action_space_size = len(ACTIONS)
+        self.steps = 0
+        self.last_score = 0
+        self.last_distance = 0
+
+    def reset(self, seed=None):
+        """Start a new game and return the first observation"""
+        if seed is not None:
+            self.seed = seed
+        # Re-seed so the same seed always produces the same course
+        self.window.rng.seed(self.seed)
+        # Release keys held at the end of the previous game before the first physics update
+        self.window.held_keys[pygame.K_LEFT] = False
+        self.window.held_keys[pygame.K_RIGHT] = False
+        self.window.reset_game()
+
+        self.steps = 0
+        self.last_score = 0
+        self.last_distance = 0
+        return self.observe()
+
+    def step(self, action):
+        """Advance frame_skip frames; returns (observation, reward, done, info)"""
+        window = self.window
+        left, right, jump = ACTIONS[action]
+
+        # Same order as GameWindow.run(): input events, then the update
+        window.held_keys[pygame.K_LEFT] = left
+        window.held_keys[pygame.K_RIGHT] = right
+        if jump:
+            window.player.jump()
+        window.update(self.frame_skip)
+        self.steps += 1
+
+        score = window.game_manager.score
+        distance = window.distance_in_meters
+        reward = (score - self.last_score) * self.score_weight + (distance - self.last_distance) * self.distance_weight
+        self.last_score = score
+        self.last_distance = distance
+
+        done = window.game_manager.game_over
+        if done:
+            reward += self.death_penalty
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+
+        info = {
+            'score': score,
+            'distance': distance,
+            'coins': window.player.coins_collected,
+            'jumps': window.player.jump_count,
+            'death_cause': self.death_cause(),
+            'truncated': truncated,
+        }
+        return self.observe(), reward, done or truncated, info
+
+    def snapshot(self):
+        """Capture the environment state so a planner can fork the world and come back"""
+        return self.window.snapshot(), self.steps, self.last_score, self.last_distance
+
+    def restore(self, snapshot):
+        """Return the environment to a state captured by snapshot()"""
+        world, self.steps, self.last_score, self.last_distance = snapshot
+        self.window.restore(world)
+
+    def death_cause(self):
+        """Return the cause of death of the current game, or '' while alive"""
+        return next((cause for cause, count in self.window.game_manager.death_causes.items()
+                     if count > 0), '')
+
+    def observe(self):
+        """Build the observation vector for the current state"""
+        window = self.window
+        player = window.player
+        width = window.SCREEN_WIDTH
+        height = window.SCREEN_HEIGHT
+        px = player.x
+        py = player.y
+        horizon = px + width
+
+        obs = np.zeros(self.OBSERVATION_SIZE, dtype=np.float32)
+        obs[0] = (px - window.camera_offset_x) / width
+        obs[1] = py / height
+        obs[2] = player.velocity_x / player.max_velocity_x
+        obs[3] = player.velocity_y / player.max_velocity_y
+        obs[4] = 1.0 if player.on_ground else 0.0
+        obs[5] = window.scroll_speed / 7
+
+        # Platforms whose right edge is still ahead of the player
+        platforms = sorted((p.x, p.y, p.width) for p in window.platforms
+                           if p.x + p.width >= px and p.x <= horizon)
+        i = 6
+        for x, y, w in platforms[:self.NEAREST_PLATFORMS]:
+            obs[i:i + 3] = ((x - px) / width, (y - py) / height, w / width)
+            i += 3
+
+        field = window.coins
+        start, end = field.span(px - field.max_radius, horizon)
+        x = field.x[start:end]
+        y = field.y[start:end]
+        keep = ~field.collected[start:end] & (x >= px - field.radius[start:end])
+        coins = sorted(zip(x[keep].tolist(), y[keep].tolist()))
+        i = 6 + self.NEAREST_PLATFORMS * 3
+        for x, y in coins[:self.NEAREST_COINS]:
+            obs[i:i + 2] = ((x - px) / width, (y - py) / height)
+            i += 2
+
+        obstacles = sorted((o.x, o.y, o.width, o.height) for o in window.obstacles
+                           if o.x + o.width >= px and o.x <= horizon)
+        i = 6 + self.NEAREST_PLATFORMS * 3 + self.NEAREST_COINS * 2
+        for x, y, w, h in obstacles[:self.NEAREST_OBSTACLES]:
+            obs[i:i + 4] = ((x - px) / width, (y - py) / height, w / width, h / height)
+            i += 4
+
+        return obs
@@ -1,17 +1,42 @@
 import pygame
 import time
-import csv
 import os
 from datetime import datetime
+from leaderboard import Leaderboard, LEADERBOARD_FILE
+from quantile_sketch import SessionSketches, SKETCHES_FILE
+from rollups import Rollups, ROLLUPS_FILE
+from session_index import append_samples
+from stats_segments import rotate_if_needed
+from stats_store import SUMMARY_FILE, SAMPLES_FILE, SUMMARY_COLUMNS, append_rows
+
+
+# Indexes kept next to the summary file: (class with load/add/save/rebuild, sidecar path)
+SIDECARS = (
+    (Leaderboard, LEADERBOARD_FILE),
+    (SessionSketches, SKETCHES_FILE),
+    (Rollups, ROLLUPS_FILE),
+)
 
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, get_ticks=None, get_time=None):
+        # Clock sources (milliseconds for data collection, seconds for the timer);
+        # headless games pass simulated clocks so results don't depend on wall time
+        self.get_ticks = get_ticks or pygame.time.get_ticks
+        self.get_time = get_time or time.time
+        self.data_collection_interval = 10000  # 10 seconds in milliseconds
+
+        # The stats files are prepared by whoever saves to them (stats_store.prepare_stats_files),
+        # so headless games, tournament workers and replays never touch stats/
+        self.reset()
+
+    def reset(self):
+        """Start a new session's state"""
         self.score = 0
         self.game_over = False
         self.game_completed = False
         self.death_count = 0
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = self.get_ticks()
         self.completion_time = 0
         self.death_causes = {
             'falling': 0,
@@ -21,28 +46,15 @@ class GameManager:
         self.session_id = datetime.now().strftime("%Y%m%d%H%M%S")
         self.data_points = []
         self.last_data_collection = 0
-        self.data_collection_interval = 10000  # 10 seconds in milliseconds
-
-        # Ensure stats directory exists
-        if not os.path.exists('stats'):
-            os.makedirs('stats')
-
-        # Create stats file if it doesn't exist
-        if not os.path.exists('stats/game_stats.csv'):
-            with open('stats/game_stats.csv', 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(['session_id', 'timestamp', 'distance_traveled',
-                                 'coins_collected', 'jump_count', 'score',
-                                 'completion_time', 'death_cause'])
 
     def start_timer(self):
         """Start the game timer"""
-        self.start_time = time.time()
+        self.start_time = self.get_time()
 
     def end_timer(self):
         """End the game timer and calculate completion time"""
-        if self.start_time:
-            self.completion_time = time.time() - self.start_time
+        if self.start_time is not None:
+            self.completion_time = self.get_time() - self.start_time
             return self.completion_time
         return 0
 
@@ -70,7 +82,7 @@ class GameManager:
 
     def collect_data_point(self, player):
         """Collect a data point for statistics"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.get_ticks()
 
         # Collect data at regular intervals or when requested
         if current_time - self.last_data_collection >= self.data_collection_interval:
@@ -89,10 +101,9 @@ class GameManager:
 
             self.data_points.append(data_point)
 
-    def save_game_stats(self, player):
-        """Save game statistics to CSV file"""
-        # Add final data point
-        final_data = {
+    def get_summary_row(self, player):
+        """Return the final summary row of the session"""
+        return {
             'session_id': self.session_id,
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'distance_traveled': player.get_distance(),
@@ -104,31 +115,36 @@ class GameManager:
                                  if count > 0), '')
         }
 
-        # Write to CSV
-        with open('stats/game_stats.csv', 'a', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow([
-                final_data['session_id'],
-                final_data['timestamp'],
-                final_data['distance_traveled'],
-                final_data['coins_collected'],
-                final_data['jump_count'],
-                final_data['score'],
-                final_data['completion_time'],
-                final_data['death_cause']
-            ])
-
-        # Also save intermediate data points
-        for data_point in self.data_points:
-            with open('stats/game_stats.csv', 'a', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([
-                    data_point['session_id'],
-                    data_point['timestamp'],
-                    data_point['distance_traveled'],
-                    data_point['coins_collected'],
-                    data_point['jump_count'],
-                    data_point['score'],
-                    data_point['completion_time'],
-                    data_point['death_cause']
-                ])
+    def save_game_stats(self, player):
+        """Save the session summary and its samples to the stats files"""
+        self.write_stats_rows([self.get_summary_row(player)], self.data_points)
+
+    @staticmethod
+    def update_sidecars(summaries, summary_file=SUMMARY_FILE):
+        """Add new sessions to every sidecar index (leaderboard, percentile sketches, rollups), one load and save each"""
+        for sidecar, path in SIDECARS:
+            if os.path.exists(path):
+                index = sidecar.load(path)
+                for row in summaries:
+                    index.add(row)
+            else:
+                # First save with this sidecar: index the existing history (which already has these sessions)
+                index = sidecar.rebuild(summary_file)
+            index.save(path)
+
+    @staticmethod
+    def write_stats_rows(summaries, samples, summary_file=SUMMARY_FILE, samples_file=SAMPLES_FILE):
+        """Append summary rows and sample rows to their stats files, one write each, and update the sidecars
+
+        Every writer (a finished game, a tournament's batch) goes through here,
+        so the sidecars never miss sessions that are in the summary file.
+        """
+        # Close the summary and samples files into segments when these rows start a new week
+        rotate_if_needed(summary_file, summaries, samples_file=samples_file)
+        append_rows(summary_file, SUMMARY_COLUMNS, summaries)
+        if samples:
+            # The samples index lets the Statistics window seek straight to one session's samples
+            append_samples(samples, samples_file)
+        # The sidecars describe the default stats files only
+        if summaries and summary_file == SUMMARY_FILE:
+            GameManager.update_sidecars(summaries, summary_file)
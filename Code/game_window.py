@@ -1,37 +1,98 @@
 import pygame
 import sys
+import time
 import random
 from player import Player
 from platform_obj import Platform
-from coin import Coin
+from coin_field import CoinField, draw_coins
 from obstacle import Obstacle
 from game_manager import GameManager
-import math
+from stats_store import prepare_stats_files
+from frame_governor import FrameGovernor, RESOLUTION_LEVELS, FILL_BUDGET_SHARE
+from frame_pacing import FramePacer
+from memory_monitor import MemoryMonitor
+from sim_thread import RenderState, SimulationThread
+from world_snapshot import WorldSnapshot
+from reachability import JumpEnvelope
+from collision import path_bounds, sweep_aabb
+from replay import (ReplayRecorder, replay_path, INPUT_LEFT, INPUT_RIGHT, INPUT_JUMP, INPUT_PAUSE,
+                    INPUT_RAMP)
+import os
+
+
+# Render target scale (e.g. 0.5 for half resolution; unset = chosen from the measured fill cost)
+# and window size (e.g. 1600x1200) for live games
+_render_scale = os.environ.get('COINDASH_RENDER_SCALE')
+DEFAULT_RENDER_SCALE = float(_render_scale) if _render_scale else None
+_window_size = os.environ.get('COINDASH_WINDOW_SIZE')
+DEFAULT_WINDOW_SIZE = tuple(int(n) for n in _window_size.lower().split('x')) if _window_size else None
+# Run the simulation on its own thread (see sim_thread)
+SIM_THREAD = os.environ.get('COINDASH_SIM_THREAD') == '1'
+# World density multiplier for stress runs (e.g. 10 or 100; 1 = the normal game)
+_density = os.environ.get('COINDASH_DENSITY')
+DEFAULT_DENSITY = float(_density) if _density else 1
 
 
 class GameWindow:
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, render_scale=DEFAULT_RENDER_SCALE, window_size=DEFAULT_WINDOW_SIZE,
+                 density=DEFAULT_DENSITY):
         # Initialize pygame
         pygame.init()
 
-        # Game window settings
+        # Headless games simulate without a display, keyboard or wall clock
+        self.headless = headless
+
+        # Stress runs multiply platforms, coins, obstacles and particles by `density`. They are
+        # not real games: deaths are ignored so the run keeps going, and no stats or replay are saved.
+        self.density = density
+        self.stress = density != 1
+
+        # Game window settings (the world is always 800x600; a larger window shows it scaled up)
         self.SCREEN_WIDTH = 800
         self.SCREEN_HEIGHT = 600
-        self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
-        pygame.display.set_caption("CoinDash")
+        if self.headless:
+            # Off-screen surface so render() still works without a display
+            self.screen = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode(window_size or (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+            pygame.display.set_caption("CoinDash")
 
         # Try to load background image, use fallback if not found
-        try:
-            self.background_image = pygame.image.load("background.jpg").convert()
-            self.background_image = pygame.transform.scale(self.background_image,
-                                                           (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
-        except pygame.error:
-            self.background_image = None
-            print("Warning: background.jpg not found. Using solid color instead.")
+        self.background_source = None
+        if not self.headless:
+            try:
+                self.background_source = pygame.image.load("background.jpg").convert()
+            except pygame.error:
+                self.background_source = None
+                print("Warning: background.jpg not found. Using solid color instead.")
 
         # Clock for controlling game speed
         self.clock = pygame.time.Clock()
         self.FPS = 60
+        self.frame_count = 0  # Simulated frames, drives the clock in headless mode
+
+        # Frame pacing (COINDASH_PACING: sleep, busy or hybrid) with frame time and input latency records
+        self.pacer = FramePacer(self.clock, self.FPS)
+
+        # Effects quality follows the measured frame times (see frame_governor)
+        self.governor = FrameGovernor(self.FPS)
+
+        # The world is drawn into a render target of render_scale x 800x600 and scaled to the
+        # window once per frame. render_scale=None picks it from the measured fill cost.
+        self.resolution_governor = None
+        if render_scale is None:
+            self.resolution_governor = FrameGovernor(self.FPS, RESOLUTION_LEVELS, FILL_BUDGET_SHARE)
+            render_scale = self.resolution_governor.settings['render_scale']
+        self.fill_ms = 0.0  # Time spent drawing and upscaling the world in the last frame
+        self.set_render_scale(render_scale)
+
+        # Random generator for level generation (seed it for reproducible courses);
+        # an explicit seed is always picked so the session can be replayed
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+
+        # Held movement keys passed to Player.move (None = read the live keyboard)
+        self.held_keys = {pygame.K_LEFT: False, pygame.K_RIGHT: False} if self.headless else None
 
         # Track active moving obstacles
         self.moving_obstacles = []
@@ -40,10 +101,11 @@ class GameWindow:
         self.init_game_objects()
 
         # Game manager
-        self.game_manager = GameManager()
+        self.game_manager = GameManager(self.get_ticks, self.get_time)
 
-        # Font for UI
-        self.font = pygame.font.SysFont('Arial', 24)
+        # Font for UI (not needed when nothing is displayed)
+        self.font = None if self.headless else pygame.font.SysFont('Arial', 24)
+        self.small_font = None if self.headless else pygame.font.SysFont('Arial', 14)
 
         # Colors
         self.WHITE = (255, 255, 255)
@@ -67,6 +129,13 @@ class GameWindow:
         self.platform_gap_min = 80  # Reduced minimum gap for tighter platforms
         self.platform_gap_max = 200  # Reduced maximum gap for more achievable jumps
 
+        # Reachability check of each generated platform against the previous one
+        self.reachability = JumpEnvelope.for_player(self.player)
+        self.repair_unreachable = True  # Pull unreachable platforms back within jump range
+        self.last_main_platform = None  # Previous generated platform (None = starting area)
+        self.checked_segments = 0
+        self.unreachable_segments = 0
+
         # Coin and obstacle generation rates (higher = more frequent)
         self.coin_chance = 0.6  # 60% chance per platform (increased from 30%)
         self.obstacle_chance = 0.4  # 40% chance per platform (increased from 20%)
@@ -100,6 +169,29 @@ class GameWindow:
         # Special effects
         self.particles = []
 
+        # HUD text surfaces, re-rendered every governor.settings['hud_interval'] frames
+        self.hud_surfaces = []
+        self.rendered_frames = 0
+        self.overlay = None  # Semi-transparent game over / pause overlay, made once
+
+        # Replay recording (live games only): input bits gathered by handle_events()
+        # for the current frame, and the scroll-speed step decision of the last update
+        self.input_bits = 0
+        self.last_ramp = False
+        self.replay_ramp = None  # Recorded ramp decision to use instead of the clock (replays)
+        self.recorder = None if self.headless or self.stress else ReplayRecorder(self.seed, self.FPS)
+
+        # perf_counter() when the keydown of the last applied jump was read, and of the last one shown
+        self.jump_input_time = None
+        self.shown_jump_input_time = None
+
+        # Memory samples of live games: F3 shows them, F4 exports them (see memory_monitor)
+        self.memory_monitor = None if self.headless else MemoryMonitor(self)
+        self.show_memory = False
+
+        # Simulation thread while run() runs threaded (None = update and render in turn)
+        self.simulation = None
+
     def init_game_objects(self):
         """Initialize all game objects"""
         # Create initial platforms (these will be the starting area)
@@ -118,7 +210,11 @@ class GameWindow:
         player_x = 100
         # Position player exactly on top of platform (critical to position correctly)
         player_y = start_platform.y - 50  # Player height is 50
-        self.player = Player(player_x, player_y)
+        if getattr(self, 'player', None) is None:
+            self.player = Player(player_x, player_y)
+        else:
+            # Restart: same Player, so its sprite isn't loaded again
+            self.player.reset(player_x, player_y)
 
         # Make sure player is positioned exactly on the platform
         self.player.on_ground = True  # Set initially to true
@@ -128,10 +224,11 @@ class GameWindow:
         self.player.velocity_x = 2  # Give a small initial push
 
         # Run one physics update to properly set ground state and position
-        self.player.move(self.platforms)
+        # (with no keys held, so the starting state only depends on the seed)
+        self.player.move(self.platforms, {pygame.K_LEFT: False, pygame.K_RIGHT: False})
 
-        # Initialize empty lists for coins and obstacles
-        self.coins = []
+        # Initialize empty coins and obstacles
+        self.coins = CoinField()
         self.obstacles = []
 
         # Add initial coins in a more interesting pattern
@@ -154,42 +251,23 @@ class GameWindow:
         # Add movement properties to the obstacle
         obstacle.min_x = min_x
         obstacle.max_x = max_x
-        obstacle.speed = speed * random.choice([-1, 1])
+        obstacle.speed = speed * self.rng.choice([-1, 1])
         obstacle.is_moving = True
 
         # Add to moving obstacles list
         self.moving_obstacles.append(obstacle)
         return obstacle
 
+    def density_repeats(self):
+        """How many times a generation step runs: once normally, about `density` times in stress runs"""
+        if not self.stress:
+            return 1  # No RNG draw, so normal courses stay the same for a seed
+        whole = int(self.density)
+        return whole + (self.rng.random() < self.density - whole)
+
     def add_coin_pattern(self, start_x, start_y, pattern_type, count):
         """Add a pattern of coins starting at the given position"""
-        if pattern_type == "single":
-            self.coins.append(Coin(start_x, start_y))
-
-        elif pattern_type == "line":
-            # Horizontal line of coins
-            for i in range(count):
-                self.coins.append(Coin(start_x + i * 30, start_y))
-
-        elif pattern_type == "arc":
-            # Arc of coins (half circle)
-            radius = 50
-            for i in range(count):
-                angle = 3.14 * i / (count - 1)  # From 0 to pi
-                x = start_x + i * 30
-                y = start_y - int(radius * abs(math.sin(angle)))
-                self.coins.append(Coin(x, y))
-
-        elif pattern_type == "zigzag":
-            # Zigzag pattern
-            for i in range(count):
-                y_offset = 20 if i % 2 == 0 else -20
-                self.coins.append(Coin(start_x + i * 30, start_y + y_offset))
-
-        elif pattern_type == "vertical":
-            # Vertical line of coins
-            for i in range(count):
-                self.coins.append(Coin(start_x, start_y - i * 30))
+        self.coins.add_pattern(start_x, start_y, pattern_type, count)
 
     def generate_obstacles(self):
         """Generate obstacles independently to ensure consistent distribution"""
@@ -198,7 +276,7 @@ class GameWindow:
                                 -50 < ob.x - self.camera_offset_x < self.SCREEN_WIDTH + 100)
 
         # If we have fewer than 3-5 obstacles visible, generate more
-        if visible_obstacles < 3:
+        if visible_obstacles < 3 * self.density:
             # Generate obstacles ahead of the player
             ahead_position = self.camera_offset_x + self.SCREEN_WIDTH * 1.2
 
@@ -209,35 +287,36 @@ class GameWindow:
                                    p.width > 80]  # Only on platforms wide enough
 
             if potential_platforms:
-                # Select a random platform
-                platform = random.choice(potential_platforms)
-
-                # Determine obstacle type
-                obstacle_type = random.choice(["standard", "tall", "wide", "moving"])
-
-                if obstacle_type == "standard":
-                    obstacle_x = platform.x + random.randint(10, platform.width - 30)
-                    obstacle_y = platform.y - 20
-                    self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 30, 20))
-
-                elif obstacle_type == "tall":
-                    obstacle_x = platform.x + random.randint(10, platform.width - 20)
-                    obstacle_y = platform.y - 40
-                    self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 20, 40))
-
-                elif obstacle_type == "wide":
-                    obstacle_x = platform.x + random.randint(10, platform.width - 60)
-                    obstacle_y = platform.y - 15
-                    self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 60, 15))
-
-                elif obstacle_type == "moving" and platform.width > 150:
-                    # Only create moving obstacles on wider platforms
-                    obstacle_x = platform.x + random.randint(30, platform.width - 60)
-                    obstacle_y = platform.y - 25
-                    # Moving range is within platform boundaries
-                    min_x = platform.x + 20
-                    max_x = platform.x + platform.width - 40
-                    self.create_moving_obstacle(obstacle_x, obstacle_y, 30, 25, min_x, max_x)
+                for _ in range(self.density_repeats()):
+                    # Select a random platform
+                    platform = self.rng.choice(potential_platforms)
+
+                    # Determine obstacle type
+                    obstacle_type = self.rng.choice(["standard", "tall", "wide", "moving"])
+
+                    if obstacle_type == "standard":
+                        obstacle_x = platform.x + self.rng.randint(10, platform.width - 30)
+                        obstacle_y = platform.y - 20
+                        self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 30, 20))
+
+                    elif obstacle_type == "tall":
+                        obstacle_x = platform.x + self.rng.randint(10, platform.width - 20)
+                        obstacle_y = platform.y - 40
+                        self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 20, 40))
+
+                    elif obstacle_type == "wide":
+                        obstacle_x = platform.x + self.rng.randint(10, platform.width - 60)
+                        obstacle_y = platform.y - 15
+                        self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 60, 15))
+
+                    elif obstacle_type == "moving" and platform.width > 150:
+                        # Only create moving obstacles on wider platforms
+                        obstacle_x = platform.x + self.rng.randint(30, platform.width - 60)
+                        obstacle_y = platform.y - 25
+                        # Moving range is within platform boundaries
+                        min_x = platform.x + 20
+                        max_x = platform.x + platform.width - 40
+                        self.create_moving_obstacle(obstacle_x, obstacle_y, 30, 25, min_x, max_x)
     def generate_new_elements(self):
         """Generate new platforms, coins, and obstacles as the player progresses"""
         last_floor_x = 0
@@ -249,31 +328,32 @@ class GameWindow:
         # Generate new floor segments if needed
         if last_floor_x - self.camera_offset_x < self.SCREEN_WIDTH * 2:
             # Decide if we want a gap in the floor
-            if random.random() < 0.3:  # 30% chance for a gap
-                gap_width = random.randint(100, 200)  # Gap size
+            if self.rng.random() < 0.3:  # 30% chance for a gap
+                gap_width = self.rng.randint(100, 200)  # Gap size
                 new_floor_x = last_floor_x + gap_width
-                floor_width = random.randint(300, 600)  # Floor segment width
+                floor_width = self.rng.randint(300, 600)  # Floor segment width
             else:
                 new_floor_x = last_floor_x
-                floor_width = random.randint(400, 800)  # Floor segment width
+                floor_width = self.rng.randint(400, 800)  # Floor segment width
 
             # Create new floor segment
             new_floor = Platform(new_floor_x, 555, floor_width, 20)
             self.platforms.append(new_floor)
 
-            if floor_width > 300 and random.random() < 0.4:  # 40% chance
-                for _ in range(random.randint(1, 3)):  # 1-3 obstacles
-                    obstacle_x = new_floor_x + random.randint(50, floor_width - 50)
-                    obstacle_y = new_floor.y - 20
-                    # Choose random obstacle type
-                    obstacle_type = random.choice(["standard", "wide", "tall"])
+            for _ in range(self.density_repeats()):
+                if floor_width > 300 and self.rng.random() < 0.4:  # 40% chance
+                    for _ in range(self.rng.randint(1, 3)):  # 1-3 obstacles
+                        obstacle_x = new_floor_x + self.rng.randint(50, floor_width - 50)
+                        obstacle_y = new_floor.y - 20
+                        # Choose random obstacle type
+                        obstacle_type = self.rng.choice(["standard", "wide", "tall"])
 
-                    if obstacle_type == "standard":
-                        self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 30, 20))
-                    elif obstacle_type == "wide":
-                        self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 60, 15))
-                    elif obstacle_type == "tall":
-                        self.obstacles.append(Obstacle(obstacle_x, obstacle_y - 20, 20, 40))
+                        if obstacle_type == "standard":
+                            self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 30, 20))
+                        elif obstacle_type == "wide":
+                            self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 60, 15))
+                        elif obstacle_type == "tall":
+                            self.obstacles.append(Obstacle(obstacle_x, obstacle_y - 20, 20, 40))
 
 
             # Add some coins above the gaps
@@ -287,83 +367,98 @@ class GameWindow:
             last_platform = self.platforms[-1]
 
             # Random gap between platforms
-            gap = random.randint(self.platform_gap_min, self.platform_gap_max)
+            gap = self.rng.randint(self.platform_gap_min, self.platform_gap_max)
 
             # Calculate new platform position
             new_x = self.last_platform_x + gap
 
             # Vary the height slightly (within playable range)
-            height_variance = random.randint(-30, 30)
+            height_variance = self.rng.randint(-30, 30)
             new_y = last_platform.y + height_variance
             new_y = max(300, min(500, new_y))  # Keep platforms in reasonable height range
 
             # Add some variety to platform size
-            width = random.randint(100, 300)  # Increased max width for more variety
+            width = self.rng.randint(100, 300)  # Increased max width for more variety
             height = 20  # Platform height
 
+            # Make sure the platform can be reached from the previous one
+            previous = self.last_main_platform
+            if previous is not None:
+                self.checked_segments += 1
+                if not self.reachability.is_reachable(previous.x, previous.y, previous.width,
+                                                      new_x, new_y, width, self.scroll_speed):
+                    self.unreachable_segments += 1
+                    if self.repair_unreachable:
+                        # Adjust without extra RNG draws so seeded courses stay reproducible
+                        new_y = max(new_y, previous.y - self.reachability.max_rise())
+                        max_gap = self.reachability.max_gap(new_y - previous.y, self.scroll_speed)
+                        new_x = min(new_x, previous.x + previous.width + max_gap - self.player.width)
+
             # Occasionally create a floating platform above
-            if random.random() < 0.25:  # 25% chance for a floating platform
-                float_x = new_x + random.randint(20, width - 50)
-                float_y = new_y - random.randint(80, 120)
-                float_width = random.randint(80, 150)
-                float_platform = Platform(float_x, float_y, float_width, height)
-                self.platforms.append(float_platform)
-
-                # Add coins to floating platform (higher value)
-                if random.random() < 0.8:  # 80% chance for coins on floating platforms
-                    pattern = random.choice(self.coin_patterns)
-                    coin_count = random.randint(3, 6)
-                    self.add_coin_pattern(float_x + 10, float_y - 30, pattern, coin_count)
+            for _ in range(self.density_repeats()):
+                if self.rng.random() < 0.25:  # 25% chance for a floating platform
+                    float_x = new_x + self.rng.randint(20, width - 50)
+                    float_y = new_y - self.rng.randint(80, 120)
+                    float_width = self.rng.randint(80, 150)
+                    float_platform = Platform(float_x, float_y, float_width, height)
+                    self.platforms.append(float_platform)
+
+                    # Add coins to floating platform (higher value)
+                    if self.rng.random() < 0.8:  # 80% chance for coins on floating platforms
+                        pattern = self.rng.choice(self.coin_patterns)
+                        coin_count = self.rng.randint(3, 6)
+                        self.add_coin_pattern(float_x + 10, float_y - 30, pattern, coin_count)
 
             # Add new main platform
             new_platform = Platform(new_x, new_y, width, height)
             self.platforms.append(new_platform)
+            self.last_main_platform = new_platform
 
             # Update last platform x position
             self.last_platform_x = new_x + width
 
             # Add coins on the platform with higher chance
-            if random.random() < self.coin_chance:
-                pattern = random.choice(self.coin_patterns)
-                coin_count = random.randint(3, 8)  # More coins in a group
-                self.add_coin_pattern(new_x + random.randint(10, width - 10), new_y - 30, pattern, coin_count)
+            for _ in range(self.density_repeats()):
+                if self.rng.random() < self.coin_chance:
+                    pattern = self.rng.choice(self.coin_patterns)
+                    coin_count = self.rng.randint(3, 8)  # More coins in a group
+                    self.add_coin_pattern(new_x + self.rng.randint(10, width - 10), new_y - 30, pattern, coin_count)
 
             # Add obstacle on the platform with higher chance
-            if random.random() < self.obstacle_chance:
-                obstacle_type = random.choice(self.obstacle_types)
-
-                if obstacle_type == "standard":
-                    obstacle_x = new_x + random.randint(10, width - 30)
-                    obstacle_y = new_y - 20
-                    self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 30, 20))
-
-                elif obstacle_type == "tall":
-                    obstacle_x = new_x + random.randint(10, width - 20)
-                    obstacle_y = new_y - 40
-                    self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 20, 40))
-
-                elif obstacle_type == "wide":
-                    obstacle_x = new_x + random.randint(10, width - 60)
-                    obstacle_y = new_y - 15
-                    self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 60, 15))
-
-                elif obstacle_type == "moving" and width > 150:
-                    # Only create moving obstacles on wider platforms
-                    obstacle_x = new_x + random.randint(30, width - 60)
-                    obstacle_y = new_y - 25
-                    # Moving range is within platform boundaries
-                    min_x = new_x + 20
-                    max_x = new_x + width - 40
-                    self.create_moving_obstacle(obstacle_x, obstacle_y, 30, 25, min_x, max_x)
+            for _ in range(self.density_repeats()):
+                if self.rng.random() < self.obstacle_chance:
+                    obstacle_type = self.rng.choice(self.obstacle_types)
+
+                    if obstacle_type == "standard":
+                        obstacle_x = new_x + self.rng.randint(10, width - 30)
+                        obstacle_y = new_y - 20
+                        self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 30, 20))
+
+                    elif obstacle_type == "tall":
+                        obstacle_x = new_x + self.rng.randint(10, width - 20)
+                        obstacle_y = new_y - 40
+                        self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 20, 40))
+
+                    elif obstacle_type == "wide":
+                        obstacle_x = new_x + self.rng.randint(10, width - 60)
+                        obstacle_y = new_y - 15
+                        self.obstacles.append(Obstacle(obstacle_x, obstacle_y, 60, 15))
+
+                    elif obstacle_type == "moving" and width > 150:
+                        # Only create moving obstacles on wider platforms
+                        obstacle_x = new_x + self.rng.randint(30, width - 60)
+                        obstacle_y = new_y - 25
+                        # Moving range is within platform boundaries
+                        min_x = new_x + 20
+                        max_x = new_x + width - 40
+                        self.create_moving_obstacle(obstacle_x, obstacle_y, 30, 25, min_x, max_x)
 
         # Remove platforms that are far behind (optimization)
         while self.platforms and self.platforms[0].x + self.platforms[0].width < self.camera_offset_x - 800:
             self.platforms.pop(0)
 
         # Remove coins that are far behind
-        for i in range(len(self.coins) - 1, -1, -1):
-            if self.coins[i].x < self.camera_offset_x - 800:
-                self.coins.pop(i)
+        self.coins.cull(self.camera_offset_x - 800)
 
         # Remove obstacles that are far behind
         for i in range(len(self.obstacles) - 1, -1, -1):
@@ -374,19 +469,33 @@ class GameWindow:
                         self.moving_obstacles.remove(self.obstacles[i])
                 self.obstacles.pop(i)
 
-    def update_moving_obstacles(self):
+        # Moving obstacles made by generate_obstacles() and above are only in moving_obstacles,
+        # so the loop above never sees them: drop them once their whole range is far behind.
+        # They aren't ordered by max_x (ranges differ per platform), so every one is checked.
+        self.moving_obstacles = [obstacle for obstacle in self.moving_obstacles
+                                 if obstacle.max_x >= self.camera_offset_x - 800]
+
+    def update_moving_obstacles(self, steps=1):
         """Update the position of moving obstacles"""
         for obstacle in self.moving_obstacles:
-            # Move the obstacle
-            obstacle.x += obstacle.speed
+            # Remember where the step started for swept collision
+            obstacle.previous_x = obstacle.x
+            for _ in range(steps):
+                # Move the obstacle
+                obstacle.x += obstacle.speed
 
-            # Reverse direction if reached boundary
-            if obstacle.x <= obstacle.min_x or obstacle.x >= obstacle.max_x:
-                obstacle.speed *= -1
+                # Reverse direction if reached boundary
+                if obstacle.x <= obstacle.min_x or obstacle.x >= obstacle.max_x:
+                    obstacle.speed *= -1
 
     def create_coin_collect_particles(self, x, y):
         """Create particle effects when collecting coins"""
-        for _ in range(8):  # Create 8 particles
+        # Particles are purely visual, skip them when nothing is displayed
+        if self.headless:
+            return
+
+        # 8 particles at full quality (times the stress density), fewer (or none) when frames are over budget
+        for _ in range(self.governor.particle_budget(len(self.particles), self.density)):
             # Random velocity
             vel_x = random.uniform(-2, 2)
             vel_y = random.uniform(-4, -1)
@@ -417,146 +526,237 @@ class GameWindow:
             if self.particles[i]['lifetime'] <= 0:
                 self.particles.pop(i)
 
-    def handle_events(self):
-        """Handle player input"""
+    def handle_events(self, post=None):
+        """Handle player input
+
+        Keys that change the game become commands for apply_command(): run at
+        once, or handed to `post` for the simulation thread's next tick.
+        """
+        if post is None:
+            self.input_bits = 0
+            post = self.apply_command
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                self.running = False
-                # Save game stats before exiting
-                if hasattr(self, 'game_manager'):
-                    self.game_manager.save_game_stats(self.player)
-                pygame.quit()
-                sys.exit()
+                self.quit()
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    self.paused = not self.paused
-                if event.key == pygame.K_SPACE and not self.paused:
-                    self.player.jump()
+                    post(('pause',))
+                if event.key == pygame.K_SPACE:
+                    # Tagged with the time it was read, to measure how long until the jump is on screen
+                    post(('jump', time.perf_counter()))
                 # Debug: Allow restart with 'R' key
                 if event.key == pygame.K_r and self.game_manager.game_over:
-                    self.reset_game()
+                    # Fresh seed so the new session can be replayed on its own
+                    post(('restart', random.randrange(2 ** 32)))
+                # Memory overlay and export
+                if event.key == pygame.K_F3 and self.memory_monitor:
+                    self.show_memory = not self.show_memory
+                if event.key == pygame.K_F4 and self.memory_monitor:
+                    print(f"Memory samples written to {self.memory_monitor.export()}")
                 # Add quit key (Q)
                 if event.key == pygame.K_q:
-                    self.running = False
-                    # Save game stats before exiting
-                    if hasattr(self, 'game_manager'):
-                        self.game_manager.save_game_stats(self.player)
-                    pygame.quit()
-                    sys.exit()
-
-    def reset_game(self):
-        """Reset the game after game over"""
+                    self.quit()
+
+    def apply_command(self, command):
+        """Apply one input command from handle_events(): ('pause',), ('jump', input_time),
+        ('restart', seed) or ('keys', left, right) for the held movement keys"""
+        kind = command[0]
+        if kind == 'pause':
+            self.paused = not self.paused
+            self.input_bits ^= INPUT_PAUSE
+        elif kind == 'jump':
+            if not self.paused:
+                jumps = self.player.jump_count
+                self.player.jump()
+                self.input_bits |= INPUT_JUMP
+                if self.player.jump_count > jumps:
+                    self.jump_input_time = command[1]
+        elif kind == 'restart':
+            if self.game_manager.game_over:
+                self.save_replay()
+                self.reset_game(command[1])
+                self.input_bits = 0
+                if self.recorder:
+                    self.recorder = ReplayRecorder(self.seed, self.FPS)
+        elif kind == 'keys':
+            self.held_keys = {pygame.K_LEFT: command[1], pygame.K_RIGHT: command[2]}
+
+    def quit(self):
+        """Save the session and exit"""
+        self.running = False
+        # The simulation must not change the game while it is saved
+        self.stop_simulation()
+        print(self.pacer.summary())
+        # Save game stats before exiting (stress runs aren't real games)
+        if hasattr(self, 'game_manager') and not self.stress:
+            self.game_manager.save_game_stats(self.player)
+        self.save_replay(quit=True)
+        pygame.quit()
+        sys.exit()
+
+    def frame_input_bits(self):
+        """Input bits of the frame just updated, for the replay recorder"""
+        keys = self.held_keys if self.held_keys is not None else pygame.key.get_pressed()
+        bits = self.input_bits
+        if keys[pygame.K_LEFT]:
+            bits |= INPUT_LEFT
+        if keys[pygame.K_RIGHT]:
+            bits |= INPUT_RIGHT
+        if self.last_ramp:
+            bits |= INPUT_RAMP
+        return bits
+
+    def save_replay(self, quit=False):
+        """Write the current session's replay (if recording) next to the stats"""
+        if self.recorder is None or not self.recorder.inputs:
+            return None
+        if quit:
+            self.recorder.mark_quit()
+        return self.recorder.save(replay_path(self.game_manager.session_id))
+
+    def get_ticks(self):
+        """Milliseconds since start (simulated from the frame count when headless)"""
+        if self.headless:
+            return self.frame_count * 1000 // self.FPS
+        return pygame.time.get_ticks()
+
+    def get_time(self):
+        """Seconds for the game timer (simulated from the frame count when headless)"""
+        if self.headless:
+            return self.frame_count / self.FPS
+        return time.time()
+
+    def snapshot(self):
+        """Capture the simulation state for a later restore() (level geometry is shared)"""
+        return WorldSnapshot.capture(self)
+
+    def restore(self, snapshot):
+        """Return the simulation to a state captured by snapshot()"""
+        snapshot.restore(self)
+
+    def reset_game(self, seed=None):
+        """Reset the game after game over (optionally re-seeding the level generator)
+
+        Only game state is rebuilt: the player's sprite, fonts, render targets and
+        the game manager (with its already prepared stats files) are reused.
+        """
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+        # Clear moving obstacles before init_game_objects registers the new ones
+        self.moving_obstacles = []
         self.init_game_objects()
+        self.frame_count = 0
         self.camera_offset_x = 0
         self.distance_traveled = 0
         self.distance_in_meters = 0
         self.last_platform_x = 800
+        self.last_main_platform = None
         self.scroll_speed = 3
-        self.game_manager = GameManager()
+        self.game_manager.reset()
         self.game_manager.start_timer()
         # Reset the starting delay
         self.current_delay = self.start_delay
         # Reset combo system
         self.combo_counter = 0
         self.combo_timer = 0
-        # Clear particles
+        # Clear particles and the HUD (the governor's quality level carries over)
         self.particles = []
-        # Clear moving obstacles
-        self.moving_obstacles = []
+        self.hud_surfaces = []
 
-    def update(self):
-        """Update game state"""
+    def update(self, steps=1):
+        """Update game state
+
+        steps > 1 advances that many frames in one coarse step; collisions are
+        then resolved with swept tests so nothing is skipped between frames.
+        """
+        self.last_ramp = False
         if self.paused or self.game_manager.game_over or self.game_manager.game_completed:
             return
 
-        # Update start delay before scrolling begins
-        if self.current_delay > 0:
-            self.current_delay -= 1
-            # During this grace period, still allow player to move but don't start scrolling
-            self.player.move(self.platforms)
-        else:
-            # Update camera position (auto-scrolling) after delay
-            self.camera_offset_x += self.scroll_speed
-            self.distance_traveled = self.camera_offset_x
-            self.distance_in_meters = self.distance_traveled / self.pixels_per_meter
-
-            # Force player to keep up with scrolling (apply scroll effect)
-            # This adds a constant force pushing right - ensure it's strong enough
-            self.player.velocity_x = max(self.player.velocity_x, self.scroll_speed)
+        first_frame = self.frame_count
+        self.frame_count += steps
 
-            # Move player with the adjusted velocity
-            self.player.move(self.platforms)
+        # Frames still in the start delay don't scroll; a coarse step can straddle its end
+        grace = min(steps, self.current_delay)
+        self.current_delay -= grace
+        scrolling = steps - grace
 
-            # Make sure player doesn't fall too far behind the scrolling
-            if self.player.x < self.camera_offset_x - 200:
-                self.game_manager.game_over = True
-                self.game_manager.death_causes['left_behind'] += 1
-                self.game_manager.end_timer()
+        # Camera, scroll push and difficulty ramp frame by frame, so a coarse step scrolls like single frames
+        floors = [None] * grace
+        for frame in range(first_frame + grace + 1, self.frame_count + 1):
+            # Update camera position (auto-scrolling) after delay
+            self.camera_offset_x += self.scroll_speed
+            # Force player to keep up with scrolling (the player applies it before each frame's input)
+            floors.append(self.scroll_speed)
 
             # Increase difficulty by slightly increasing scroll speed over time
-            if pygame.time.get_ticks() % 1000 == 0:  # Every second
+            if steps == 1:
+                new_second = self.get_ticks() % 1000 == 0  # Every second
+            else:
+                # Coarse steps only run headless, where each frame's tick follows from the frame count
+                new_second = frame * 1000 // self.FPS // 1000 != (frame - 1) * 1000 // self.FPS // 1000
+            if self.replay_ramp is not None:
+                # Replays use the recorded decision, since live games time it from the wall clock
+                new_second = self.replay_ramp
+            self.last_ramp = self.last_ramp or new_second
+            if new_second:
                 self.scroll_speed += 0.01
                 if self.scroll_speed > 7:  # Cap the maximum scroll speed
                     self.scroll_speed = 7
 
+        # During the grace period the player still moves, without the scroll push
+        self.player.move(self.platforms, self.held_keys, steps, floors)
+
+        if scrolling:
+            self.distance_traveled = self.camera_offset_x
+            self.distance_in_meters = self.distance_traveled / self.pixels_per_meter
+
+            # Make sure player doesn't fall too far behind the scrolling
+            if self.player.x < self.camera_offset_x - 200:
+                self.end_game('left_behind')
+
             # Generate new game elements
             self.generate_new_elements()
 
-            if random.random() < 0.05:  # 5% chance per frame to check for new obstacles
+            # 5% chance per frame to check for new obstacles
+            obstacle_check_chance = 0.05 if scrolling == 1 else 1 - 0.95 ** scrolling
+            if self.rng.random() < obstacle_check_chance:
                 self.generate_obstacles()
 
             # Update moving obstacles
-            self.update_moving_obstacles()
+            self.update_moving_obstacles(scrolling)
 
             # Update particles
-            self.update_particles()
+            for _ in range(scrolling):
+                self.update_particles()
 
             # Update combo timer
             if self.combo_timer > 0:
-                self.combo_timer -= 1
+                self.combo_timer = max(0, self.combo_timer - scrolling)
             else:
                 self.combo_counter = 0  # Reset combo if timer expires
 
-        # Check for coin collection
-        for coin in self.coins:
-            if not coin.collected and coin.check_collision(self.player.get_rect()):
-                # Calculate coin value based on combo
-                coin_value = coin.collect()
-
-                # Apply combo multiplier if active
-                if self.combo_timer > 0:
-                    self.combo_counter += 1
-                    # Increase value based on combo (max 3x multiplier)
-                    combo_multiplier = min(3, 1 + self.combo_counter * 0.1)
-                    coin_value = int(coin_value * combo_multiplier)
-                else:
-                    # Start a new combo
-                    self.combo_counter = 1
-
-                # Reset combo timer
-                self.combo_timer = self.combo_timeout
-
-                # Create particle effect
-                self.create_coin_collect_particles(coin.x, coin.y)
-
-                # Update player and score
-                self.player.collect_coin(coin_value)
-                self.game_manager.update_score(coin_value)
-
-        # Check for obstacle collisions - GAME OVER
-        for obstacle in self.obstacles:
-            if self.player.get_rect().colliderect(obstacle.get_rect()):
-                self.game_manager.game_over = True
-                self.game_manager.death_causes['obstacle'] += 1
-                self.game_manager.end_timer()
-                break
+        if steps == 1:
+            # Player rect doesn't change during the collision checks below
+            player_rect = self.player.get_rect()
+
+            # Check for coin collection (one vectorized test over the coins around the player)
+            for i in self.coins.overlapping(player_rect.x, player_rect.y, player_rect.width, player_rect.height):
+                self.collect_coin(i)
+
+            # Check for obstacle collisions - GAME OVER
+            for obstacle in self.obstacles:
+                if player_rect.colliderect(obstacle.get_rect()):
+                    self.hit_obstacle()
+                    break
+        else:
+            self.check_collisions_swept()
 
         # Check if player fell off screen - GAME OVER
         if self.player.y > self.SCREEN_HEIGHT:
-            self.game_manager.game_over = True
-            self.game_manager.death_causes['falling'] += 1
-            self.game_manager.end_timer()
+            self.end_game('falling')
 
         # Collect data point
         self.game_manager.collect_data_point(self.player)
@@ -564,109 +764,243 @@ class GameWindow:
         # Update player distance for statistics
         self.player.distance_traveled = self.distance_traveled
 
-    def render(self):
-        """Render the game"""
+    def collect_coin(self, i):
+        """Collect coin i of the coin field, applying the combo multiplier"""
+        # Calculate coin value based on combo
+        coin_value, x, y = self.coins.collect(i)
+
+        # Apply combo multiplier if active
+        if self.combo_timer > 0:
+            self.combo_counter += 1
+            # Increase value based on combo (max 3x multiplier)
+            combo_multiplier = min(3, 1 + self.combo_counter * 0.1)
+            coin_value = int(coin_value * combo_multiplier)
+        else:
+            # Start a new combo
+            self.combo_counter = 1
+
+        # Reset combo timer
+        self.combo_timer = self.combo_timeout
+
+        # Create particle effect
+        self.create_coin_collect_particles(x, y)
+
+        # Update player and score
+        self.player.collect_coin(coin_value)
+        self.game_manager.update_score(coin_value)
+
+    def hit_obstacle(self):
+        """End the game after an obstacle collision"""
+        self.end_game('obstacle')
+
+    def end_game(self, cause):
+        """Game over, died by `cause` (stress runs ignore deaths and play on)"""
+        if self.stress:
+            return
+        self.game_manager.game_over = True
+        self.game_manager.death_causes[cause] += 1
+        self.game_manager.end_timer()
+
+    def check_collisions_swept(self):
+        """Coin and obstacle checks along the player's whole move (coarse steps)"""
+        player = self.player
+        start_x = player.previous_x
+        start_y = player.previous_y
+        dx = player.x - start_x
+        dy = player.y - start_y
+        left, top, right, bottom = path_bounds(((start_x, start_y), (player.x, player.y)),
+                                               player.width, player.height)
+
+        # Coins are static: sweep the player box against each nearby coin box
+        coins = self.coins
+        for i in coins.near(left, right):
+            x = float(coins.x[i])
+            y = float(coins.y[i])
+            radius = float(coins.radius[i])
+            if sweep_aabb(start_x, start_y, player.width, player.height, dx, dy,
+                          x - radius, y - radius, radius * 2, radius * 2) is not None:
+                self.collect_coin(i)
+
+        # Moving obstacles moved during the step too, so sweep with the relative motion
+        for obstacle in self.obstacles:
+            start_ox = getattr(obstacle, 'previous_x', obstacle.x)
+            if max(start_ox, obstacle.x) > right or min(start_ox, obstacle.x) + obstacle.width < left:
+                continue
+            if obstacle.y > bottom or obstacle.y + obstacle.height < top:
+                continue
+            if sweep_aabb(start_x, start_y, player.width, player.height, dx - (obstacle.x - start_ox), dy,
+                          start_ox, obstacle.y, obstacle.width, obstacle.height) is not None:
+                self.hit_obstacle()
+                break
+
+    def set_render_scale(self, scale):
+        """Draw the world at scale x 800x600 from the next frame on"""
+        self.render_scale = scale
+        size = (round(self.SCREEN_WIDTH * scale), round(self.SCREEN_HEIGHT * scale))
+        if size == self.screen.get_size():
+            # Same size as the window: draw straight into it
+            self.world_surface = self.screen
+        else:
+            self.world_surface = pygame.Surface(size)
+            if not self.headless:
+                self.world_surface = self.world_surface.convert()
+        # The background is pre-scaled to the target once, not every frame
+        self.background_image = None
+        if self.background_source is not None:
+            self.background_image = pygame.transform.scale(self.background_source, size)
+
+    def render(self, state=None):
+        """Render the game (a RenderState published by the simulation thread, or the live game)"""
+        if state is None:
+            state = RenderState.capture(self, frozen=False)
+        began = time.perf_counter()
+        surface = self.world_surface
+        scale = self.render_scale
+        camera_offset_x = state.camera_offset_x
+
         # Fill background
         if self.background_image:
-            self.screen.blit(self.background_image, (0, 0))
+            surface.blit(self.background_image, (0, 0))
         else:
-            self.screen.fill(self.BACKGROUND_COLOR)
+            surface.fill(self.BACKGROUND_COLOR)
 
         # Draw platforms
-        for platform in self.platforms:
-            platform.draw(self.screen, self.camera_offset_x)
+        for platform in state.platforms:
+            platform.draw(surface, camera_offset_x, scale)
 
         # Draw coins
-        for coin in self.coins:
-            if not coin.collected:
-                coin.draw(self.screen, self.camera_offset_x)
+        draw_coins(surface, state.coins, camera_offset_x, scale)
 
         # Draw obstacles
-        for obstacle in self.obstacles:
-            obstacle.draw(self.screen, self.camera_offset_x)
-
-        # Draw particles
-        for particle in self.particles:
-            pygame.draw.circle(
-                self.screen,
-                particle['color'],
-                (int(particle['x'] - self.camera_offset_x), int(particle['y'])),
-                int(particle['radius'])
-            )
+        for obstacle in state.obstacles:
+            obstacle.draw(surface, camera_offset_x, scale)
+
+        # Draw particles (skipped at the lowest quality)
+        if self.governor.settings['draw_particles']:
+            for particle in state.particles:
+                pygame.draw.circle(
+                    surface,
+                    particle['color'],
+                    (int((particle['x'] - camera_offset_x) * scale), int(particle['y'] * scale)),
+                    max(1, int(particle['radius'] * scale))
+                )
 
         # Draw player
-        self.player.draw(self.screen, self.camera_offset_x)
+        state.player.draw(surface, camera_offset_x, scale)
 
-        # Draw UI
-        self.render_ui()
+        # One nearest-neighbour upscale into the window per frame
+        if surface is not self.screen:
+            pygame.transform.scale(surface, self.screen.get_size(), self.screen)
+
+        # Pick the next frame's render resolution from the fill cost
+        self.fill_ms = (time.perf_counter() - began) * 1000
+        if self.resolution_governor is not None and self.resolution_governor.record(self.fill_ms):
+            self.set_render_scale(self.resolution_governor.settings['render_scale'])
+
+        # Draw UI (at window resolution, so text stays sharp)
+        self.render_ui(state)
 
         # Update display
         pygame.display.flip()
 
-    def render_ui(self):
+        # First frame on screen with a jump: its input latency
+        if state.jump_input_time is not None and state.jump_input_time != self.shown_jump_input_time:
+            self.shown_jump_input_time = state.jump_input_time
+            self.pacer.record_latency(state.jump_input_time)
+
+    def render_ui(self, state):
         """Render UI elements"""
-        # Draw score and coins
-        score_text = self.font.render(f"Score: {self.player.score}", True, self.BLACK)
-        coins_text = self.font.render(f"Coins: {self.player.coins_collected}", True, self.BLACK)
-        distance_text = self.font.render(f"Distance: {int(self.distance_in_meters)} meters", True, self.BLACK)
-        quit_text = self.font.render("Press Q to quit", True, self.BLACK)
+        if self.font is None:
+            return
 
-        self.screen.blit(score_text, (20, 20))
-        self.screen.blit(coins_text, (20, 50))
-        self.screen.blit(distance_text, (20, 80))
-        self.screen.blit(quit_text, (self.SCREEN_WIDTH - 150, 20))  # Add quit instructions in top-right
+        # Text rendering is the HUD's cost, so it is redone less often at lower quality
+        if self.rendered_frames % self.governor.settings['hud_interval'] == 0 or not self.hud_surfaces:
+            self.update_hud(state)
+        self.rendered_frames += 1
+        for surface, position in self.hud_surfaces:
+            self.screen.blit(surface, position)
 
-        # Draw combo counter if active
-        if self.combo_timer > 0 and self.combo_counter > 1:
-            combo_text = self.font.render(f"Combo: x{self.combo_counter}", True, (255, 140, 0))  # Orange color
-            self.screen.blit(combo_text, (20, 110))
+        # Memory overlay below the HUD
+        if self.show_memory and self.memory_monitor:
+            for i, line in enumerate(self.memory_monitor.overlay_lines()):
+                self.screen.blit(self.small_font.render(line, True, self.BLACK), (20, 140 + i * 18))
+
+        # Messages are centred in the window, whatever its size
+        center_x = self.screen.get_width() // 2
+        center_y = self.screen.get_height() // 2
 
         # Draw game start instructions during delay
-        if self.current_delay > 0:
+        if state.current_delay > 0:
             start_text = self.font.render("Use Arrow Keys to move and SPACE to jump", True, self.BLACK)
-            self.screen.blit(start_text, (self.SCREEN_WIDTH // 2 - 200, self.SCREEN_HEIGHT // 2))
+            self.screen.blit(start_text, (center_x - 200, center_y))
 
         # Draw game over message
-        if self.game_manager.game_over:
+        if state.game_over:
             # Semi-transparent overlay
-            overlay = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))  # Black with 50% transparency
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.get_overlay(), (0, 0))
 
             game_over_text = self.font.render("Game Over!", True, self.WHITE)
             final_score = self.font.render(
-                f"Final Score: {self.player.score} | Distance: {int(self.distance_in_meters)} meters", True, self.WHITE)
-
-            # Get death cause
-            death_cause = next((cause for cause, count in self.game_manager.death_causes.items()
-                                if count > 0), "unknown")
-            death_text = self.font.render(f"Cause of death: {death_cause}", True, self.WHITE)
+                f"Final Score: {state.player.score} | Distance: {int(state.distance_in_meters)} meters", True, self.WHITE)
+            death_text = self.font.render(f"Cause of death: {state.death_cause}", True, self.WHITE)
 
             restart_text = self.font.render("Press R to restart or ESC to quit", True, self.WHITE)
 
-            self.screen.blit(game_over_text, (self.SCREEN_WIDTH // 2 - 80, self.SCREEN_HEIGHT // 2 - 60))
-            self.screen.blit(final_score, (self.SCREEN_WIDTH // 2 - 200, self.SCREEN_HEIGHT // 2 - 20))
-            self.screen.blit(death_text, (self.SCREEN_WIDTH // 2 - 120, self.SCREEN_HEIGHT // 2 + 20))
-            self.screen.blit(restart_text, (self.SCREEN_WIDTH // 2 - 180, self.SCREEN_HEIGHT // 2 + 60))
+            self.screen.blit(game_over_text, (center_x - 80, center_y - 60))
+            self.screen.blit(final_score, (center_x - 200, center_y - 20))
+            self.screen.blit(death_text, (center_x - 120, center_y + 20))
+            self.screen.blit(restart_text, (center_x - 180, center_y + 60))
 
         # Draw pause message
-        if self.paused:
+        if state.paused:
             # Semi-transparent overlay
-            overlay = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))  # Black with 50% transparency
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.get_overlay(), (0, 0))
 
             pause_text = self.font.render("Paused - Press ESC to resume", True, self.WHITE)
-            self.screen.blit(pause_text, (self.SCREEN_WIDTH // 2 - 150, self.SCREEN_HEIGHT // 2))
+            self.screen.blit(pause_text, (center_x - 150, center_y))
 
             # Add quit button instructions in pause menu
             quit_text = self.font.render("Press Q to quit to menu", True, self.WHITE)
-            self.screen.blit(quit_text, (self.SCREEN_WIDTH // 2 - 120, self.SCREEN_HEIGHT // 2 + 40))
+            self.screen.blit(quit_text, (center_x - 120, center_y + 40))
+
+    def update_hud(self, state):
+        """Re-render the score, coins, distance and combo texts"""
+        # Draw score and coins
+        score_text = self.font.render(f"Score: {state.player.score}", True, self.BLACK)
+        coins_text = self.font.render(f"Coins: {state.player.coins_collected}", True, self.BLACK)
+        distance_text = self.font.render(f"Distance: {int(state.distance_in_meters)} meters", True, self.BLACK)
+        quit_text = self.font.render("Press Q to quit", True, self.BLACK)
+
+        self.hud_surfaces = [
+            (score_text, (20, 20)),
+            (coins_text, (20, 50)),
+            (distance_text, (20, 80)),
+            (quit_text, (self.screen.get_width() - 150, 20)),  # Add quit instructions in top-right
+        ]
+
+        # Draw combo counter if active
+        if state.combo_timer > 0 and state.combo_counter > 1:
+            combo_text = self.font.render(f"Combo: x{state.combo_counter}", True, (255, 140, 0))  # Orange color
+            self.hud_surfaces.append((combo_text, (20, 110)))
+
+    def get_overlay(self):
+        """Screen-sized semi-transparent overlay, created on first use"""
+        if self.overlay is None:
+            self.overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 128))  # Black with 50% transparency
+        return self.overlay
+
+    def run(self, threaded=SIM_THREAD):
+        """Main game loop (threaded=True runs the simulation on its own thread, see run_threaded)"""
+        # A live game saves its session when it ends
+        if not self.stress:
+            prepare_stats_files()
 
-    def run(self):
-        """Main game loop"""
         # Start timer
         self.game_manager.start_timer()
+        if threaded:
+            self.run_threaded()
+            return
 
         while self.running:
             # Handle events
@@ -675,15 +1009,69 @@ class GameWindow:
             # Update game state
             self.update()
 
+            # Record this frame's input for the replay
+            if self.recorder:
+                self.recorder.end_frame(self, self.frame_input_bits())
+
             # Render
             self.render()
 
-            # Cap the frame rate
-            self.clock.tick(self.FPS)
+            # Cap the frame rate, then let the governor adjust effects quality to this frame's work time
+            self.governor.record(self.pacer.wait())
+
+            # Periodic memory sample
+            if self.memory_monitor:
+                self.memory_monitor.tick()
 
             # Check if game is over AND user presses ESC
             if self.game_manager.game_over and pygame.key.get_pressed()[pygame.K_ESCAPE]:
                 # Save game stats before exiting
                 self.game_manager.save_game_stats(self.player)
+                self.save_replay(quit=True)
+                print(self.pacer.summary())
                 self.running = False
                 return
+
+    def run_threaded(self):
+        """Main loop with the simulation on a SimulationThread
+
+        This thread only handles events and renders the latest published
+        state; the held movement keys are posted whenever they change.
+        """
+        self.held_keys = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+        posted_keys = (False, False)
+        self.simulation = simulation = SimulationThread(self)
+        simulation.start()
+
+        while self.running:
+            frame_start = time.perf_counter()
+            self.handle_events(simulation.post)
+            keys = pygame.key.get_pressed()
+            held = (keys[pygame.K_LEFT], keys[pygame.K_RIGHT])
+            if held != posted_keys:
+                simulation.post(('keys',) + held)
+                posted_keys = held
+
+            state = simulation.latest
+            self.render(state)
+            simulation.record_frame(frame_start, time.perf_counter())
+
+            self.governor.record(self.pacer.wait())
+            if self.memory_monitor:
+                self.memory_monitor.tick()
+
+            # Check if game is over AND user presses ESC
+            if state.game_over and keys[pygame.K_ESCAPE]:
+                self.stop_simulation()
+                self.game_manager.save_game_stats(self.player)
+                self.save_replay(quit=True)
+                print(self.pacer.summary())
+                self.running = False
+
+    def stop_simulation(self):
+        """Stop the simulation thread, if running, and print how much overlap it achieved"""
+        if self.simulation is None:
+            return
+        self.simulation.stop()
+        print(self.simulation.summary())
+        self.simulation = None
@@ -0,0 +1,146 @@
+import argparse
+import heapq
+import json
+import os
+import sys
+
+from quantile_sketch import SessionSketches
+from stats_segments import iter_session_rows
+from stats_store import SUMMARY_FILE
+
+
+LEADERBOARD_FILE = 'stats/leaderboard.json'
+LEADERBOARD_SIZE = 100
+
+# Leaderboard name -> stats column
+LEADERBOARD_METRICS = {
+    'score': 'score',
+    'distance': 'distance_traveled',
+    'coins': 'coins_collected',
+}
+
+
+class Leaderboard:
+    """Top-k sessions by score, distance and coins, kept in a small sidecar file.
+
+    Each board is a min-heap of at most k entries [value, -sequence,
+    session_id, timestamp], so adding a session costs O(log k) and the
+    weakest entry is always at the root. The negated sequence number makes
+    the earlier of two tied sessions rank higher.
+    """
+
+    def __init__(self, k=LEADERBOARD_SIZE):
+        self.k = k
+        self.sessions = 0  # Sessions ever added (for "rank N of M")
+        self.boards = {metric: [] for metric in LEADERBOARD_METRICS}
+        self.rank_cache = {}  # metric -> {session_id: rank}, rebuilt after changes
+
+    @classmethod
+    def load(cls, path=LEADERBOARD_FILE, k=LEADERBOARD_SIZE):
+        """Load the leaderboard sidecar (an empty leaderboard if it doesn't exist yet)"""
+        leaderboard = cls(k)
+        if os.path.exists(path):
+            with open(path) as file:
+                data = json.load(file)
+            leaderboard.k = data['k']
+            leaderboard.sessions = data['sessions']
+            for metric in LEADERBOARD_METRICS:
+                leaderboard.boards[metric] = data['boards'].get(metric, [])
+                heapq.heapify(leaderboard.boards[metric])
+        return leaderboard
+
+    def save(self, path=LEADERBOARD_FILE):
+        """Write the sidecar atomically so a crash can't leave half a file"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'k': self.k, 'sessions': self.sessions, 'boards': self.boards}, file)
+        os.replace(temp_path, path)
+
+    def add(self, row):
+        """Add a session's summary row (a dict keyed by SUMMARY_COLUMNS)"""
+        self.sessions += 1
+        for metric, column in LEADERBOARD_METRICS.items():
+            entry = [float(row[column]), -self.sessions, str(row['session_id']), str(row['timestamp'])]
+            board = self.boards[metric]
+            if len(board) < self.k:
+                heapq.heappush(board, entry)
+            elif entry > board[0]:
+                heapq.heapreplace(board, entry)
+            else:
+                continue
+            self.rank_cache.pop(metric, None)
+
+    def top(self, metric, count=None):
+        """Best entries first, as dicts with rank, session_id, timestamp and value"""
+        ordered = sorted(self.boards[metric], reverse=True)[:count]
+        return [{'rank': rank, 'session_id': session_id, 'timestamp': timestamp, 'value': value}
+                for rank, (value, _, session_id, timestamp) in enumerate(ordered, 1)]
+
+    def rank(self, session_id, metric):
+        """Rank of a session on a board, or None if it isn't in the top k"""
+        ranks = self.rank_cache.get(metric)
+        if ranks is None:
+            ranks = {entry['session_id']: entry['rank'] for entry in self.top(metric)}
+            self.rank_cache[metric] = ranks
+        return ranks.get(str(session_id))
+
+    def describe_rank(self, session_id, metric, value=None, sketches=None):
+        """A session's rank as text: exact in the top k, estimated from the sketches below it
+
+        Below the top k the session's value is needed (the board doesn't
+        keep it); metrics without a sketch, or an unknown value, are labeled
+        as outside the top k.
+        """
+        rank = self.rank(session_id, metric)
+        if rank:
+            return f"#{rank} of {self.sessions}"
+        if value is not None and sketches is not None and metric in sketches.overall:
+            sketch = sketches.overall[metric]
+            # Never estimate into the top k (the session would be on the board)
+            return f"about #{max(sketch.rank(value), self.k + 1)} of {sketch.count}"
+        return f"outside the top {self.k}"
+
+    @classmethod
+    def rebuild(cls, stats_file, k=LEADERBOARD_SIZE):
+        """Build a leaderboard from an existing summary file and its closed segments (one pass)"""
+        leaderboard = cls(k)
+        for row in iter_session_rows(stats_file):
+            leaderboard.add(row)
+        return leaderboard
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Show or rebuild the CoinDash leaderboards")
+    parser.add_argument('--metric', choices=list(LEADERBOARD_METRICS), default='score', help="board to show")
+    parser.add_argument('--count', type=int, default=10, help="entries to show")
+    parser.add_argument('--session', help="show this session's rank on every board")
+    parser.add_argument('--rebuild', action='store_true', help=f"rebuild the sidecar from {SUMMARY_FILE}")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        leaderboard = Leaderboard.rebuild(SUMMARY_FILE)
+        leaderboard.save()
+        print(f"Rebuilt {LEADERBOARD_FILE} from {leaderboard.sessions} sessions")
+    else:
+        leaderboard = Leaderboard.load()
+
+    if args.session:
+        row = None
+        if any(leaderboard.rank(args.session, metric) is None for metric in LEADERBOARD_METRICS):
+            # Below the top k the rank is estimated from the session's value (one pass to find it)
+            row = next((row for row in iter_session_rows(SUMMARY_FILE) if row['session_id'] == args.session), None)
+        sketches = SessionSketches.load()
+        for metric, column in LEADERBOARD_METRICS.items():
+            value = row[column] if row and row[column] != '' else None
+            print(f"{metric}: {leaderboard.describe_rank(args.session, metric, value, sketches)}")
+        return 0
+
+    for entry in leaderboard.top(args.metric, args.count):
+        print(f"{entry['rank']:>3}. {entry['value']:>10g}  {entry['session_id']}  {entry['timestamp']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import json
+import os
+import tracemalloc
+from collections import deque
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+
+SAMPLE_INTERVAL_MS = 10000  # Game time between samples
+MAX_SAMPLES = 720  # Two hours of samples are kept in memory
+TOP_ALLOCATIONS = 5
+MEMORY_DIR = 'stats/memory'
+
+
+def rss_kb():
+    """Resident set size of this process in KB (peak RSS where the current one isn't available)"""
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if peak > 1 << 24 else peak  # Bytes on macOS, KB elsewhere
+    return None
+
+
+def entity_counts(game):
+    """Lengths of the game's growing lists (a GameWindow)"""
+    counts = {
+        'platforms': len(game.platforms),
+        'coins': len(game.coins),
+        'collected_coins': game.coins.collected_count(),
+        'obstacles': len(game.obstacles),
+        'moving_obstacles': len(game.moving_obstacles),
+        'particles': len(game.particles),
+        'data_points': len(game.game_manager.data_points),
+    }
+    if game.recorder is not None:
+        counts['replay_frames'] = len(game.recorder.inputs)
+        counts['replay_keyframes'] = len(game.recorder.keyframes)
+    return counts
+
+
+class MemoryMonitor:
+    """Periodic memory samples of a running game: entity counts, RSS and top allocations.
+
+    Samples are taken every SAMPLE_INTERVAL_MS of game time, counted in
+    frames across restarts, so headless soak runs sample simulated time
+    the same way live games sample real time. Allocation tracking
+    with tracemalloc slows the game down noticeably, so it is only on when
+    asked for (trace=True or COINDASH_TRACEMALLOC=1).
+    """
+
+    def __init__(self, game, interval_ms=SAMPLE_INTERVAL_MS, trace=None, max_samples=MAX_SAMPLES):
+        self.game = game
+        self.interval_ms = interval_ms
+        self.samples = deque(maxlen=max_samples)
+        self.frames = 0  # Frames seen since the monitor started
+        self.next_sample_frame = 0
+        if trace is None:
+            trace = os.environ.get('COINDASH_TRACEMALLOC') == '1'
+        self.trace = trace
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def game_time(self):
+        """Game time in ms since the monitor started"""
+        return self.frames * 1000 // self.game.FPS
+
+    def tick(self, frames=1):
+        """Count frames and take a sample if one is due; returns it (or None)"""
+        self.frames += frames
+        if self.frames < self.next_sample_frame:
+            return None
+        self.next_sample_frame = self.frames + self.interval_ms * self.game.FPS // 1000
+        return self.sample()
+
+    def sample(self):
+        """Record and return a sample now"""
+        sample = {
+            'time_ms': self.game_time(),
+            'session_id': self.game.game_manager.session_id,
+            'rss_kb': rss_kb(),
+            'counts': entity_counts(self.game),
+        }
+        if self.trace:
+            # The monitor's own samples and tracemalloc's bookkeeping are left out
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, tracemalloc.__file__),
+            ])
+            statistics = snapshot.statistics('lineno')
+            sample['traced_kb'] = sum(stat.size for stat in statistics) // 1024
+            sample['traced_peak_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+            sample['top'] = [[f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                              stat.size // 1024, stat.count] for stat in statistics[:TOP_ALLOCATIONS]]
+        self.samples.append(sample)
+        return sample
+
+    def overlay_lines(self):
+        """Lines of text describing the latest sample"""
+        if not self.samples:
+            return ["Memory: no samples yet"]
+        sample = self.samples[-1]
+        first = self.samples[0]
+        lines = [f"Memory at {sample['time_ms'] / 60000:.1f} min"]
+        if sample['rss_kb'] is not None:
+            growth = sample['rss_kb'] - first['rss_kb']
+            lines.append(f"RSS {sample['rss_kb'] / 1024:.1f}MB ({growth / 1024:+.1f}MB)")
+        if 'traced_kb' in sample:
+            lines.append(f"Traced {sample['traced_kb'] / 1024:.1f}MB (peak {sample['traced_peak_kb'] / 1024:.1f}MB)")
+        lines.append("  ".join(f"{name} {count}" for name, count in sample['counts'].items()))
+        for location, size_kb, count in sample.get('top', []):
+            lines.append(f"{os.path.basename(location)} {size_kb}KB in {count}")
+        return lines
+
+    def export(self, path=None):
+        """Write the samples as JSON (default: stats/memory/<session_id>.json); returns the path"""
+        if path is None:
+            path = os.path.join(MEMORY_DIR, f"{self.game.game_manager.session_id}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'interval_ms': self.interval_ms, 'samples': list(self.samples)}, file, indent=1)
+        os.replace(temp_path, path)
+        return path
+
+
+def growth(samples, key):
+    """(early, late) maxima of a sample value over the first and last thirds of a run
+
+    key is 'rss_kb', 'traced_kb' or an entity count name.
+    """
+    def value(sample):
+        return sample['counts'][key] if key in sample['counts'] else sample[key]
+
+    third = max(1, len(samples) // 3)
+    return max(value(s) for s in samples[:third]), max(value(s) for s in samples[-third:])
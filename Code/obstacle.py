@@ -13,11 +13,12 @@ class Obstacle:
         """Return pygame Rect for collision detection"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
-    def draw(self, screen, camera_offset_x):
-        """Draw the obstacle on screen with camera offset"""
+    def draw(self, screen, camera_offset_x, scale=1):
+        """Draw the obstacle on screen with camera offset (scale < 1 for a low-resolution target)"""
         # Apply camera offset for scrolling
-        draw_x = self.x - camera_offset_x
+        draw_x = (self.x - camera_offset_x) * scale
 
         # Only draw if on screen
-        if -self.width <= draw_x <= pygame.display.get_surface().get_width():
-            pygame.draw.rect(screen, self.color, (draw_x, self.y, self.width, self.height))
\ No newline at end of file
+        if -self.width * scale <= draw_x <= screen.get_width():
+            pygame.draw.rect(screen, self.color,
+                             (draw_x, self.y * scale, self.width * scale, self.height * scale))
\ No newline at end of file
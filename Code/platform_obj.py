@@ -13,11 +13,12 @@ class Platform:
         """Return pygame Rect for collision detection"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
-    def draw(self, screen, camera_offset_x):
-        """Draw the platform on screen with camera offset"""
+    def draw(self, screen, camera_offset_x, scale=1):
+        """Draw the platform on screen with camera offset (scale < 1 for a low-resolution target)"""
         # Apply camera offset for scrolling
-        draw_x = self.x - camera_offset_x
+        draw_x = (self.x - camera_offset_x) * scale
 
         # Only draw if platform is (partially) on screen
-        if draw_x + self.width >= 0 and draw_x <= screen.get_width():
-            pygame.draw.rect(screen, self.color, (draw_x, self.y, self.width, self.height))
\ No newline at end of file
+        if draw_x + self.width * scale >= 0 and draw_x <= screen.get_width():
+            pygame.draw.rect(screen, self.color,
+                             (draw_x, self.y * scale, self.width * scale, self.height * scale))
\ No newline at end of file
@@ -3,8 +3,6 @@ import pygame
 
 class Player:
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
         self.width = 30
         self.height = 50
 
@@ -13,19 +11,31 @@ class Player:
             self.sprite = pygame.image.load("player.png").convert_alpha()
             self.sprite = pygame.transform.scale(self.sprite, (self.width, self.height))
             self.use_sprite = True
+            # Sprites for low-resolution targets by scale (shared with copies made for rendering)
+            self.scaled_sprites = {1: self.sprite}
         except:
             self.use_sprite = False
             self.color = (0, 0, 255)  # Blue color
 
         # Movement properties
-        self.velocity_x = 0
-        self.velocity_y = 0
         self.acceleration_x = 0.5
         self.friction = 0.1
         self.gravity = 0.5
         self.jump_strength = -12
         self.max_velocity_x = 8
         self.max_velocity_y = 15
+
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Put the player at (x, y) with a fresh game state, keeping the loaded sprite"""
+        self.x = x
+        self.y = y
+        self.previous_x = x  # Position before the last move (for swept collision)
+        self.previous_y = y
+
+        self.velocity_x = 0
+        self.velocity_y = 0
         self.on_ground = False  # Will be properly set in the first move() call
 
         # Game statistics
@@ -38,10 +48,36 @@ class Player:
         self.facing_right = True
         self.is_jumping = False
 
-    def move(self, platforms):
-        """Handle player movement and physics"""
+    def move(self, platforms, keys=None, steps=1, min_velocity_x=None):
+        """Handle player movement and physics
+
+        keys maps pygame.K_LEFT / pygame.K_RIGHT to their pressed state; when it
+        is None the live keyboard state is used. steps > 1 advances several
+        frames at once (see move_swept). min_velocity_x is GameWindow's scroll
+        push, a floor on velocity_x applied at the start of every frame: a
+        number, or one per frame (None for no floor) when it changes within
+        the step.
+        """
         # Get keyboard input
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
+
+        # Start of this move, used for swept collision tests against obstacles and coins
+        self.previous_x = self.x
+        self.previous_y = self.y
+
+        if min_velocity_x is None or isinstance(min_velocity_x, (int, float)):
+            floors = [min_velocity_x] * steps
+        else:
+            floors = list(min_velocity_x)
+
+        if steps > 1:
+            self.move_swept(platforms, keys, steps, floors)
+            return
+
+        # Scroll push
+        if floors[0] is not None:
+            self.velocity_x = max(self.velocity_x, floors[0])
 
         # Horizontal movement - increase acceleration for more responsive controls
         if keys[pygame.K_LEFT]:
@@ -93,6 +129,71 @@ class Player:
                 self.y = platform.y - self.height
                 break
 
+    def move_swept(self, platforms, keys, steps, floors):
+        """Advance several frames at once, with the same result as that many move() calls
+
+        Horizontal motion doesn't depend on the vertical state, so the whole
+        x path is integrated first and its span picks out the few platforms
+        the step can touch. Gravity, landing and walking off a platform's
+        edge are then resolved frame by frame against only those platforms,
+        so a coarse step can't skip a thin platform or keep the player
+        grounded past an edge. floors holds each frame's scroll push (see move()).
+        """
+        left = keys[pygame.K_LEFT]
+        right = keys[pygame.K_RIGHT]
+        if left:
+            self.facing_right = False
+        if right:
+            self.facing_right = True
+
+        # Same per-frame horizontal kinematics as move()
+        path = []
+        x = self.x
+        velocity_x = self.velocity_x
+        for floor in floors:
+            if floor is not None:
+                velocity_x = max(velocity_x, floor)
+            if left:
+                velocity_x -= self.acceleration_x * 1.2
+            if right:
+                velocity_x += self.acceleration_x * 1.2
+            if not (left or right) and abs(velocity_x) > 0:
+                friction_force = min(abs(velocity_x), self.friction)
+                if velocity_x > 0:
+                    velocity_x -= friction_force
+                else:
+                    velocity_x += friction_force
+            velocity_x = max(-self.max_velocity_x, min(velocity_x, self.max_velocity_x))
+            x += velocity_x
+            path.append(x)
+        self.velocity_x = velocity_x
+
+        # Only platforms within the step's x span can be stood or landed on (same x test as move())
+        left_edge = min(self.x, min(path))
+        right_edge = max(self.x, max(path)) + self.width
+        nearby = [platform for platform in platforms
+                  if platform.x <= right_edge and platform.x + platform.width >= left_edge]
+
+        # Same per-frame vertical rules and platform order as move()
+        for x in path:
+            self.velocity_y = max(-self.max_velocity_y, min(self.velocity_y, self.max_velocity_y))
+            if not self.on_ground:
+                self.velocity_y += self.gravity
+            self.x = x
+            self.y += self.velocity_y
+            self.on_ground = False
+            self.is_jumping = self.velocity_y < 0
+            for platform in nearby:
+                if self.check_standing_on_platform(platform) or self.check_platform_collision(platform):
+                    self.land_on(platform)
+                    break
+
+    def land_on(self, platform):
+        """Place the player on top of a platform"""
+        self.on_ground = True
+        self.velocity_y = 0
+        self.y = platform.y - self.height
+
     def check_standing_on_platform(self, platform):
         """Check if player is standing directly on a platform without falling"""
         # Check if player is within platform x bounds
@@ -139,18 +240,26 @@ class Player:
         """Return pygame Rect for collision detection"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
 
-    def draw(self, screen, camera_offset_x):
-        """Draw the player on screen with camera offset"""
+    def draw(self, screen, camera_offset_x, scale=1):
+        """Draw the player on screen with camera offset (scale < 1 for a low-resolution target)"""
         # Apply camera offset for scrolling
-        draw_x = self.x - camera_offset_x
+        draw_x = (self.x - camera_offset_x) * scale
+        draw_y = self.y * scale
+        width = self.width * scale
+        height = self.height * scale
 
         # Only draw if player is on screen
-        if -self.width <= draw_x <= screen.get_width():
+        if -width <= draw_x <= screen.get_width():
             # Draw player using sprite or rectangle
             if self.use_sprite:
+                # The sprite is rescaled once per target resolution
+                sprite = self.scaled_sprites.get(scale)
+                if sprite is None:
+                    sprite = self.scaled_sprites[scale] = pygame.transform.scale(
+                        self.sprite, (max(1, round(width)), max(1, round(height))))
                 # Flip sprite based on direction
-                sprite = pygame.transform.flip(self.sprite, not self.facing_right, False)
-                screen.blit(sprite, (draw_x, self.y))
+                sprite = pygame.transform.flip(sprite, not self.facing_right, False)
+                screen.blit(sprite, (draw_x, draw_y))
             else:
                 # Draw with different colors based on state
                 color = self.color
@@ -159,20 +268,20 @@ class Player:
                 elif not self.on_ground:
                     color = (50, 50, 200)  # Darker blue when falling
 
-                pygame.draw.rect(screen, color, (draw_x, self.y, self.width, self.height))
+                pygame.draw.rect(screen, color, (draw_x, draw_y, width, height))
 
                 # Draw eyes to show direction
-                eye_size = 5
-                eye_y = self.y + 10
+                eye_size = max(1, round(5 * scale))
+                eye_y = draw_y + 10 * scale
 
                 if self.facing_right:
                     # Right-facing eyes
-                    eye1_x = draw_x + self.width - 10
-                    eye2_x = draw_x + self.width - 20
+                    eye1_x = draw_x + width - 10 * scale
+                    eye2_x = draw_x + width - 20 * scale
                 else:
                     # Left-facing eyes
-                    eye1_x = draw_x + 5
-                    eye2_x = draw_x + 15
+                    eye1_x = draw_x + 5 * scale
+                    eye2_x = draw_x + 15 * scale
 
                 pygame.draw.circle(screen, (255, 255, 255), (eye1_x, eye_y), eye_size)
                 pygame.draw.circle(screen, (255, 255, 255), (eye2_x, eye_y), eye_size)
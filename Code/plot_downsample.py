@@ -0,0 +1,118 @@
+import numpy as np
+
+
+LINE_POINTS_PER_PIXEL = 2  # LTTB keeps up to this many points per horizontal pixel
+SCATTER_CELL_PIXELS = 4  # Density binning cell size, in pixels
+
+
+def axes_pixels(ax):
+    """(width, height) of an axes' plotting area in pixels, as shown on screen
+
+    A figure embedded in Tk is resized to whatever its widget gets, so its
+    configured figsize/dpi only holds until the widget is laid out: the
+    axes' share of the figure is scaled to the widget's actual size. The
+    figure's own extent is used before the widget is realized (1x1) and
+    for figures outside Tk.
+    """
+    get_widget = getattr(ax.figure.canvas, 'get_tk_widget', None)
+    if get_widget is not None:
+        widget = get_widget()
+        width, height = widget.winfo_width(), widget.winfo_height()
+        if width > 1 and height > 1:
+            position = ax.get_position()
+            return max(1, int(position.width * width)), max(1, int(position.height * height))
+    bbox = ax.get_window_extent()
+    return max(1, int(bbox.width)), max(1, int(bbox.height))
+
+
+def line_budget(ax):
+    """Most points a line on these axes needs to look the same as the full series"""
+    return axes_pixels(ax)[0] * LINE_POINTS_PER_PIXEL
+
+
+def scatter_grid(ax):
+    """(columns, rows) of density bins covering these axes"""
+    width, height = axes_pixels(ax)
+    return max(1, width // SCATTER_CELL_PIXELS), max(1, height // SCATTER_CELL_PIXELS)
+
+
+def lttb(x, y, threshold):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps from a line (x sorted ascending)
+
+    The first and last points are always kept; the rest is split into
+    threshold - 2 buckets and each contributes the point forming the
+    largest triangle with the previously kept point and the next bucket's
+    average, which keeps peaks and troughs that plain striding drops.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    edges = np.linspace(1, count - 1, threshold - 1).astype(int)
+    kept = np.empty(threshold, dtype=int)
+    kept[0] = 0
+    kept[-1] = count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Average of the next bucket (just the last point for the final bucket)
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else count
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+        # Twice the triangle areas; the constant factor doesn't change the argmax
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous]) -
+                       (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(areas.argmax())
+        kept[bucket + 1] = previous
+    return kept
+
+
+def downsample_line(x, y, ax):
+    """(x, y) reduced with LTTB to the point budget of the axes they are drawn on"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    positions = x
+    if x.dtype == object:
+        # Lists of datetimes (rollup bucket starts)
+        positions = x.astype('datetime64[us]')
+    if positions.dtype.kind == 'M':
+        positions = positions.astype('datetime64[us]').astype(float)
+    indices = lttb(positions, y, line_budget(ax))
+    return x[indices], y[indices]
+
+
+def density_bins(x, y, columns, rows, values=None):
+    """Bin scatter points into a columns x rows grid over their range
+
+    Returns (x, y, counts, means): the mean position of the points in each
+    occupied cell, how many points fell in it, and the mean of the optional
+    per-point values (None without values). Every occupied cell is kept, so
+    outliers survive however many points there are.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    span_x = np.ptp(x) or 1.0
+    span_y = np.ptp(y) or 1.0
+    column = np.minimum(((x - x.min()) / span_x * columns).astype(int), columns - 1)
+    row = np.minimum(((y - y.min()) / span_y * rows).astype(int), rows - 1)
+    cells, inverse, counts = np.unique(column * rows + row, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+    binned_x = np.bincount(inverse, weights=x) / counts
+    binned_y = np.bincount(inverse, weights=y) / counts
+    means = None if values is None else np.bincount(inverse, weights=np.asarray(values, dtype=float)) / counts
+    return binned_x, binned_y, counts, means
+
+
+def downsample_scatter(x, y, ax, values=None):
+    """Density-binned (x, y, counts, values) when the points would crowd the axes, else None (plot them all)"""
+    columns, rows = scatter_grid(ax)
+    if len(x) <= columns * rows // 4:
+        return None
+    return density_bins(x, y, columns, rows, values)
+
+
+def marker_sizes(counts, size):
+    """Marker areas for binned points: the base size for single points, growing with the log of the count"""
+    return size * (1 + np.log10(counts))
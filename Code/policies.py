@@ -0,0 +1,90 @@
+import random
+
+
+# Action indices from game_env.ACTIONS
+NOOP, LEFT, RIGHT, JUMP, LEFT_JUMP, RIGHT_JUMP = range(6)
+
+
+class RandomPolicy:
+    """Mostly runs right, with random jumps and the occasional step back"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def __call__(self, env):
+        roll = self.rng.random()
+        if roll < 0.05:
+            return RIGHT_JUMP
+        if roll < 0.10:
+            return LEFT
+        return RIGHT
+
+
+class RunnerPolicy:
+    """Runs right and jumps at a fixed interval"""
+
+    def __init__(self, seed, interval=45):
+        self.interval = interval
+        self.frame = 0
+
+    def __call__(self, env):
+        self.frame += 1
+        return RIGHT_JUMP if self.frame % self.interval == 0 else RIGHT
+
+
+class JumperPolicy:
+    """Runs right, jumping when the running path hits something sooner than a jump arc would"""
+
+    def __init__(self, seed, horizon=40):
+        # Frames of the running path and jump arc to check for obstacles
+        self.horizon = horizon
+
+    def __call__(self, env):
+        window = env.window
+        player = window.player
+        if not player.on_ground:
+            return RIGHT
+
+        speed = max(player.velocity_x, window.scroll_speed)
+        reach = player.x + player.width + speed * self.horizon
+        obstacles = [obstacle for obstacle in window.obstacles
+                     if obstacle.x + obstacle.width > player.x and obstacle.x < reach]
+        run_hit = self.first_hit(obstacles, player, speed, 0)
+        jump_hit = self.first_hit(obstacles, player, speed, player.jump_strength)
+
+        # Ground ends before the next frame's front edge
+        feet = player.y + player.height
+        probe = player.x + player.width + speed
+        on_ground_ahead = any(platform.x <= probe <= platform.x + platform.width and abs(platform.y - feet) <= 2
+                              for platform in window.platforms)
+        if not on_ground_ahead:
+            run_hit = min(run_hit, 1)
+
+        return RIGHT_JUMP if jump_hit > run_hit else RIGHT
+
+    def first_hit(self, obstacles, player, speed, velocity_y):
+        """Frame at which a straight-line run or jump arc first overlaps an obstacle"""
+        x = player.x
+        y = player.y
+        ground_y = player.y
+        for frame in range(1, self.horizon + 1):
+            velocity_y += player.gravity
+            x += speed
+            y = min(y + velocity_y, ground_y)
+            for obstacle in obstacles:
+                if (x < obstacle.x + obstacle.width and obstacle.x < x + player.width and
+                        y < obstacle.y + obstacle.height and obstacle.y < y + player.height):
+                    return frame
+        return self.horizon + 1
+
+
+POLICIES = {
+    'random': RandomPolicy,
+    'runner': RunnerPolicy,
+    'jumper': JumperPolicy,
+}
+
+
+def make_policy(name, seed):
+    """Create a fresh scripted policy; policies draw randomness only from their seed"""
+    return POLICIES[name](seed)
@@ -0,0 +1,227 @@
+import argparse
+import json
+import math
+import os
+import sys
+
+from stats_segments import iter_session_rows
+from stats_store import SUMMARY_FILE
+
+
+SKETCHES_FILE = 'stats/sketches.json'
+RELATIVE_ACCURACY = 0.01
+PERCENTILES = (50, 90, 99)
+
+# Sketch name -> summary column
+SKETCH_METRICS = {
+    'completion_time': 'completion_time',
+    'score': 'score',
+    'distance': 'distance_traveled',
+}
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with a relative error bound (DDSketch).
+
+    Positive values are counted in logarithmic buckets: bucket i holds
+    values in (gamma^(i-1), gamma^i] with gamma = (1 + a) / (1 - a), and
+    reports 2 * gamma^i / (gamma + 1) for them. Any quantile returned is
+    then within a relative error a of the true value of that rank:
+    |estimate - true| <= a * true (a = 1% by default). Zeros (the game has
+    no negative stats) are counted in a separate exact bucket. Merging adds
+    bucket counts, so per-day sketches merge into exact same-accuracy
+    overall sketches.
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}  # bucket index -> count
+        self.zero_count = 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value, count=1):
+        """Count a value (count times)"""
+        value = float(value)
+        if math.isnan(value):
+            return
+        if value <= 0:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Merge another sketch with the same accuracy into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Can only merge sketches with the same relative accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q):
+        """Estimated value at quantile q in [0, 1] (None if empty)"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                # Never report outside the observed range
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def rank(self, value):
+        """Estimated rank of a value from the top (1 + the values counted in higher buckets)
+
+        Values sharing the value's bucket are within the relative accuracy
+        of it and count as ties, so the estimate never ranks below the true
+        rank and is only above it by the values within that margin.
+        """
+        value = float(value)
+        if value <= 0:
+            return self.count - self.zero_count + 1
+        index = math.ceil(math.log(value) / self.log_gamma)
+        return sum(count for bucket, count in self.buckets.items() if bucket > index) + 1
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """Dict of percentile -> estimated value"""
+        return {p: self.quantile(p / 100) for p in percentiles}
+
+    def to_dict(self):
+        """Plain-data form for JSON"""
+        return {'a': self.relative_accuracy, 'zero': self.zero_count, 'count': self.count,
+                'min': self.min, 'max': self.max, 'buckets': {str(i): c for i, c in self.buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict()"""
+        sketch = cls(data['a'])
+        sketch.zero_count = data['zero']
+        sketch.count = data['count']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        sketch.buckets = {int(i): c for i, c in data['buckets'].items()}
+        return sketch
+
+
+class SessionSketches:
+    """Quantile sketches of completion time, score and distance, overall and per day"""
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.overall = {metric: QuantileSketch(relative_accuracy) for metric in SKETCH_METRICS}
+        self.daily = {}  # 'YYYY-MM-DD' -> {metric: QuantileSketch}
+
+    @classmethod
+    def load(cls, path=SKETCHES_FILE):
+        """Load the sketches sidecar (empty sketches if it doesn't exist yet)"""
+        sketches = cls()
+        if os.path.exists(path):
+            with open(path) as file:
+                data = json.load(file)
+            sketches.relative_accuracy = data['relative_accuracy']
+            sketches.overall = {metric: QuantileSketch.from_dict(sketch)
+                                for metric, sketch in data['overall'].items()}
+            sketches.daily = {day: {metric: QuantileSketch.from_dict(sketch) for metric, sketch in metrics.items()}
+                              for day, metrics in data['daily'].items()}
+        return sketches
+
+    def save(self, path=SKETCHES_FILE):
+        """Write the sidecar atomically"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        data = {
+            'relative_accuracy': self.relative_accuracy,
+            'overall': {metric: sketch.to_dict() for metric, sketch in self.overall.items()},
+            'daily': {day: {metric: sketch.to_dict() for metric, sketch in metrics.items()}
+                      for day, metrics in self.daily.items()},
+        }
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(data, file)
+        os.replace(temp_path, path)
+
+    def add(self, row):
+        """Add a session's summary row (a dict keyed by SUMMARY_COLUMNS)"""
+        day = str(row['timestamp'])[:10]
+        daily = self.daily.get(day)
+        if daily is None:
+            daily = self.daily[day] = {metric: QuantileSketch(self.relative_accuracy) for metric in SKETCH_METRICS}
+        for metric, column in SKETCH_METRICS.items():
+            value = row[column]
+            if value == '' or value is None:
+                continue
+            self.overall[metric].add(value)
+            daily[metric].add(value)
+
+    def merge(self, other):
+        """Merge another set of sketches (e.g. from another machine) into this one"""
+        for metric, sketch in other.overall.items():
+            self.overall[metric].merge(sketch)
+        for day, metrics in other.daily.items():
+            daily = self.daily.setdefault(day, {metric: QuantileSketch(self.relative_accuracy)
+                                                for metric in SKETCH_METRICS})
+            for metric, sketch in metrics.items():
+                daily[metric].merge(sketch)
+
+    def percentiles(self, metric, day=None, percentiles=PERCENTILES):
+        """Percentiles of a metric overall, or for one day ('YYYY-MM-DD')"""
+        sketches = self.overall if day is None else self.daily.get(day)
+        if sketches is None:
+            return {p: None for p in percentiles}
+        return sketches[metric].percentiles(percentiles)
+
+    @classmethod
+    def rebuild(cls, stats_file):
+        """Build sketches from an existing summary file and its closed segments (one pass)"""
+        sketches = cls()
+        for row in iter_session_rows(stats_file):
+            sketches.add(row)
+        return sketches
+
+
+def format_percentiles(values):
+    """'p50 1.0  p90 2.0  p99 3.0' with '-' for missing values"""
+    return "  ".join(f"p{p} {'-' if value is None else f'{value:.1f}'}" for p, value in values.items())
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Show CoinDash percentiles from the quantile sketches")
+    parser.add_argument('--day', action='append', help="also show this day (YYYY-MM-DD); repeatable")
+    parser.add_argument('--daily', action='store_true', help="show every day")
+    parser.add_argument('--rebuild', action='store_true', help=f"rebuild the sketches from {SUMMARY_FILE}")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        sketches = SessionSketches.rebuild(SUMMARY_FILE)
+        sketches.save()
+    else:
+        sketches = SessionSketches.load()
+
+    print(f"Percentiles (within {sketches.relative_accuracy:.0%} relative error), "
+          f"{sketches.overall['score'].count} sessions")
+    days = sorted(sketches.daily) if args.daily else (args.day or [])
+    for label, day in [('all', None)] + [(day, day) for day in days]:
+        print(f"[{label}]")
+        for metric in SKETCH_METRICS:
+            print(f"  {metric:>15}: {format_percentiles(sketches.percentiles(metric, day))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+
+class JumpEnvelope:
+    """Precomputed jump and walk-off arcs for one player physics configuration.
+
+    For every integer vertical offset between the takeoff surface and a target
+    platform top (positive = target is lower), the tables hold the first and
+    last frame on which Player.move would land on the target, following the
+    same rules as check_standing_on_platform (feet within 2 px) and
+    check_platform_collision (feet cross the top while falling). A segment is
+    then checked with a few array lookups and some interval arithmetic.
+    """
+
+    STANDING_MARGIN = 2
+
+    def __init__(self, jump_strength=-12, gravity=0.5, max_velocity_x=8, max_velocity_y=15,
+                 acceleration_x=0.5, player_width=30, max_offset=600, max_frames=240):
+        self.jump_strength = jump_strength
+        self.gravity = gravity
+        self.max_velocity_x = max_velocity_x
+        self.max_velocity_y = max_velocity_y
+        self.acceleration_x = acceleration_x
+        self.player_width = player_width
+        self.max_offset = max_offset
+
+        # Arcs: jump from standing, and walking off an edge
+        self.jump_first, self.jump_last = self.build_table(jump_strength, True, max_frames)
+        self.drop_first, self.drop_last = self.build_table(0, False, max_frames)
+
+    @classmethod
+    def for_player(cls, player):
+        """Build the envelope for a Player's physics constants"""
+        return cls(player.jump_strength, player.gravity, player.max_velocity_x, player.max_velocity_y,
+                   player.acceleration_x, player.width)
+
+    def build_table(self, velocity_y, on_ground, max_frames):
+        """Landing frame window for each integer offset in [-max_offset, max_offset]"""
+        ys = []
+        velocities = []
+        y = 0.0
+        for _ in range(max_frames):
+            # Same order as Player.move: clamp, gravity when airborne, integrate
+            velocity_y = max(-self.max_velocity_y, min(velocity_y, self.max_velocity_y))
+            if not on_ground:
+                velocity_y += self.gravity
+            on_ground = False
+            y += velocity_y
+            ys.append(y)
+            velocities.append(velocity_y)
+
+        ys = np.array(ys)[:, None]
+        velocities = np.array(velocities)[:, None]
+        offsets = np.arange(-self.max_offset, self.max_offset + 1, dtype=np.float64)[None, :]
+
+        standing = np.abs(ys - offsets) <= self.STANDING_MARGIN
+        landing = (velocities >= 0) & (ys >= offsets) & (ys - velocities < offsets)
+        lands = standing | landing
+
+        frames = np.arange(1, max_frames + 1)[:, None]
+        reachable = lands.any(axis=0)
+        first = np.where(reachable, np.where(lands, frames, max_frames + 1).min(axis=0), 0)
+        last = np.where(reachable, np.where(lands, frames, 0).max(axis=0), 0)
+        return first.astype(np.int32), last.astype(np.int32)
+
+    def speed_range(self, scroll_speed):
+        """Horizontal speed range while airborne given the scroll push"""
+        slowest = max(0.0, scroll_speed - self.acceleration_x * 1.2)
+        return slowest, float(self.max_velocity_x)
+
+    def is_reachable(self, from_x, from_y, from_width, to_x, to_y, to_width, scroll_speed):
+        """Whether a platform can be landed on from another one (O(1) table lookup)"""
+        offset = int(round(to_y - from_y)) + self.max_offset
+        if not 0 <= offset < len(self.jump_first):
+            return False
+
+        slowest, fastest = self.speed_range(scroll_speed)
+        # Horizontal offsets between any standing position and any landing position
+        near = to_x - self.player_width - (from_x + from_width)
+        far = to_x + to_width - (from_x - self.player_width)
+
+        first = self.jump_first[offset]
+        if first and first * slowest <= far and self.jump_last[offset] * fastest >= near:
+            return True
+
+        # Walking off the edge starts from the right edge of the takeoff platform
+        first = self.drop_first[offset]
+        return bool(first and first * slowest <= to_x + to_width - (from_x + from_width)
+                    and self.drop_last[offset] * fastest >= near)
+
+    def max_gap(self, dy, scroll_speed):
+        """Largest edge-to-edge gap that can be jumped for a vertical offset (0 if too high)"""
+        offset = int(round(dy)) + self.max_offset
+        if not 0 <= offset < len(self.jump_first) or not self.jump_first[offset]:
+            return 0
+        return self.jump_last[offset] * self.max_velocity_x + self.player_width
+
+    def max_rise(self):
+        """Highest platform (in pixels above the takeoff surface) a jump can land on"""
+        reachable = np.nonzero(self.jump_first)[0]
+        return self.max_offset - reachable.min()
+
+    def audit(self, gaps, dys, from_widths, to_widths, scroll_speeds):
+        """Vectorized reachability of many segments given as edge-to-edge gaps and offsets"""
+        gaps = np.asarray(gaps, dtype=np.float64)
+        offsets = np.rint(np.asarray(dys)).astype(np.int64) + self.max_offset
+        in_table = (offsets >= 0) & (offsets < len(self.jump_first))
+        offsets = np.clip(offsets, 0, len(self.jump_first) - 1)
+
+        slowest = np.maximum(0.0, np.asarray(scroll_speeds, dtype=np.float64) - self.acceleration_x * 1.2)
+        fastest = self.max_velocity_x
+        near = gaps - self.player_width
+        far = gaps + np.asarray(to_widths) + np.asarray(from_widths) + self.player_width
+
+        first = self.jump_first[offsets]
+        jump_ok = (first > 0) & (first * slowest <= far) & (self.jump_last[offsets] * fastest >= near)
+
+        first = self.drop_first[offsets]
+        drop_ok = ((first > 0) & (first * slowest <= gaps + np.asarray(to_widths)) &
+                   (self.drop_last[offsets] * fastest >= near))
+        return in_table & (jump_ok | drop_ok)
+
+
+def sample_segments(count, seed, gap_min=80, gap_max=200, scroll_min=3, scroll_max=7):
+    """Draw main-platform segments from the generate_new_elements distribution with NumPy"""
+    rng = np.random.default_rng(seed)
+    gaps = rng.integers(gap_min, gap_max + 1, count)
+    widths = rng.integers(100, 301, count + 1)
+
+    # Height follows the previous platform by +-30 and is clamped to 300..500
+    heights = [480.0]
+    for step in rng.integers(-30, 31, count).tolist():
+        heights.append(min(500, max(300, heights[-1] + step)))
+
+    scroll = rng.uniform(scroll_min, scroll_max, count)
+    return gaps, np.diff(heights), widths[:-1], widths[1:], scroll
+
+
+def audit_generated(seed, segments):
+    """Run the real generator for a seed and count unreachable main-platform segments"""
+    from game_window import GameWindow
+
+    window = GameWindow(headless=True, seed=seed)
+    window.rng.seed(seed)
+    window.reset_game()
+    # Validation is what we're auditing, so don't let the generator repair segments
+    window.repair_unreachable = False
+    while window.checked_segments < segments:
+        window.camera_offset_x += window.SCREEN_WIDTH
+        window.generate_new_elements()
+    return window.checked_segments, window.unreachable_segments
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Audit reachability of generated CoinDash platforms")
+    parser.add_argument('--segments', type=int, default=1000000, help="number of segments to audit")
+    parser.add_argument('--seed', type=int, default=0, help="RNG seed")
+    parser.add_argument('--generator', action='store_true',
+                        help="audit segments from the real level generator instead of the sampled distribution")
+    args = parser.parse_args(argv)
+
+    envelope = JumpEnvelope()
+    print(f"Jump envelope: max rise {envelope.max_rise()} px, "
+          f"max same-height gap {envelope.max_gap(0, 3):.0f} px")
+
+    start = time.perf_counter()
+    if args.generator:
+        checked, unreachable = audit_generated(args.seed, args.segments)
+    else:
+        segments = sample_segments(args.segments, args.seed)
+        checked = len(segments[0])
+        unreachable = int((~envelope.audit(*segments)).sum())
+    elapsed = time.perf_counter() - start
+
+    print(f"Audited {checked:,} segments in {elapsed:.2f}s ({checked / elapsed:,.0f}/s): "
+          f"{unreachable:,} unreachable")
+    return 1 if unreachable else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
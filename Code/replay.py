@@ -0,0 +1,250 @@
+import argparse
+import bisect
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+import pygame
+
+from world_snapshot import WorldSnapshot
+
+
+REPLAY_DIR = 'replays'
+REPLAY_MAGIC = b'CDRP'
+REPLAY_VERSION = 2  # 2: keyframes store the level generator's state instead of re-seeding it
+KEYFRAME_INTERVAL = 1200  # Frames between keyframes (20 seconds at 60 FPS)
+
+# Per-frame input bits
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+INPUT_PAUSE = 8
+INPUT_QUIT = 16
+INPUT_RAMP = 32  # Scroll speed step fired; live games time it from the wall clock, so it is recorded
+
+# magic, version, seed, fps, frames, keyframe interval, keyframe count
+HEADER = struct.Struct('<4sBQHIII')
+# frame, byte offset, byte length of one keyframe
+INDEX_ENTRY = struct.Struct('<III')
+
+
+def encode_inputs(inputs):
+    """Delta-encode per-frame input bits as (bits, run length) pairs and compress them"""
+    encoded = bytearray()
+    i = 0
+    count = len(inputs)
+    while i < count:
+        bits = inputs[i]
+        run = 1
+        while i + run < count and inputs[i + run] == bits:
+            run += 1
+        i += run
+        encoded.append(bits)
+        # Run length as a little-endian base-128 varint
+        while run >= 0x80:
+            encoded.append((run & 0x7F) | 0x80)
+            run >>= 7
+        encoded.append(run)
+    return zlib.compress(bytes(encoded), 9)
+
+
+def decode_inputs(data):
+    """Inverse of encode_inputs: one byte of input bits per frame"""
+    encoded = zlib.decompress(data)
+    inputs = bytearray()
+    i = 0
+    while i < len(encoded):
+        bits = encoded[i]
+        run = 0
+        shift = 0
+        while True:
+            i += 1
+            byte = encoded[i]
+            run |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        i += 1
+        inputs.extend(bytes([bits]) * run)
+    return inputs
+
+
+def apply_inputs(window, bits):
+    """Feed one frame of recorded input into a headless GameWindow, as handle_events() would"""
+    # Jump is only recorded when handle_events() actually called player.jump()
+    if bits & INPUT_JUMP:
+        window.player.jump()
+    if bits & INPUT_PAUSE:
+        window.paused = not window.paused
+    window.held_keys[pygame.K_LEFT] = bool(bits & INPUT_LEFT)
+    window.held_keys[pygame.K_RIGHT] = bool(bits & INPUT_RIGHT)
+    window.replay_ramp = bool(bits & INPUT_RAMP)
+
+
+class ReplayRecorder:
+    """Records one session: seed, per-frame input bits and periodic keyframes"""
+
+    def __init__(self, seed, fps=60, keyframe_interval=KEYFRAME_INTERVAL):
+        self.seed = seed
+        self.fps = fps
+        self.keyframe_interval = keyframe_interval
+        self.inputs = bytearray()
+        self.keyframes = []  # (frame, WorldSnapshot) pairs, serialized on save
+
+    def end_frame(self, window, bits):
+        """Record the input of a finished frame, adding a keyframe on interval boundaries"""
+        self.inputs.append(bits)
+        frame = len(self.inputs)
+        if frame % self.keyframe_interval == 0:
+            # Snapshots share level geometry, so capturing one per interval is cheap. The level
+            # generator's state is captured, not re-seeded, so recording doesn't change the course
+            self.keyframes.append((frame, window.snapshot()))
+
+    def mark_quit(self):
+        """Flag the last recorded frame as the one the player quit on"""
+        if self.inputs:
+            self.inputs[-1] |= INPUT_QUIT
+
+    def to_bytes(self):
+        """Serialize the replay: header, keyframe seek index, input stream, keyframes"""
+        inputs = encode_inputs(self.inputs)
+        blobs = []
+        for _, snapshot in self.keyframes:
+            blobs.append(zlib.compress(json.dumps(snapshot.to_dict(), separators=(',', ':')).encode(), 9))
+
+        header = HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.fps, len(self.inputs),
+                             self.keyframe_interval, len(blobs))
+        offset = len(header) + INDEX_ENTRY.size * len(blobs) + 4 + len(inputs)
+        index = bytearray()
+        for (frame, _), blob in zip(self.keyframes, blobs):
+            index += INDEX_ENTRY.pack(frame, offset, len(blob))
+            offset += len(blob)
+        return header + bytes(index) + struct.pack('<I', len(inputs)) + inputs + b''.join(blobs)
+
+    def save(self, path):
+        """Write the replay file, creating its directory if needed"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+        return path
+
+
+class ReplayPlayer:
+    """Plays a replay back through a headless GameWindow, with keyframe seeking"""
+
+    def __init__(self, data):
+        if isinstance(data, str):
+            with open(data, 'rb') as file:
+                data = file.read()
+        self.data = data
+
+        magic, version, self.seed, self.fps, self.frames, self.keyframe_interval, count = \
+            HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("Not a CoinDash replay (or unsupported version)")
+
+        offset = HEADER.size
+        self.index = [INDEX_ENTRY.unpack_from(data, offset + i * INDEX_ENTRY.size) for i in range(count)]
+        self.keyframe_frames = [frame for frame, _, _ in self.index]
+        offset += INDEX_ENTRY.size * count
+        (length,) = struct.unpack_from('<I', data, offset)
+        self.inputs = decode_inputs(data[offset + 4:offset + 4 + length])
+
+        # Imported here: game_window records replays with this module
+        from game_window import GameWindow
+        self.window = GameWindow(headless=True, seed=self.seed, density=1)
+        self.frame = 0
+        self.restart()
+
+    def restart(self):
+        """Go back to frame 0 by regenerating the course from the seed"""
+        window = self.window
+        window.held_keys[pygame.K_LEFT] = False
+        window.held_keys[pygame.K_RIGHT] = False
+        window.reset_game(self.seed)
+        window.paused = False
+        self.frame = 0
+
+    def load_keyframe(self, position):
+        """Restore the keyframe at a position in the seek index"""
+        frame, offset, length = self.index[position]
+        data = json.loads(zlib.decompress(self.data[offset:offset + length]))
+        # Restores the level generator's state too, so the course continues as it was recorded
+        WorldSnapshot.from_dict(data).restore(self.window)
+        self.frame = frame
+
+    def step(self):
+        """Play one recorded frame; returns False at the end of the replay"""
+        if self.frame >= self.frames:
+            return False
+        window = self.window
+        apply_inputs(window, self.inputs[self.frame])
+        window.update()
+        self.frame += 1
+        return True
+
+    def advance(self, count):
+        """Fast-forward up to count frames"""
+        for _ in range(count):
+            if not self.step():
+                break
+
+    def seek(self, frame):
+        """Jump to a frame through the nearest keyframe at or before it"""
+        frame = max(0, min(frame, self.frames))
+        position = bisect.bisect_right(self.keyframe_frames, frame) - 1
+        start = self.keyframe_frames[position] if position >= 0 else 0
+        # Keep playing forward when that's no further than the keyframe
+        if not start <= self.frame <= frame:
+            if position >= 0:
+                self.load_keyframe(position)
+            else:
+                self.restart()
+        self.advance(frame - self.frame)
+
+    def seek_time(self, seconds):
+        """Jump to a time (in seconds of recorded frames)"""
+        self.seek(int(round(seconds * self.fps)))
+
+    def play(self):
+        """Fast-forward to the end of the replay"""
+        self.advance(self.frames - self.frame)
+
+
+def replay_path(session_id):
+    """Replay file for a session"""
+    return os.path.join(REPLAY_DIR, f"{session_id}.cdr")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Play a CoinDash replay headlessly")
+    parser.add_argument('path', help="replay file")
+    parser.add_argument('--seek', type=float, default=None, help="seek to this time (seconds) instead of the end")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    player = ReplayPlayer(args.path)
+    print(f"{args.path}: seed {player.seed}, {player.frames} frames ({player.frames / player.fps:.1f}s), "
+          f"{len(player.index)} keyframes, {len(player.data):,} bytes")
+
+    start = time.perf_counter()
+    if args.seek is None:
+        player.play()
+    else:
+        player.seek_time(args.seek)
+    elapsed = time.perf_counter() - start
+
+    window = player.window
+    manager = window.game_manager
+    print(f"At frame {player.frame} after {elapsed * 1000:.1f}ms: score {manager.score}, "
+          f"distance {window.distance_in_meters}m, coins {window.player.coins_collected}, "
+          f"game over {manager.game_over}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+from stats_segments import iter_session_rows
+from stats_store import SUMMARY_FILE, TIMESTAMP_FORMAT
+
+
+ROLLUPS_FILE = 'stats/rollups.json'
+GRANULARITIES = ('hourly', 'daily', 'weekly')
+
+# Rollup name -> summary column
+ROLLUP_METRICS = {
+    'distance': 'distance_traveled',
+    'coins': 'coins_collected',
+    'jumps': 'jump_count',
+    'score': 'score',
+}
+# Layout of one bucket: [sessions, sum of each metric..., max of each metric...]
+SUM_OFFSET = 1
+MAX_OFFSET = 1 + len(ROLLUP_METRICS)
+BUCKET_KEY_FORMAT = '%Y-%m-%d %H:00'
+
+
+def bucket_start(timestamp, granularity):
+    """Start of the hour, day or (Monday-based) week a datetime falls in"""
+    start = timestamp.replace(minute=0, second=0, microsecond=0)
+    if granularity == 'hourly':
+        return start
+    start = start.replace(hour=0)
+    if granularity == 'weekly':
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def parse_timestamp(value):
+    """datetime from a summary row's timestamp (string or datetime)"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+    except ValueError:
+        return datetime.fromisoformat(value)
+
+
+class Rollups:
+    """Hourly, daily and weekly session counts, sums and maxima, kept in a small sidecar file.
+
+    Each granularity maps a bucket start ('YYYY-MM-DD HH:00') to a flat
+    list [sessions, sums..., maxima...] in ROLLUP_METRICS order, so adding
+    a session touches exactly one bucket per granularity and trend charts
+    never have to read the per-session history.
+    """
+
+    def __init__(self):
+        self.buckets = {granularity: {} for granularity in GRANULARITIES}
+
+    @classmethod
+    def load(cls, path=ROLLUPS_FILE):
+        """Load the rollups sidecar (empty rollups if it doesn't exist yet)"""
+        rollups = cls()
+        if os.path.exists(path):
+            with open(path) as file:
+                data = json.load(file)
+            for granularity in GRANULARITIES:
+                rollups.buckets[granularity] = data.get(granularity, {})
+        return rollups
+
+    def save(self, path=ROLLUPS_FILE):
+        """Write the sidecar atomically"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(self.buckets, file, separators=(',', ':'))
+        os.replace(temp_path, path)
+
+    def add(self, row):
+        """Add a session's summary row (a dict keyed by SUMMARY_COLUMNS)"""
+        timestamp = parse_timestamp(row['timestamp'])
+        values = [float(row[column] or 0) for column in ROLLUP_METRICS.values()]
+        for granularity in GRANULARITIES:
+            key = bucket_start(timestamp, granularity).strftime(BUCKET_KEY_FORMAT)
+            bucket = self.buckets[granularity].get(key)
+            if bucket is None:
+                self.buckets[granularity][key] = [1] + values + values
+                continue
+            bucket[0] += 1
+            for i, value in enumerate(values):
+                bucket[SUM_OFFSET + i] += value
+                bucket[MAX_OFFSET + i] = max(bucket[MAX_OFFSET + i], value)
+
+    def latest(self):
+        """Start of the most recent hourly bucket, or None if there are no sessions"""
+        hourly = self.buckets['hourly']
+        return datetime.fromisoformat(max(hourly)) if hourly else None
+
+    def series(self, granularity, metric, stat='mean', start=None, end=None):
+        """(bucket starts, values) of one metric, oldest first, for buckets in [start, end)
+
+        stat is 'sum', 'max', 'mean' (sum / sessions) or 'sessions' (the
+        metric is then ignored). Buckets without sessions are left out.
+        """
+        index = list(ROLLUP_METRICS).index(metric)
+        low = start.strftime(BUCKET_KEY_FORMAT) if start else ''
+        high = end.strftime(BUCKET_KEY_FORMAT) if end else '~'
+        times = []
+        values = []
+        # Keys sort chronologically, so range filtering is a string comparison
+        for key in sorted(self.buckets[granularity]):
+            if not low <= key < high:
+                continue
+            bucket = self.buckets[granularity][key]
+            if stat == 'sessions':
+                value = bucket[0]
+            elif stat == 'sum':
+                value = bucket[SUM_OFFSET + index]
+            elif stat == 'max':
+                value = bucket[MAX_OFFSET + index]
+            else:
+                value = bucket[SUM_OFFSET + index] / bucket[0]
+            times.append(datetime.fromisoformat(key))
+            values.append(value)
+        return times, values
+
+    @classmethod
+    def rebuild(cls, stats_file):
+        """Build rollups from an existing summary file and its closed segments (one pass)"""
+        rollups = cls()
+        for row in iter_session_rows(stats_file):
+            rollups.add(row)
+        return rollups
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Show or rebuild the CoinDash time-bucketed rollups")
+    parser.add_argument('--granularity', choices=GRANULARITIES, default='daily', help="bucket size")
+    parser.add_argument('--metric', choices=list(ROLLUP_METRICS), default='distance', help="metric to show")
+    parser.add_argument('--days', type=float, default=None, help="only the last N days (up to the latest session)")
+    parser.add_argument('--rebuild', action='store_true', help=f"rebuild the sidecar from {SUMMARY_FILE}")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        rollups = Rollups.rebuild(SUMMARY_FILE)
+        rollups.save()
+        print(f"Rebuilt {ROLLUPS_FILE}: " + ", ".join(f"{len(rollups.buckets[granularity])} {granularity}"
+                                                     for granularity in GRANULARITIES) + " buckets")
+    else:
+        rollups = Rollups.load()
+
+    latest = rollups.latest()
+    start = latest - timedelta(days=args.days) if latest and args.days else None
+    times, sessions = rollups.series(args.granularity, args.metric, 'sessions', start)
+    _, means = rollups.series(args.granularity, args.metric, 'mean', start)
+    _, maxima = rollups.series(args.granularity, args.metric, 'max', start)
+    for time, count, mean, maximum in zip(times, sessions, means, maxima):
+        print(f"{time:%Y-%m-%d %H:%M}  {count:>6} sessions  mean {mean:>10.1f}  max {maximum:>10g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
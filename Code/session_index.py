@@ -0,0 +1,214 @@
+import argparse
+import csv
+import io
+import os
+import sys
+
+from stats_segments import sample_segment_paths
+from stats_store import SUMMARY_FILE, SAMPLES_FILE, SAMPLE_COLUMNS, header_lines, read_columns
+
+
+INDEX_SUFFIX = '.idx'
+TAIL_BYTES = 4096  # Read from the end of an index to find its last line
+
+
+def index_path(samples_file):
+    """Sidecar index file of a samples file (stats/samples.csv -> stats/samples.idx)"""
+    return os.path.splitext(samples_file)[0] + INDEX_SUFFIX
+
+
+class SessionIndex:
+    """Maps session ids to the byte ranges of their rows in a samples file and its closed segments.
+
+    Each file's sidecar is append-only text, one "session_id,offset,length"
+    line per contiguous run of a session's rows, so recording an append
+    costs one small write. The end of the active file's last indexed range
+    is the watermark: rows appended by something that didn't update the
+    index (or a missing index) are picked up by scanning only the bytes
+    after it. Closed sample segments (see stats_segments.close_samples) are
+    listed in the summary file's segment manifest and never change.
+    """
+
+    def __init__(self, samples_file=SAMPLES_FILE, summary_file=None):
+        self.samples_file = samples_file
+        self.summary_file = summary_file  # Its manifest lists the closed sample segments (None: no segments)
+        self.path = index_path(samples_file)
+        self.ranges = {}  # session_id -> [(file, offset, length), ...]
+        self.watermark = 0  # Bytes of the active samples file covered by the index
+        self.segments = set()  # Closed sample segments already indexed
+
+    @classmethod
+    def load(cls, samples_file=SAMPLES_FILE, summary_file=SUMMARY_FILE):
+        """Load the index of a samples file and of the sample segments closed with summary_file
+
+        Rows of the active file that its index doesn't cover yet are indexed.
+        summary_file is None for a samples file without segments.
+        """
+        index = cls(samples_file, summary_file)
+        index.read_segments()
+        index.read_sidecar(samples_file)
+        index.catch_up()
+        return index
+
+    def read_segments(self):
+        """Add the ranges of sample segments closed since the last call; returns whether there were any"""
+        if self.summary_file is None:
+            return False
+        new = [path for path in sample_segment_paths(self.summary_file) if path not in self.segments]
+        for path in new:
+            self.read_sidecar(path)
+            self.segments.add(path)
+        return bool(new)
+
+    def read_sidecar(self, samples_file):
+        """Add the ranges in the sidecar of the active file or a closed segment"""
+        path = index_path(samples_file)
+        if samples_file != self.samples_file and not os.path.exists(path):
+            # A segment closed without its index (interrupted): index it once
+            SessionIndex(samples_file).catch_up()
+        if os.path.exists(path):
+            with open(path) as file:
+                for line in file:
+                    session_id, offset, length = line.rsplit(',', 2)
+                    self.add_range(session_id, int(offset), int(length), samples_file)
+
+    @classmethod
+    def for_append(cls, samples_file=SAMPLES_FILE):
+        """An index that only knows its watermark, for appending rows without parsing the whole sidecar
+
+        Ranges are recorded in file order, so the sidecar's last line ends at
+        the watermark and reading the file's tail is enough. Lookups need
+        load().
+        """
+        index = cls(samples_file)
+        if os.path.exists(index.path):
+            with open(index.path, 'rb') as file:
+                file.seek(0, os.SEEK_END)
+                file.seek(max(0, file.tell() - TAIL_BYTES))
+                lines = file.read().splitlines()
+            if lines:
+                _, offset, length = lines[-1].rsplit(b',', 2)
+                index.watermark = int(offset) + int(length)
+        return index
+
+    def add_range(self, session_id, offset, length, samples_file=None):
+        """Record a byte range of the active file (or of a closed segment) in memory"""
+        samples_file = samples_file or self.samples_file
+        self.ranges.setdefault(session_id, []).append((samples_file, offset, length))
+        if samples_file == self.samples_file:
+            self.watermark = max(self.watermark, offset + length)
+
+    def record(self, entries):
+        """Record (session_id, offset, length) ranges in memory and in the sidecar"""
+        with open(self.path, 'a') as file:
+            for session_id, offset, length in entries:
+                self.add_range(session_id, offset, length)
+                file.write(f"{session_id},{offset},{length}\n")
+
+    def forget_active(self):
+        """Drop the active file's ranges (keeping the closed segments') so it is indexed from the start"""
+        for session_id, ranges in list(self.ranges.items()):
+            kept = [entry for entry in ranges if entry[0] != self.samples_file]
+            if kept:
+                self.ranges[session_id] = kept
+            else:
+                del self.ranges[session_id]
+        self.watermark = 0
+        open(self.path, 'w').close()
+
+    def catch_up(self):
+        """Index rows appended after the watermark (all of them for a new index) and newly closed segments"""
+        if self.read_segments():
+            # Closing segments starts the active file afresh: its old rows are in the new segments
+            self.forget_active()
+        if not os.path.exists(self.samples_file):
+            return
+        size = os.path.getsize(self.samples_file)
+        if size < self.watermark:
+            # The samples file was replaced (e.g. re-migrated): start over
+            self.forget_active()
+        elif size == self.watermark:
+            return
+        session_column = read_columns(self.samples_file).index('session_id')
+        entries = []
+        with open(self.samples_file, 'rb') as file:
+            if self.watermark:
+                file.seek(self.watermark)
+            else:
+                for _ in range(header_lines(self.samples_file)):
+                    file.readline()
+            offset = file.tell()
+            for line in file:
+                session_id = line.split(b',', session_column + 1)[session_column].strip().decode()
+                if entries and entries[-1][0] == session_id:
+                    entries[-1][2] += len(line)
+                else:
+                    entries.append([session_id, offset, len(line)])
+                offset += len(line)
+        self.record(entries)
+
+    def append(self, rows, columns=SAMPLE_COLUMNS):
+        """Append rows (dicts) to the samples file in one write and index them"""
+        self.catch_up()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        runs = []  # [session_id, start, end] in characters of the buffer
+        for row in rows:
+            start = buffer.tell()
+            writer.writerow([row[column] for column in columns])
+            session_id = str(row['session_id'])
+            if runs and runs[-1][0] == session_id:
+                runs[-1][2] = buffer.tell()
+            else:
+                runs.append([session_id, start, buffer.tell()])
+        text = buffer.getvalue()
+
+        with open(self.samples_file, 'ab') as file:
+            offset = file.tell()
+            data = text.encode()
+            file.write(data)
+        if len(data) == len(text):
+            # ASCII rows (always, for the game's own stats): characters are bytes
+            self.record([(session_id, offset + start, end - start) for session_id, start, end in runs])
+        else:
+            self.catch_up()
+
+    def read_session(self, session_id):
+        """A session's sample rows as dicts, read by seeking straight to its byte ranges"""
+        columns = read_columns(self.samples_file)
+        rows = []
+        for samples_file, offset, length in self.ranges.get(str(session_id), []):
+            with open(samples_file, 'rb') as file:
+                file.seek(offset)
+                text = file.read(length).decode()
+            rows.extend(csv.DictReader(io.StringIO(text, newline=''), fieldnames=columns))
+        return rows
+
+
+def append_samples(rows, samples_file=SAMPLES_FILE):
+    """Append sample rows to a samples file, keeping its session index up to date (independent of its size)"""
+    SessionIndex.for_append(samples_file).append(rows)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Show a session's samples through the samples index")
+    parser.add_argument('session_id', nargs='?', help="session to show (default: list indexed sessions)")
+    parser.add_argument('--samples', default=SAMPLES_FILE, help=f"samples file (default: {SAMPLES_FILE})")
+    parser.add_argument('--summary', default=SUMMARY_FILE,
+                        help=f"summary file whose segments hold the closed samples (default: {SUMMARY_FILE})")
+    args = parser.parse_args(argv)
+
+    index = SessionIndex.load(args.samples, args.summary)
+    if args.session_id is None:
+        print(f"{len(index.ranges)} sessions indexed in {index.path}")
+        return 0
+    rows = index.read_session(args.session_id)
+    for row in rows:
+        print(", ".join(f"{column} {value}" for column, value in row.items() if column != 'session_id'))
+    print(f"{len(rows)} samples")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
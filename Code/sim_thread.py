@@ -0,0 +1,200 @@
+import copy
+import queue
+import threading
+import time
+from collections import deque
+
+
+MAX_INTERVALS = 600  # Busy intervals kept per thread for the overlap measurement (10 seconds)
+
+
+class RenderState:
+    """Everything render() needs for one frame.
+
+    Captured frozen (the default) it is safe to draw on one thread while the
+    game updates on another: the visible entities are copied into tuples,
+    the player, moving obstacles and particles are copied, and platforms are
+    shared because nothing they draw ever changes. Captured with
+    frozen=False it just points at the live game, for single-threaded
+    rendering. Visible coins are always copied out of the coin field as
+    (x, y, radius) arrays.
+    """
+
+    __slots__ = ('frame', 'camera_offset_x', 'platforms', 'coins', 'obstacles', 'particles', 'player',
+                 'distance_in_meters', 'combo_counter', 'combo_timer', 'current_delay', 'paused',
+                 'game_over', 'death_cause', 'jump_input_time')
+
+    @classmethod
+    def capture(cls, game, frozen=True):
+        """State of a GameWindow's current frame"""
+        state = cls()
+        state.frame = game.frame_count
+        state.camera_offset_x = camera = game.camera_offset_x
+        if frozen:
+            # Only what can be on screen this frame
+            left = camera - 100
+            right = camera + game.SCREEN_WIDTH + 100
+            state.platforms = tuple([platform for platform in game.platforms
+                                     if platform.x + platform.width >= left and platform.x <= right])
+            state.obstacles = tuple([copy.copy(obstacle) if getattr(obstacle, 'is_moving', False) else obstacle
+                                     for obstacle in game.obstacles if left <= obstacle.x + obstacle.width
+                                     and obstacle.x <= right])
+            state.particles = tuple([dict(particle) for particle in game.particles])
+            state.player = copy.copy(game.player)
+        else:
+            state.platforms = game.platforms
+            state.obstacles = game.obstacles
+            state.particles = game.particles
+            state.player = game.player
+        state.coins = game.coins.visible(camera - 100, camera + game.SCREEN_WIDTH + 100)
+        state.distance_in_meters = game.distance_in_meters
+        state.combo_counter = game.combo_counter
+        state.combo_timer = game.combo_timer
+        state.current_delay = game.current_delay
+        state.paused = game.paused
+        state.game_over = game.game_manager.game_over
+        state.jump_input_time = game.jump_input_time
+        state.death_cause = None
+        if state.game_over:
+            state.death_cause = next((cause for cause, count in game.game_manager.death_causes.items()
+                                      if count > 0), "unknown")
+        return state
+
+
+def overlap_seconds(intervals, other):
+    """Total time two sorted lists of (start, end) intervals run at the same time"""
+    total = 0.0
+    i = j = 0
+    while i < len(intervals) and j < len(other):
+        start = max(intervals[i][0], other[j][0])
+        end = min(intervals[i][1], other[j][1])
+        if end > start:
+            total += end - start
+        if intervals[i][1] < other[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+class SimulationThread:
+    """Runs a GameWindow's simulation on a worker thread at a fixed rate.
+
+    Each tick applies the queued input commands (see GameWindow.apply_command),
+    runs update(), records the replay frame and publishes a frozen RenderState
+    in `latest`. Publishing is a single reference assignment, so the render
+    thread always sees a complete state without locking; commands go through
+    a SimpleQueue, whose put/get only take a lock briefly.
+
+    Python code on the two threads never runs at once (the GIL), so the
+    overlap is limited to what releases it: sleeping, SDL calls such as
+    display.flip() and some pygame drawing. The render thread reports its
+    frames with record_frame() and report() measures how much overlap is
+    actually achieved.
+    """
+
+    def __init__(self, game, rate=None):
+        self.game = game
+        self.rate = rate or game.FPS
+        self.commands = queue.SimpleQueue()
+        self.latest = RenderState.capture(game)
+        self.running = False
+        self.thread = None
+        # Measurements
+        self.ticks = 0
+        self.late_ticks = 0  # Ticks that started after their scheduled time
+        self.busy = deque(maxlen=MAX_INTERVALS)  # (start, end) perf_counter() of each tick's work
+        self.render_busy = deque(maxlen=MAX_INTERVALS)  # The same for the render thread's frames
+        self.busy_seconds = 0.0  # Wall time of all ticks' work...
+        self.cpu_seconds = 0.0  # ...and the CPU time the thread actually got in them
+        self.started = None
+        self.stopped = None
+        self.render_cpu_start = None
+
+    def start(self):
+        """Start ticking (call from the render thread)"""
+        self.started = time.perf_counter()
+        self.render_cpu_start = time.thread_time()
+        self.running = True
+        self.thread = threading.Thread(target=self.run, name='simulation', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop after the current tick and wait for the thread to finish"""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+            self.stopped = time.perf_counter()
+
+    def post(self, command):
+        """Queue an input command for the next tick"""
+        self.commands.put(command)
+
+    def record_frame(self, start, end):
+        """Note a render frame's work, from perf_counter() start to end"""
+        self.render_busy.append((start, end))
+
+    def run(self):
+        """Thread body: tick at the fixed rate until stopped"""
+        period = 1 / self.rate
+        next_tick = time.perf_counter()
+        while self.running:
+            began = time.perf_counter()
+            cpu_began = time.thread_time()
+            self.tick()
+            self.cpu_seconds += time.thread_time() - cpu_began
+            ended = time.perf_counter()
+            self.busy.append((began, ended))
+            self.busy_seconds += ended - began
+
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                self.late_ticks += 1
+                if delay < -5 * period:
+                    # Far behind (e.g. the machine stalled): don't try to catch up in a burst
+                    next_tick = time.perf_counter()
+
+    def tick(self):
+        """Advance the simulation one frame and publish its state"""
+        game = self.game
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            game.apply_command(command)
+        game.update()
+        if game.recorder:
+            game.recorder.end_frame(game, game.frame_input_bits())
+        game.input_bits = 0
+        self.latest = RenderState.capture(game)
+        self.ticks += 1
+
+    def report(self):
+        """How much the two threads actually ran in parallel (call from the render thread after stop())"""
+        wall = (self.stopped or time.perf_counter()) - self.started
+        render_cpu = time.thread_time() - self.render_cpu_start
+        busy = list(self.busy)
+        recent_seconds = sum(end - start for start, end in busy)
+        return {
+            'ticks_per_second': self.ticks / wall,
+            'late_ticks': self.late_ticks,
+            # Share of the simulation's recent work that coincided with rendering a frame, by the wall clock
+            # (interleaved on the GIL or truly parallel)
+            'overlap': overlap_seconds(busy, list(self.render_busy)) / recent_seconds if recent_seconds else 0.0,
+            # Share of the ticks' wall time spent without the CPU, mostly waiting for the GIL
+            'gil_wait': max(0.0, 1 - self.cpu_seconds / self.busy_seconds) if self.busy_seconds else 0.0,
+            # Both threads' CPU time over wall time: above 1 only with real parallelism
+            'parallelism': (self.cpu_seconds + render_cpu) / wall,
+        }
+
+    def summary(self):
+        """report() as one line of text"""
+        report = self.report()
+        return (f"Simulation thread: {report['ticks_per_second']:.1f} ticks/s, {report['late_ticks']} late; "
+                f"overlap with rendering {report['overlap']:.0%}, waiting {report['gil_wait']:.0%}, "
+                f"CPU parallelism {report['parallelism']:.2f}x")
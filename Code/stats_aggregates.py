@@ -0,0 +1,173 @@
+import math
+
+
+# Columns summed/averaged on the Overview tab
+SUM_COLUMNS = ['distance_traveled', 'coins_collected', 'jump_count', 'score']
+
+
+class OverviewAggregate:
+    """Mergeable partial aggregate behind the Overview tab numbers.
+
+    A partial can be built from any slice of the stats rows and merged with
+    partials built from other slices, so the same numbers can be computed
+    from a single DataFrame (StatsWindow) or from many chunks in parallel
+    (stats_report.py). Summary files hold exactly one row per session, so
+    sessions are counted rather than collected, and a partial stays a fixed
+    size however many rows it covers.
+    """
+
+    def __init__(self):
+        self.sessions = 0
+        self.counts = {column: 0 for column in SUM_COLUMNS}
+        self.sums = {column: 0 for column in SUM_COLUMNS}
+        self.max_score = None
+
+        # Completion time uses count/mean/M2 so variance can be merged exactly
+        self.time_count = 0
+        self.time_mean = 0.0
+        self.time_m2 = 0.0
+        self.time_min = None
+        self.time_max = None
+
+        self.death_counts = {}
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build an aggregate from a DataFrame of stats rows"""
+        aggregate = cls()
+        aggregate.update(df)
+        return aggregate
+
+    def update(self, df):
+        """Fold a DataFrame of stats rows into this aggregate"""
+        if df.empty:
+            return
+
+        self.sessions += int(df['session_id'].notna().sum())
+
+        for column in SUM_COLUMNS:
+            values = df[column].dropna()
+            self.counts[column] += len(values)
+            total = values.sum()
+            # Keep integer columns integral so totals print like the Overview tab
+            self.sums[column] += int(total) if values.dtype.kind in 'iub' else float(total)
+
+        scores = df['score'].dropna()
+        if len(scores):
+            chunk_max = scores.max()
+            chunk_max = int(chunk_max) if scores.dtype.kind in 'iub' else float(chunk_max)
+            if self.max_score is None or chunk_max > self.max_score:
+                self.max_score = chunk_max
+
+        times = df['completion_time'].dropna().astype(float)
+        if len(times):
+            chunk_mean = float(times.mean())
+            chunk_m2 = float(((times - chunk_mean) ** 2).sum())
+            self._merge_time(len(times), chunk_mean, chunk_m2, float(times.min()), float(times.max()))
+
+        for cause, count in df['death_cause'].value_counts().items():
+            self.death_counts[cause] = self.death_counts.get(cause, 0) + int(count)
+
+    def _merge_time(self, count, mean, m2, minimum, maximum):
+        """Merge completion time moments using Chan's parallel variance formula"""
+        total = self.time_count + count
+        delta = mean - self.time_mean
+        self.time_mean += delta * count / total
+        self.time_m2 += m2 + delta * delta * self.time_count * count / total
+        self.time_count = total
+        self.time_min = minimum if self.time_min is None else min(self.time_min, minimum)
+        self.time_max = maximum if self.time_max is None else max(self.time_max, maximum)
+
+    def merge(self, other):
+        """Merge another partial aggregate into this one"""
+        self.sessions += other.sessions
+
+        for column in SUM_COLUMNS:
+            self.counts[column] += other.counts[column]
+            self.sums[column] += other.sums[column]
+
+        if other.max_score is not None and (self.max_score is None or other.max_score > self.max_score):
+            self.max_score = other.max_score
+
+        if other.time_count:
+            self._merge_time(other.time_count, other.time_mean, other.time_m2, other.time_min, other.time_max)
+
+        for cause, count in other.death_counts.items():
+            self.death_counts[cause] = self.death_counts.get(cause, 0) + count
+        return self
+
+    def to_dict(self):
+        """Plain data for a JSON file (see from_dict)"""
+        return {key: value for key, value in vars(self).items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a partial saved with to_dict()"""
+        aggregate = cls()
+        for key, value in data.items():
+            setattr(aggregate, key, dict(value) if isinstance(value, dict) else value)
+        return aggregate
+
+    def summary(self):
+        """Return the Overview tab statistics as a plain dict"""
+        def mean(column):
+            return self.sums[column] / self.counts[column] if self.counts[column] else 0
+
+        if self.time_count > 1:
+            std_time = math.sqrt(self.time_m2 / (self.time_count - 1))
+        else:
+            std_time = float('nan') if self.time_count else 0
+
+        return {
+            'total_sessions': self.sessions,
+            'total_distance': self.sums['distance_traveled'],
+            'avg_distance': mean('distance_traveled'),
+            'total_coins': self.sums['coins_collected'],
+            'avg_coins': mean('coins_collected'),
+            'total_jumps': self.sums['jump_count'],
+            'avg_jumps': mean('jump_count'),
+            'avg_score': mean('score'),
+            'max_score': self.max_score if self.max_score is not None else 0,
+            'min_time': self.time_min if self.time_min is not None else 0,
+            'max_time': self.time_max if self.time_max is not None else 0,
+            'avg_time': self.time_mean if self.time_count else 0,
+            'std_time': std_time,
+            'falling_deaths': self.death_counts.get('falling', 0),
+            'obstacle_deaths': self.death_counts.get('obstacle', 0),
+            'left_behind_deaths': self.death_counts.get('left_behind', 0),
+        }
+
+
+def format_summary(summary):
+    """Format an Overview summary dict as the text shown on the Overview tab"""
+    total_sessions = summary['total_sessions']
+
+    def share(count):
+        return count / total_sessions * 100 if total_sessions else 0
+
+    lines = [
+        "Player Engagement Statistics",
+        f"  Total Play Sessions: {total_sessions}",
+        f"  Total Distance Traveled: {summary['total_distance']:.1f} units",
+        f"  Average Distance per Session: {summary['avg_distance']:.1f} units",
+        f"  Total Jumps: {summary['total_jumps']}",
+        f"  Average Jumps per Session: {summary['avg_jumps']:.1f}",
+        "",
+        "Performance Statistics",
+        f"  Total Coins Collected: {summary['total_coins']}",
+        f"  Average Coins per Session: {summary['avg_coins']:.1f}",
+        f"  Average Score: {summary['avg_score']:.1f}",
+        f"  High Score: {summary['max_score']}",
+        "",
+        "Completion Time Statistics",
+        f"  Minimum Completion Time: {summary['min_time']:.1f} seconds",
+        f"  Maximum Completion Time: {summary['max_time']:.1f} seconds",
+        f"  Average Completion Time: {summary['avg_time']:.1f} seconds",
+        f"  Standard Deviation: {summary['std_time']:.1f} seconds",
+        "",
+        "Death Statistics",
+        f"  Falling Deaths: {summary['falling_deaths']} ({share(summary['falling_deaths']):.1f}% of sessions)",
+        f"  Obstacle Collisions: {summary['obstacle_deaths']} ({share(summary['obstacle_deaths']):.1f}% of sessions)",
+        f"  Left Behind: {summary['left_behind_deaths']} ({share(summary['left_behind_deaths']):.1f}% of sessions)",
+    ]
+    return "\n".join(lines)
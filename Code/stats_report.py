@@ -0,0 +1,151 @@
+import argparse
+import gzip
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from stats_aggregates import OverviewAggregate, format_summary
+from stats_segments import segment_paths, timestamp_key
+from stats_store import SUMMARY_FILE, SUMMARY_COLUMNS, header_lines
+
+DEFAULT_CHUNK_MB = 64
+
+
+def plan_chunks(paths, chunk_bytes):
+    """Split each stats file into (path, start, end) byte ranges of roughly chunk_bytes"""
+    chunks = []
+    for path in paths:
+        if path.endswith('.gz'):
+            # Compressed segments can't be split at byte offsets (and are small): one chunk each
+            chunks.append((path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        start = 0
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            chunks.append((path, start, end))
+            start = end
+    return chunks
+
+
+def read_chunk(path, start, end):
+    """Read the rows whose first byte falls within [start, end) of a stats file (end None: all rows)"""
+    if end is None:
+        with gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb') as file:
+            for _ in range(header_lines(path)):
+                file.readline()
+            return file.read()
+
+    with open(path, 'rb') as file:
+        if start == 0:
+            # Skip the format line and header row
+            for _ in range(header_lines(path)):
+                file.readline()
+        else:
+            # Skip the partial row owned by the previous chunk
+            file.seek(start - 1)
+            file.readline()
+
+        position = file.tell()
+        if position >= end:
+            return b''
+
+        data = file.read(end - position)
+        # Finish the row that straddles the end of the chunk
+        if not data.endswith(b'\n'):
+            data += file.readline()
+        return data
+
+
+def aggregate_chunk(chunk, since=None):
+    """Compute the partial Overview aggregate for one byte range (runs in a worker)"""
+    path, start, end = chunk
+    aggregate = OverviewAggregate()
+    data = read_chunk(path, start, end)
+    if data.strip():
+        df = pd.read_csv(io.BytesIO(data), header=None, names=SUMMARY_COLUMNS,
+                         dtype={'session_id': str, 'timestamp': str, 'death_cause': str})
+        if since is not None:
+            # Timestamps are fixed-format strings, so they compare chronologically
+            df = df[df['timestamp'] >= since]
+        aggregate.update(df)
+    return aggregate
+
+
+def build_report(paths, workers=None, chunk_bytes=DEFAULT_CHUNK_MB * 1024 * 1024, since=None):
+    """Aggregate the given stats files in parallel and return the Overview summary
+
+    since limits the report to sessions at or after that timestamp.
+    """
+    since = timestamp_key(since)
+    chunks = plan_chunks(paths, chunk_bytes)
+    total = OverviewAggregate()
+
+    if workers == 1:
+        for chunk in chunks:
+            total.merge(aggregate_chunk(chunk, since))
+        return total.summary()
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep only a bounded number of chunks in flight so memory stays flat
+        max_in_flight = workers * 2
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(aggregate_chunk, chunk, since))
+            if len(pending) >= max_in_flight:
+                total.merge(pending.pop(0).result())
+        for future in pending:
+            total.merge(future.result())
+
+    return total.summary()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Compute CoinDash Overview statistics from stats files")
+    parser.add_argument('paths', nargs='*',
+                        help=f"session summary files to aggregate (default: {SUMMARY_FILE} and its segments)")
+    parser.add_argument('--days', type=float, default=None,
+                        help="only sessions from the last N days (segments outside the range aren't read)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument('--chunk-mb', type=int, default=DEFAULT_CHUNK_MB,
+                        help=f"chunk size in megabytes (default: {DEFAULT_CHUNK_MB})")
+    parser.add_argument('--json', dest='json_path',
+                        help="also write the summary as JSON to this file ('-' for stdout)")
+    parser.add_argument('--quiet', action='store_true', help="don't print the text summary")
+    args = parser.parse_args(argv)
+
+    since = datetime.now() - timedelta(days=args.days) if args.days else None
+    # The manifest prunes closed segments that end before the range starts
+    paths = args.paths or segment_paths(since)
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing or not paths:
+        parser.error(f"stats file not found: {', '.join(missing) or SUMMARY_FILE}")
+
+    summary = build_report(paths, workers=args.workers, chunk_bytes=args.chunk_mb * 1024 * 1024, since=since)
+
+    if not args.quiet:
+        print(format_summary(summary))
+
+    # NaN (e.g. std of a single session) is not valid JSON
+    summary = {key: None if value != value else value for key, value in summary.items()}
+
+    if args.json_path == '-':
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+    elif args.json_path:
+        with open(args.json_path, 'w') as file:
+            json.dump(summary, file, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
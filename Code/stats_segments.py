@@ -0,0 +1,289 @@
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from stats_aggregates import OverviewAggregate
+from stats_store import (SUMMARY_FILE, SAMPLES_FILE, SUMMARY_COLUMNS, TIMESTAMP_FORMAT, ensure_stats_file,
+                         format_line, iter_rows, load_typed, read_columns, read_format)
+
+
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024  # The active files are also closed once either grows past this
+MANIFEST_NAME = 'manifest.json'
+SAMPLES_SUFFIX = '.samples.csv'  # Sample segments sit next to their summary segment, uncompressed
+
+
+def segment_dir(active_file=SUMMARY_FILE):
+    """Directory of an active stats file's closed segments (stats/sessions.csv -> stats/sessions)"""
+    return os.path.splitext(active_file)[0]
+
+
+def manifest_path(active_file=SUMMARY_FILE):
+    """Manifest of an active stats file's closed segments"""
+    return os.path.join(segment_dir(active_file), MANIFEST_NAME)
+
+
+def load_manifest(active_file=SUMMARY_FILE):
+    """Closed segment entries, oldest first
+
+    Each has file, min_timestamp, max_timestamp, rows, bytes and overview, plus
+    samples_file, sample_rows and sample_bytes when its sessions' samples were
+    closed with it.
+    """
+    path = manifest_path(active_file)
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return json.load(file)['segments']
+
+
+def save_manifest(segments, active_file=SUMMARY_FILE):
+    """Write the manifest atomically"""
+    path = manifest_path(active_file)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as file:
+        json.dump({'segments': segments}, file, indent=1)
+    os.replace(temp_path, path)
+
+
+def window_start(timestamp):
+    """Start date (a Monday, 'YYYY-MM-DD') of the week-long segment window a timestamp string falls in"""
+    day = datetime.strptime(timestamp[:10], '%Y-%m-%d')
+    return (day - timedelta(days=day.weekday())).strftime('%Y-%m-%d')
+
+
+def timestamp_key(value):
+    """Timestamp as a string comparable with the ones in the stats files (accepts datetimes)"""
+    if value is None or isinstance(value, str):
+        return value
+    return value.strftime(TIMESTAMP_FORMAT)
+
+
+def rotate_if_needed(active_file=SUMMARY_FILE, new_rows=(), max_bytes=SEGMENT_MAX_BYTES, samples_file=None):
+    """Close the active file (and its samples file) before appending new_rows if they start a new window
+    or either file is too big
+
+    Returns the number of segments written.
+    """
+    if not os.path.exists(active_file):
+        return 0
+    first = next(iter_rows(active_file), None)
+    if first is None:
+        return 0
+    window = window_start(first['timestamp'])
+    too_big = os.path.getsize(active_file) >= max_bytes or \
+        (samples_file is not None and os.path.exists(samples_file) and os.path.getsize(samples_file) >= max_bytes)
+    if not too_big and all(window_start(str(row['timestamp'])) == window for row in new_rows):
+        return 0
+    return close_active(active_file, samples_file)
+
+
+def start_afresh(path, kind, columns):
+    """Replace a stats file with an empty one (format line and header only)"""
+    temp_path = path + '.tmp'
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    ensure_stats_file(temp_path, kind, columns)
+    os.replace(temp_path, path)
+
+
+def close_active(active_file=SUMMARY_FILE, samples_file=None):
+    """Move the active file's rows into compressed segments (one per window) and start it afresh
+
+    With a samples file, its rows are moved into sample segments next to the
+    new summary segments (see close_samples) and it is started afresh too.
+    """
+    kind = read_format(active_file)[0] or 'summary'
+    columns = read_columns(active_file)
+    windows = {}
+    for row in iter_rows(active_file):
+        windows.setdefault(window_start(row['timestamp']), []).append(row)
+    if not windows:
+        return 0
+
+    directory = segment_dir(active_file)
+    os.makedirs(directory, exist_ok=True)
+    segments = load_manifest(active_file)
+    names = {segment['file'] for segment in segments}
+    entries = {}  # window -> its new manifest entry
+    for window, rows in sorted(windows.items()):
+        number = 0
+        while f"{window}-{number:03d}.csv.gz" in names:
+            number += 1
+        name = f"{window}-{number:03d}.csv.gz"
+        names.add(name)
+        path = os.path.join(directory, name)
+        with gzip.open(path, 'wt', newline='') as file:
+            file.write(format_line(kind))
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            writer.writerows([row[column] for column in columns] for row in rows)
+        timestamps = [row['timestamp'] for row in rows]
+        entries[window] = {'file': name, 'min_timestamp': min(timestamps), 'max_timestamp': max(timestamps),
+                           'rows': len(rows), 'bytes': os.path.getsize(path), 'overview': segment_overview(path)}
+        segments.append(entries[window])
+    closing_samples = samples_file is not None and os.path.exists(samples_file)
+    if closing_samples:
+        session_windows = {row['session_id']: window for window, rows in windows.items() for row in rows}
+        close_samples(samples_file, directory, entries, session_windows)
+    segments.sort(key=lambda segment: (segment['min_timestamp'], segment['file']))
+    save_manifest(segments, active_file)
+
+    # Segments and manifest are written before the active files are emptied
+    start_afresh(active_file, kind, columns)
+    if closing_samples:
+        start_afresh(samples_file, read_format(samples_file)[0] or 'samples', read_columns(samples_file))
+        # The active samples index described the old rows
+        from session_index import index_path
+        if os.path.exists(index_path(samples_file)):
+            os.remove(index_path(samples_file))
+    return len(windows)
+
+
+def close_samples(samples_file, directory, entries, session_windows):
+    """Write a samples file's rows into sample segments next to the summary segments just closed in directory
+
+    entries maps each closed window to its new manifest entry. A session's
+    samples go to the segment of its summary row's window (rows of sessions
+    without one, by their own timestamp, to the latest closed window not
+    after it). Sample segments stay uncompressed and get their own index, so
+    the session index can seek into them; the entry records samples_file,
+    sample_rows and sample_bytes.
+    """
+    # Imported here: session_index resolves closed sessions through this module's manifest
+    from session_index import SessionIndex
+
+    closed = sorted(entries)
+    grouped = {}
+    for row in iter_rows(samples_file):
+        window = session_windows.get(row['session_id']) or window_start(row['timestamp'])
+        if window not in entries:
+            window = max([start for start in closed if start <= window], default=closed[0])
+        grouped.setdefault(window, []).append(row)
+
+    columns = read_columns(samples_file)
+    for window, rows in grouped.items():
+        entry = entries[window]
+        name = entry['file'][:-len('.csv.gz')] + SAMPLES_SUFFIX
+        path = os.path.join(directory, name)
+        ensure_stats_file(path, 'samples', columns)
+        SessionIndex(path).append(rows, columns)
+        entry.update(samples_file=name, sample_rows=len(rows), sample_bytes=os.path.getsize(path))
+
+
+def sample_segment_paths(active_file=SUMMARY_FILE):
+    """Closed sample segments of an active summary file, oldest first"""
+    return [os.path.join(segment_dir(active_file), segment['samples_file'])
+            for segment in load_manifest(active_file) if 'samples_file' in segment]
+
+
+def segment_paths(start=None, end=None, active_file=SUMMARY_FILE):
+    """Stats files that may hold rows with start <= timestamp <= end: pruned segments plus the active file"""
+    start = timestamp_key(start)
+    end = timestamp_key(end)
+    paths = []
+    for segment in load_manifest(active_file):
+        if start is not None and segment['max_timestamp'] < start:
+            continue
+        if end is not None and segment['min_timestamp'] > end:
+            continue
+        paths.append(os.path.join(segment_dir(active_file), segment['file']))
+    # The active file is small (at most one window), so it is always read
+    if os.path.exists(active_file):
+        paths.append(active_file)
+    return paths
+
+
+def segment_overview(path):
+    """The Overview partial (OverviewAggregate.to_dict()) of one closed segment"""
+    return OverviewAggregate.from_dataframe(load_typed(path)).to_dict()
+
+
+def overview_aggregate(active_file=SUMMARY_FILE):
+    """OverviewAggregate of every session, without loading the history
+
+    Closed segments never change, so each one's partial is kept in the
+    manifest and only the active file's rows are aggregated here. Segments
+    from before the manifest kept partials get theirs on first use.
+    """
+    segments = load_manifest(active_file)
+    total = OverviewAggregate()
+    missing = False
+    for segment in segments:
+        if 'overview' not in segment:
+            segment['overview'] = segment_overview(os.path.join(segment_dir(active_file), segment['file']))
+            missing = True
+        total.merge(OverviewAggregate.from_dict(segment['overview']))
+    if missing:
+        save_manifest(segments, active_file)
+    if os.path.exists(active_file) and next(iter_rows(active_file), None) is not None:
+        total.update(load_typed(active_file))
+    return total
+
+
+def latest_timestamp(active_file=SUMMARY_FILE):
+    """Timestamp string of the latest session in the active file or a closed segment (None if there are none)"""
+    latest = max((segment['max_timestamp'] for segment in load_manifest(active_file)), default=None)
+    if os.path.exists(active_file):
+        for row in iter_rows(active_file):
+            if latest is None or row['timestamp'] > latest:
+                latest = row['timestamp']
+    return latest
+
+
+def iter_session_rows(active_file=SUMMARY_FILE):
+    """Yield every row of a segmented stats file as dicts, oldest segment first"""
+    for path in segment_paths(active_file=active_file):
+        yield from iter_rows(path)
+
+
+def load_sessions(start=None, end=None, active_file=SUMMARY_FILE):
+    """Typed DataFrame (see load_typed) of the sessions with start <= timestamp <= end"""
+    # The active file is only a header right after a rotation, which some CSV engines reject
+    frames = [load_typed(path) for path in segment_paths(start, end, active_file)
+              if path != active_file or next(iter_rows(path), None) is not None]
+    if not frames:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    # Segments' categories differ, which concat turns into plain objects
+    df['death_cause'] = df['death_cause'].astype('category')
+    if start is not None:
+        df = df[df['timestamp'] >= pd.Timestamp(start)]
+    if end is not None:
+        df = df[df['timestamp'] <= pd.Timestamp(end)]
+    return df.reset_index(drop=True)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Show or rotate the CoinDash session stats segments")
+    parser.add_argument('--rotate', action='store_true',
+                        help=f"close {SUMMARY_FILE} (and {SAMPLES_FILE}) into segments now")
+    parser.add_argument('--days', type=float, default=None, help="show the segments a last-N-days query reads")
+    args = parser.parse_args(argv)
+
+    if args.rotate and os.path.exists(SUMMARY_FILE):
+        print(f"Closed {close_active(SUMMARY_FILE, SAMPLES_FILE)} segments")
+
+    start = datetime.now() - timedelta(days=args.days) if args.days else None
+    segments = load_manifest()
+    paths = segment_paths(start)
+    for segment in segments:
+        used = os.path.join(segment_dir(), segment['file']) in paths
+        samples = f"  + {segment['sample_rows']:>8} samples {segment['sample_bytes'] / 1024:>8.1f}KB" \
+            if 'samples_file' in segment else ""
+        print(f"{'*' if used else ' '} {segment['file']}  {segment['min_timestamp']} - {segment['max_timestamp']}  "
+              f"{segment['rows']:>7} rows  {segment['bytes'] / 1024:>8.1f}KB{samples}")
+    print(f"{len(paths)} of {len(segments) + os.path.exists(SUMMARY_FILE)} files read"
+          + (f" for the last {args.days:g} days" if args.days else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
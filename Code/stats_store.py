@@ -0,0 +1,236 @@
+import argparse
+import csv
+import gzip
+import os
+import sys
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - only needed for the faster CSV engine
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+
+STATS_DIR = 'stats'
+SUMMARY_FILE = 'stats/sessions.csv'  # One row per finished session
+SAMPLES_FILE = 'stats/samples.csv'  # Periodic in-game samples (every 10 seconds)
+LEGACY_STATS_FILE = 'stats/game_stats.csv'  # Format 1: summaries and samples mixed
+
+FORMAT_VERSION = 2
+
+SUMMARY_COLUMNS = ['session_id', 'timestamp', 'distance_traveled', 'coins_collected',
+                   'jump_count', 'score', 'completion_time', 'death_cause']
+# Samples never have a completion time or death cause, so those columns are left out
+SAMPLE_COLUMNS = ['session_id', 'timestamp', 'distance_traveled', 'coins_collected',
+                  'jump_count', 'score']
+
+# Column dtypes: narrow numbers and a categorical death cause (a handful of distinct values).
+# session_id is left to inference: int64 for the game's numeric ids, strings when sample data
+# or tournaments add non-numeric ones. Timestamps are parsed separately (see load_typed).
+SUMMARY_DTYPES = {
+    'distance_traveled': 'float32',
+    'coins_collected': 'int32',
+    'jump_count': 'int32',
+    'score': 'int32',
+    'completion_time': 'float32',
+    'death_cause': 'category',
+}
+SAMPLE_DTYPES = {column: SUMMARY_DTYPES[column] for column in SAMPLE_COLUMNS if column in SUMMARY_DTYPES}
+
+# GameManager writes timestamps in exactly this format
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# CSV parser for read_stats ('pyarrow' is multi-threaded and much faster when installed)
+CSV_ENGINE = os.environ.get('COINDASH_CSV_ENGINE', 'pyarrow' if HAVE_PYARROW else 'c')
+
+
+def format_line(kind):
+    """First line of a versioned stats file"""
+    return f"#coindash-stats {kind} v{FORMAT_VERSION}\n"
+
+
+def open_stats(path):
+    """Open a stats file for reading as text (closed segments are gzip-compressed)"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', newline='')
+    return open(path, newline='')
+
+
+def read_format(path):
+    """Return (kind, version) from a stats file's first line, or (None, 1) for legacy files"""
+    with open_stats(path) as file:
+        first = file.readline()
+    if first.startswith('#coindash-stats '):
+        kind, version = first.split()[1:3]
+        return kind, int(version.lstrip('v'))
+    return None, 1
+
+
+def header_lines(path):
+    """Number of lines before the first data row (format line and/or column header)"""
+    return 2 if read_format(path)[1] >= 2 else 1
+
+
+def ensure_stats_file(path, kind, columns):
+    """Create a versioned stats file with its column header if it doesn't exist"""
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', newline='') as file:
+        file.write(format_line(kind))
+        csv.writer(file).writerow(columns)
+
+
+def append_rows(path, columns, rows):
+    """Append rows (dicts with at least the given columns) to a stats file in one write"""
+    with open(path, 'a', newline='') as file:
+        csv.writer(file).writerows([row[column] for column in columns] for row in rows)
+
+
+def read_columns(path):
+    """Column names from a stats file's header row"""
+    with open_stats(path) as file:
+        for _ in range(header_lines(path) - 1):
+            file.readline()
+        return next(csv.reader(file))
+
+
+def read_stats(path, **kwargs):
+    """pd.read_csv for a stats file of any format version"""
+    # Header lines are skipped and the names passed in, which every CSV engine supports
+    return pd.read_csv(path, skiprows=header_lines(path), header=None, names=read_columns(path), **kwargs)
+
+
+def parse_timestamps(values):
+    """Parse timestamp strings, with a fixed-format fast path for the format GameManager writes"""
+    try:
+        return pd.to_datetime(values, format=TIMESTAMP_FORMAT)
+    except ValueError:
+        # Hand-edited files or sample data with fractional seconds
+        return pd.to_datetime(values, format='ISO8601')
+
+
+def apply_schema(df, dtypes):
+    """Convert an untyped DataFrame to the schema dtypes (for files with missing values)"""
+    for column, dtype in dtypes.items():
+        if column == 'timestamp' or column not in df:
+            continue
+        if dtype.startswith('int'):
+            # Integer columns can't hold NaN, so missing counts become 0
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype(dtype)
+        elif dtype.startswith('float'):
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def load_typed(path, dtypes=SUMMARY_DTYPES, engine=None):
+    """Read a stats file into the compact schema, with timestamps parsed to datetime64
+
+    The pyarrow engine converts well-formed timestamps natively while
+    parsing; otherwise they are read as strings and parsed afterwards.
+    """
+    engine = engine or CSV_ENGINE
+    try:
+        df = read_stats(path, dtype=dtypes, engine=engine)
+    except (ValueError, TypeError):
+        # Missing values in an integer column: read untyped and convert
+        df = apply_schema(read_stats(path, engine=engine), dtypes)
+    if df['timestamp'].dtype.kind != 'M':
+        df['timestamp'] = parse_timestamps(df['timestamp'])
+    return df
+
+
+def iter_rows(path):
+    """Yield the rows of a stats file as dicts"""
+    with open_stats(path) as file:
+        for _ in range(header_lines(path) - 1):
+            file.readline()
+        yield from csv.DictReader(file)
+
+
+def write_dataframe(path, kind, df):
+    """Write a whole DataFrame as a versioned stats file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', newline='') as file:
+        file.write(format_line(kind))
+        df.to_csv(file, index=False)
+
+
+def migrate(legacy_file=LEGACY_STATS_FILE, summary_file=SUMMARY_FILE, samples_file=SAMPLES_FILE):
+    """Split a format 1 stats file into summary and samples files (streaming, one pass)
+
+    GameManager wrote each session's summary row first, followed by its
+    samples, so the first row seen for a session id is its summary. The
+    legacy file is kept, renamed with a .v1 suffix. Returns (sessions, samples).
+    """
+    ensure_stats_file(summary_file, 'summary', SUMMARY_COLUMNS)
+    ensure_stats_file(samples_file, 'samples', SAMPLE_COLUMNS)
+
+    seen = set()
+    sessions = 0
+    samples = 0
+    with open(summary_file, 'a', newline='') as summary_out, open(samples_file, 'a', newline='') as samples_out:
+        summary_writer = csv.writer(summary_out)
+        samples_writer = csv.writer(samples_out)
+        for row in iter_rows(legacy_file):
+            if row['session_id'] in seen:
+                samples_writer.writerow([row[column] for column in SAMPLE_COLUMNS])
+                samples += 1
+            else:
+                seen.add(row['session_id'])
+                summary_writer.writerow([row[column] for column in SUMMARY_COLUMNS])
+                sessions += 1
+
+    os.replace(legacy_file, legacy_file + '.v1')
+    return sessions, samples
+
+
+def migrate_if_needed():
+    """Migrate the legacy stats file once, if it's still around"""
+    if os.path.exists(LEGACY_STATS_FILE) and read_format(LEGACY_STATS_FILE)[1] < FORMAT_VERSION:
+        return migrate()
+    return None
+
+
+def prepare_stats_files(summary_file=SUMMARY_FILE, samples_file=SAMPLES_FILE):
+    """Split a legacy combined stats file, then create the stats files if they don't exist
+
+    Called once by the programs that write or show stats (a live game, the
+    Statistics window, a tournament's batched write), never per GameManager,
+    so headless games and replays leave stats/ alone.
+    """
+    if summary_file == SUMMARY_FILE:
+        migrate_if_needed()
+    ensure_stats_file(summary_file, 'summary', SUMMARY_COLUMNS)
+    ensure_stats_file(samples_file, 'samples', SAMPLE_COLUMNS)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Migrate CoinDash stats to the split summary/samples format")
+    parser.add_argument('legacy_file', nargs='?', default=LEGACY_STATS_FILE,
+                        help=f"format 1 stats file (default: {LEGACY_STATS_FILE})")
+    parser.add_argument('--summary', default=SUMMARY_FILE, help=f"summary file (default: {SUMMARY_FILE})")
+    parser.add_argument('--samples', default=SAMPLES_FILE, help=f"samples file (default: {SAMPLES_FILE})")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.legacy_file):
+        print(f"{args.legacy_file} not found, nothing to migrate")
+        return 0
+    if read_format(args.legacy_file)[1] >= FORMAT_VERSION:
+        print(f"{args.legacy_file} is already format {FORMAT_VERSION}")
+        return 0
+
+    legacy_size = os.path.getsize(args.legacy_file)
+    sessions, samples = migrate(args.legacy_file, args.summary, args.samples)
+    print(f"Migrated {sessions} sessions and {samples} samples: {args.summary} is "
+          f"{os.path.getsize(args.summary) / legacy_size:.0%} of the legacy file's size")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import io
+import os
+
+import pandas as pd
+
+from stats_segments import load_manifest, manifest_path, segment_dir
+from stats_store import (SUMMARY_FILE, SUMMARY_DTYPES, apply_schema, header_lines, load_typed, parse_timestamps,
+                         read_columns)
+
+
+class StatsWatcher:
+    """Notices sessions appended to the summary file since the last poll.
+
+    Only the bytes after the last read offset are parsed, so a poll with
+    nothing new costs one stat() call. When the active file has been
+    rotated into a segment it is read again from the start, and any rows
+    that were appended just before the rotation are taken from the new
+    segments (those with timestamps after the newest session seen).
+    """
+
+    def __init__(self, path=SUMMARY_FILE, last_timestamp=None):
+        self.path = path
+        self.offset = os.path.getsize(path) if os.path.exists(path) else 0
+        self.segments = {segment['file'] for segment in load_manifest(path)}
+        self.manifest_mtime = self.manifest_changed_at()
+        self.last_timestamp = last_timestamp  # Newest session seen, for rows rotated out between polls
+
+    def poll(self):
+        """Typed DataFrame (see load_typed) of the sessions appended since the last poll, or None"""
+        if not os.path.exists(self.path):
+            return None
+        size = os.path.getsize(self.path)
+        manifest_mtime = self.manifest_changed_at()
+        if size == self.offset and manifest_mtime == self.manifest_mtime:
+            return None
+
+        frames = []
+        if size < self.offset or manifest_mtime != self.manifest_mtime:
+            # Rotated: the rows already seen moved to segments and the file starts afresh
+            self.manifest_mtime = manifest_mtime
+            self.offset = 0
+            frames.extend(self.rotated_rows())
+
+        with open(self.path, 'rb') as file:
+            if self.offset:
+                file.seek(self.offset)
+            else:
+                for _ in range(header_lines(self.path)):
+                    file.readline()
+            start = file.tell()
+            data = file.read()
+        # Only complete rows; one still being written is picked up by the next poll
+        end = data.rfind(b'\n') + 1
+        self.offset = start + end
+        if data[:end].strip():
+            df = pd.read_csv(io.BytesIO(data[:end]), header=None, names=read_columns(self.path))
+            df = apply_schema(df, SUMMARY_DTYPES)
+            df['timestamp'] = parse_timestamps(df['timestamp'])
+            frames.append(df)
+
+        if not frames:
+            return None
+        new = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        if not new.empty:
+            newest = new['timestamp'].max()
+            self.last_timestamp = newest if self.last_timestamp is None else max(self.last_timestamp, newest)
+        return new
+
+    def manifest_changed_at(self):
+        """Modification time of the segment manifest (None before the first rotation)"""
+        path = manifest_path(self.path)
+        return os.path.getmtime(path) if os.path.exists(path) else None
+
+    def rotated_rows(self):
+        """Rows in segments closed since the last poll that are newer than any session seen"""
+        closed = [segment['file'] for segment in load_manifest(self.path) if segment['file'] not in self.segments]
+        self.segments.update(closed)
+        if self.last_timestamp is None:
+            return []
+        frames = []
+        for name in closed:
+            df = load_typed(os.path.join(segment_dir(self.path), name))
+            frames.append(df[df['timestamp'] > self.last_timestamp])
+        return frames
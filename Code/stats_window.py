@@ -2,15 +2,34 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import pandas as pd
 import matplotlib.pyplot as plt
+import matplotlib.patches as mpatches
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import os
 import numpy as np
 from datetime import datetime
+from stats_aggregates import OverviewAggregate
+from leaderboard import Leaderboard, LEADERBOARD_FILE, LEADERBOARD_METRICS
+from plot_downsample import downsample_line, downsample_scatter, marker_sizes
+from quantile_sketch import SessionSketches, SKETCHES_FILE, SKETCH_METRICS, format_percentiles
+from session_index import SessionIndex
+from rollups import Rollups, ROLLUPS_FILE, GRANULARITIES, ROLLUP_METRICS
+from stats_segments import latest_timestamp, load_sessions, overview_aggregate
+from stats_watcher import StatsWatcher
+from stats_store import SUMMARY_FILE, SAMPLES_FILE, migrate_if_needed, parse_timestamps, write_dataframe
 
 
 class StatsWindow:
+    # Trend chart time ranges (days; None for everything)
+    TREND_RANGES = {'Last 7 days': 7, 'Last 30 days': 30, 'Last year': 365, 'All time': None}
+    # Sessions loaded when the window opens (the Sessions tab's default range and the per-session graphs)
+    DEFAULT_RANGE = 'Last 30 days'
+    DEATH_COLORS = ['tomato', 'orange', 'gold']  # Death cause wedges, in the order causes are first seen
+    LIVE_POLL_MS = 2000  # How often the stats store is checked for newly saved sessions
+    RESIZE_DELAY_MS = 200  # Downsampled plots are redone once a resize has settled for this long
+
     def __init__(self, root):
         self.parent = root
+        self.resize_jobs = {}  # Pending re-downsampling per resized canvas
 
         try:
             # Create new top level window
@@ -28,24 +47,33 @@ class StatsWindow:
             self.sessions_tab = ttk.Frame(self.notebook)
             self.graphs_tab = ttk.Frame(self.notebook)
             self.detailed_graphs_tab = ttk.Frame(self.notebook)
+            self.leaderboard_tab = ttk.Frame(self.notebook)
 
             self.notebook.add(self.overview_tab, text="Overview")
             self.notebook.add(self.sessions_tab, text="Sessions")
             self.notebook.add(self.graphs_tab, text="Primary Graphs")
             self.notebook.add(self.detailed_graphs_tab, text="Additional Graphs")
+            self.notebook.add(self.leaderboard_tab, text="Leaderboard")
 
             # Load data
             self.load_data()
+            self.sketches = self.load_sketches()
+            self.rollups = self.load_rollups()
 
             # Setup UI elements
             self.setup_overview_tab()
             self.setup_sessions_tab()
             self.setup_primary_graphs_tab()
             self.setup_detailed_graphs_tab()
+            self.setup_leaderboard_tab()
 
             # Add quit button at the bottom of the window
             self.add_quit_button()
 
+            # Pick up sessions saved while the window is open
+            self.watcher = StatsWatcher(SUMMARY_FILE, last_timestamp=self.stats_df['timestamp'].max())
+            self.poll_job = self.window.after(self.LIVE_POLL_MS, self.poll_stats)
+
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred while showing statistics: {str(e)}")
             self.on_close()
@@ -64,13 +92,18 @@ class StatsWindow:
         quit_button.pack(side="right", padx=10, pady=5)
 
     def load_data(self):
-        """Load game statistics data from CSV"""
-        stats_file = 'stats/game_stats.csv'
+        """Load the recent session summaries (one row per session) from CSV"""
+        stats_file = SUMMARY_FILE
+        migrate_if_needed()
+        self.sample_data = False
+        self.latest_time = None
         if os.path.exists(stats_file):
             try:
-                self.stats_df = pd.read_csv(stats_file)
-                # Convert timestamp to datetime
-                self.stats_df['timestamp'] = pd.to_datetime(self.stats_df['timestamp'])
+                # Compact typed schema, from the active file and the closed segments the manifest says
+                # overlap the default range; the whole history is only read if the user picks "All time"
+                latest = latest_timestamp()
+                self.latest_time = pd.Timestamp(latest) if latest else None
+                self.stats_df = load_sessions(self.range_start(self.TREND_RANGES[self.DEFAULT_RANGE]))
 
                 # If no data or empty dataframe, create sample data for testing
                 if self.stats_df.empty:
@@ -83,9 +116,37 @@ class StatsWindow:
             os.makedirs('stats', exist_ok=True)
             self.create_sample_data()
             # Save sample data
-            self.stats_df.to_csv(stats_file, index=False)
+            write_dataframe(stats_file, 'summary', self.stats_df)
             print("Created sample stats file for testing.")
 
+    def range_start(self, days):
+        """Start of the last N days up to the latest session (None for all time)"""
+        if days is None or self.latest_time is None:
+            return None
+        return self.latest_time - pd.Timedelta(days=days)
+
+    def load_sketches(self):
+        """Load the percentile sketches sidecar, or sketch the history if there isn't one yet"""
+        if os.path.exists(SKETCHES_FILE):
+            return SessionSketches.load()
+        if not self.sample_data:
+            return SessionSketches.rebuild(SUMMARY_FILE)
+        sketches = SessionSketches()
+        for row in self.stats_df.to_dict('records'):
+            sketches.add(row)
+        return sketches
+
+    def load_rollups(self):
+        """Load the rollups sidecar, or roll up the history if there isn't one yet"""
+        if os.path.exists(ROLLUPS_FILE):
+            return Rollups.load()
+        if not self.sample_data:
+            return Rollups.rebuild(SUMMARY_FILE)
+        rollups = Rollups()
+        for row in self.stats_df.to_dict('records'):
+            rollups.add(row)
+        return rollups
+
     def create_sample_data(self):
         """Create sample data for testing if no real data exists"""
         # Create sample timestamps for last 50 sessions
@@ -105,6 +166,8 @@ class StatsWindow:
         }
 
         self.stats_df = pd.DataFrame(data)
+        self.sample_data = True
+        self.latest_time = self.stats_df['timestamp'].max()
 
     def setup_overview_tab(self):
         """Setup the overview tab with summary statistics"""
@@ -130,107 +193,77 @@ class StatsWindow:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        # Calculate summary statistics
-        if not self.stats_df.empty:
-            # Group by session_id to get unique sessions
-            unique_sessions = self.stats_df.drop_duplicates(subset=['session_id'])
-
-            total_sessions = len(unique_sessions)
-            total_distance = self.stats_df['distance_traveled'].sum()
-            avg_distance = self.stats_df['distance_traveled'].mean()
-            total_coins = self.stats_df['coins_collected'].sum()
-            avg_coins = self.stats_df['coins_collected'].mean()
-            total_jumps = self.stats_df['jump_count'].sum()
-            avg_jumps = self.stats_df['jump_count'].mean()
-            avg_score = self.stats_df['score'].mean()
-            max_score = self.stats_df['score'].max()
-
-            # Time statistics
-            min_time = self.stats_df['completion_time'].min()
-            max_time = self.stats_df['completion_time'].max()
-            avg_time = self.stats_df['completion_time'].mean()
-            std_time = self.stats_df['completion_time'].std()
-
-            # Count death causes
-            death_causes = self.stats_df['death_cause'].value_counts()
-            falling_deaths = death_causes.get('falling', 0)
-            obstacle_deaths = death_causes.get('obstacle', 0)
-            left_behind_deaths = death_causes.get('left_behind', 0)
-        else:
-            total_sessions = 0
-            total_distance = 0
-            avg_distance = 0
-            total_coins = 0
-            avg_coins = 0
-            total_jumps = 0
-            avg_jumps = 0
-            avg_score = 0
-            max_score = 0
-            min_time = 0
-            max_time = 0
-            avg_time = 0
-            std_time = 0
-            falling_deaths = 0
-            obstacle_deaths = 0
-            left_behind_deaths = 0
-
-        # Player Engagement Statistics
-        engagement_frame = ttk.LabelFrame(scrollable_frame, text="Player Engagement Statistics")
-        engagement_frame.pack(fill="x", padx=10, pady=5)
-
-        ttk.Label(engagement_frame, text=f"Total Play Sessions: {total_sessions}", font=("Arial", 12)).pack(anchor="w",
-                                                                                                            padx=10,
-                                                                                                            pady=5)
-        ttk.Label(engagement_frame, text=f"Total Distance Traveled: {total_distance:.1f} units",
-                  font=("Arial", 12)).pack(anchor="w", padx=10, pady=5)
-        ttk.Label(engagement_frame, text=f"Average Distance per Session: {avg_distance:.1f} units",
-                  font=("Arial", 12)).pack(anchor="w", padx=10, pady=5)
-        ttk.Label(engagement_frame, text=f"Total Jumps: {total_jumps}", font=("Arial", 12)).pack(anchor="w", padx=10,
-                                                                                                 pady=5)
-        ttk.Label(engagement_frame, text=f"Average Jumps per Session: {avg_jumps:.1f}", font=("Arial", 12)).pack(
-            anchor="w", padx=10, pady=5)
-
-        # Performance Statistics
-        performance_frame = ttk.LabelFrame(scrollable_frame, text="Performance Statistics")
-        performance_frame.pack(fill="x", padx=10, pady=5)
-
-        ttk.Label(performance_frame, text=f"Total Coins Collected: {total_coins}", font=("Arial", 12)).pack(anchor="w",
-                                                                                                            padx=10,
-                                                                                                            pady=5)
-        ttk.Label(performance_frame, text=f"Average Coins per Session: {avg_coins:.1f}", font=("Arial", 12)).pack(
-            anchor="w", padx=10, pady=5)
-        ttk.Label(performance_frame, text=f"Average Score: {avg_score:.1f}", font=("Arial", 12)).pack(anchor="w",
-                                                                                                      padx=10, pady=5)
-        ttk.Label(performance_frame, text=f"High Score: {max_score}", font=("Arial", 12)).pack(anchor="w", padx=10,
-                                                                                               pady=5)
-
-        # Time Statistics
-        time_frame = ttk.LabelFrame(scrollable_frame, text="Completion Time Statistics")
-        time_frame.pack(fill="x", padx=10, pady=5)
-
-        ttk.Label(time_frame, text=f"Minimum Completion Time: {min_time:.1f} seconds", font=("Arial", 12)).pack(
-            anchor="w", padx=10, pady=5)
-        ttk.Label(time_frame, text=f"Maximum Completion Time: {max_time:.1f} seconds", font=("Arial", 12)).pack(
-            anchor="w", padx=10, pady=5)
-        ttk.Label(time_frame, text=f"Average Completion Time: {avg_time:.1f} seconds", font=("Arial", 12)).pack(
-            anchor="w", padx=10, pady=5)
-        ttk.Label(time_frame, text=f"Standard Deviation: {std_time:.1f} seconds", font=("Arial", 12)).pack(anchor="w",
-                                                                                                           padx=10,
-                                                                                                           pady=5)
-
-        # Death statistics
-        death_frame = ttk.LabelFrame(scrollable_frame, text="Death Statistics")
-        death_frame.pack(fill="x", padx=10, pady=5)
-
-        ttk.Label(death_frame,
-                  text=f"Falling Deaths: {falling_deaths} ({falling_deaths / total_sessions * 100:.1f}% of sessions)",
-                  font=("Arial", 12)).pack(anchor="w", padx=10, pady=5)
-        ttk.Label(death_frame,
-                  text=f"Obstacle Collisions: {obstacle_deaths} ({obstacle_deaths / total_sessions * 100:.1f}% of sessions)",
-                  font=("Arial", 12)).pack(anchor="w", padx=10, pady=5)
-        ttk.Label(death_frame,
-                  text=f"Left Behind: {left_behind_deaths} ({left_behind_deaths / total_sessions * 100:.1f}% of sessions)",
-                  font=("Arial", 12)).pack(anchor="w", padx=10, pady=5)
+        # Running summary statistics (shared with stats_report.py), extended as sessions arrive
+        self.overview_aggregate = self.load_overview()
+
+        # One LabelFrame per group; the labels are kept so live updates only change their text
+        titles = {
+            'engagement': "Player Engagement Statistics",
+            'performance': "Performance Statistics",
+            'time': "Completion Time Statistics",
+            # Percentiles come from the sketches sidecar, not a sort of the whole history
+            'percentiles': f"Percentiles (within {self.sketches.relative_accuracy:.0%})",
+            'death': "Death Statistics",
+        }
+        self.overview_labels = {}
+        for group, texts in self.overview_texts().items():
+            frame = ttk.LabelFrame(scrollable_frame, text=titles[group])
+            frame.pack(fill="x", padx=10, pady=5)
+            self.overview_labels[group] = []
+            for text in texts:
+                label = ttk.Label(frame, text=text, font=("Arial", 12))
+                label.pack(anchor="w", padx=10, pady=5)
+                self.overview_labels[group].append(label)
+
+    def load_overview(self):
+        """Overview aggregate of the whole history, merged from the segments' partials"""
+        if not self.sample_data:
+            try:
+                return overview_aggregate()
+            except Exception as e:
+                print(f"Error aggregating stats: {e}")
+        return OverviewAggregate.from_dataframe(self.stats_df)
+
+    def overview_texts(self):
+        """Text of every Overview label, grouped by LabelFrame"""
+        summary = self.overview_aggregate.summary()
+        total_sessions = summary['total_sessions']
+
+        # Count death causes
+        falling_deaths = summary['falling_deaths']
+        obstacle_deaths = summary['obstacle_deaths']
+        left_behind_deaths = summary['left_behind_deaths']
+
+        return {
+            'engagement': [
+                f"Total Play Sessions: {total_sessions}",
+                f"Total Distance Traveled: {summary['total_distance']:.1f} units",
+                f"Average Distance per Session: {summary['avg_distance']:.1f} units",
+                f"Total Jumps: {summary['total_jumps']}",
+                f"Average Jumps per Session: {summary['avg_jumps']:.1f}",
+            ],
+            'performance': [
+                f"Total Coins Collected: {summary['total_coins']}",
+                f"Average Coins per Session: {summary['avg_coins']:.1f}",
+                f"Average Score: {summary['avg_score']:.1f}",
+                f"High Score: {summary['max_score']}",
+            ],
+            'time': [
+                f"Minimum Completion Time: {summary['min_time']:.1f} seconds",
+                f"Maximum Completion Time: {summary['max_time']:.1f} seconds",
+                f"Average Completion Time: {summary['avg_time']:.1f} seconds",
+                f"Standard Deviation: {summary['std_time']:.1f} seconds",
+            ],
+            'percentiles': [
+                f"{metric.replace('_', ' ').title()}: {format_percentiles(self.sketches.percentiles(metric))}"
+                for metric in SKETCH_METRICS
+            ],
+            'death': [
+                f"Falling Deaths: {falling_deaths} ({falling_deaths / total_sessions * 100:.1f}% of sessions)",
+                f"Obstacle Collisions: {obstacle_deaths} ({obstacle_deaths / total_sessions * 100:.1f}% of sessions)",
+                f"Left Behind: {left_behind_deaths} ({left_behind_deaths / total_sessions * 100:.1f}% of sessions)",
+            ],
+        }
 
     def setup_sessions_tab(self):
         """Setup the sessions tab with detailed session data"""
@@ -286,8 +319,17 @@ class StatsWindow:
         self.sort_ascending = tk.BooleanVar(value=False)
         ttk.Checkbutton(controls_frame, text="Ascending", variable=self.sort_ascending).pack(side="left", padx=5)
 
+        # Time range: sessions outside it are never read (closed segments are pruned by the manifest)
+        ttk.Label(controls_frame, text="Show:").pack(side="left", padx=5)
+        self.sessions_range = tk.StringVar(value=self.DEFAULT_RANGE)
+        ttk.Combobox(controls_frame, textvariable=self.sessions_range, values=list(self.TREND_RANGES), width=12,
+                     state="readonly").pack(side="left", padx=5)
+
         # Apply button
-        ttk.Button(controls_frame, text="Apply Sort", command=self.populate_sessions_table).pack(side="left", padx=5)
+        ttk.Button(controls_frame, text="Apply", command=self.populate_sessions_table).pack(side="left", padx=5)
+
+        # Double-click a session to plot its samples
+        self.tree.bind("<Double-1>", self.show_session_detail)
 
         # Populate treeview with data
         self.populate_sessions_table()
@@ -305,8 +347,8 @@ class StatsWindow:
             sort_col = self.sort_mapping.get(sort_display, "timestamp")  # Use mapping to get actual column name
             ascending = self.sort_ascending.get()
 
-            # Group by session_id to get unique sessions
-            unique_sessions = self.stats_df.drop_duplicates(subset=['session_id'])
+            # The summary file has one row per session
+            unique_sessions = self.query_sessions(self.TREND_RANGES[self.sessions_range.get()])
 
             # Sort data (with error handling)
             try:
@@ -317,20 +359,164 @@ class StatsWindow:
                 unique_sessions = unique_sessions.sort_values(by="timestamp", ascending=ascending)
 
             for _, row in unique_sessions.iterrows():
-                # Format timestamp
-                timestamp = row['timestamp'].strftime("%Y-%m-%d %H:%M")
-
-                # Add row to treeview
-                self.tree.insert("", "end", values=(
-                    row['session_id'],
-                    timestamp,
-                    f"{row['distance_traveled']:.1f}",
-                    row['coins_collected'],
-                    row['jump_count'],
-                    row['score'],
-                    f"{row['completion_time']:.1f}",
-                    row['death_cause']
-                ))
+                self.insert_session_row(row)
+
+    def insert_session_row(self, row, index="end"):
+        """Add one session to the sessions table"""
+        # Format timestamp
+        timestamp = row['timestamp'].strftime("%Y-%m-%d %H:%M")
+
+        # Add row to treeview
+        self.tree.insert("", index, values=(
+            row['session_id'],
+            timestamp,
+            f"{row['distance_traveled']:.1f}",
+            row['coins_collected'],
+            row['jump_count'],
+            row['score'],
+            f"{row['completion_time']:.1f}",
+            row['death_cause']
+        ))
+
+    def query_sessions(self, days):
+        """Sessions from the last N days (all sessions for None), reading only overlapping segments"""
+        if days == self.TREND_RANGES[self.DEFAULT_RANGE]:
+            return self.stats_df
+        start = self.range_start(days)
+        if self.sample_data:
+            return self.stats_df if start is None else self.stats_df[self.stats_df['timestamp'] >= start]
+        try:
+            return load_sessions(start)
+        except Exception as e:
+            print(f"Error loading sessions: {e}")
+            return self.stats_df if start is None else self.stats_df[self.stats_df['timestamp'] >= start]
+
+    def show_session_detail(self, event):
+        """Open a drill-down window plotting the double-clicked session's samples over time"""
+        item = self.tree.identify_row(event.y)
+        if not item:
+            return
+        session_id = str(self.tree.item(item, 'values')[0])
+
+        # The index maps sessions to byte ranges, so only this session's rows are read
+        if not os.path.exists(SAMPLES_FILE):
+            messagebox.showinfo("Session Detail", f"No samples recorded for session {session_id}")
+            return
+        if getattr(self, 'session_index', None) is None:
+            self.session_index = SessionIndex.load(SAMPLES_FILE)
+        else:
+            self.session_index.catch_up()
+        rows = self.session_index.read_session(session_id)
+        if not rows:
+            messagebox.showinfo("Session Detail", f"No samples recorded for session {session_id}")
+            return
+
+        samples = pd.DataFrame(rows)
+        timestamps = parse_timestamps(samples['timestamp'])
+        elapsed = (timestamps - timestamps.iloc[0]).dt.total_seconds()
+
+        detail = tk.Toplevel(self.window)
+        detail.title(f"Session {session_id}")
+        detail.geometry("800x600")
+
+        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 6), sharex=True)
+        ax1.plot(elapsed, pd.to_numeric(samples['distance_traveled']), 'g-o', linewidth=2)
+        ax1.set_title(f'Session {session_id} Timeline')
+        ax1.set_ylabel('Distance Traveled')
+        ax1.grid(True)
+
+        for column, label, color in (('score', 'Score', 'blue'), ('coins_collected', 'Coins', 'gold'),
+                                     ('jump_count', 'Jumps', 'purple')):
+            ax2.plot(elapsed, pd.to_numeric(samples[column]), '-o', color=color, label=label)
+        ax2.set_xlabel('Time (seconds)')
+        ax2.grid(True)
+        ax2.legend(loc='upper left')
+        fig.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, master=detail)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Free the figure with its window
+        detail.protocol("WM_DELETE_WINDOW", lambda: (plt.close(fig), detail.destroy()))
+
+    def load_leaderboard(self):
+        """Load the leaderboard sidecar, or index the history if there isn't one yet"""
+        if os.path.exists(LEADERBOARD_FILE):
+            return Leaderboard.load()
+        if not self.sample_data:
+            return Leaderboard.rebuild(SUMMARY_FILE)
+        leaderboard = Leaderboard()
+        for row in self.stats_df.to_dict('records'):
+            leaderboard.add(row)
+        return leaderboard
+
+    def setup_leaderboard_tab(self):
+        """Setup the leaderboard tab with the top sessions and a session rank lookup"""
+        self.leaderboard = self.load_leaderboard()
+
+        # Controls frame for the board selection and rank lookup
+        controls_frame = ttk.Frame(self.leaderboard_tab)
+        controls_frame.pack(side="top", fill="x", padx=10, pady=5)
+
+        ttk.Label(controls_frame, text="Board:").pack(side="left", padx=5)
+        self.leaderboard_var = tk.StringVar(value="score")
+        board_dropdown = ttk.Combobox(controls_frame, textvariable=self.leaderboard_var,
+                                      values=list(LEADERBOARD_METRICS), width=10, state="readonly")
+        board_dropdown.pack(side="left", padx=5)
+        board_dropdown.bind("<<ComboboxSelected>>", lambda e: self.populate_leaderboard_table())
+
+        # Rank lookup for one session
+        ttk.Label(controls_frame, text="Session ID:").pack(side="left", padx=(20, 5))
+        self.rank_session_var = tk.StringVar()
+        ttk.Entry(controls_frame, textvariable=self.rank_session_var, width=18).pack(side="left", padx=5)
+        ttk.Button(controls_frame, text="Find Rank", command=self.show_session_rank).pack(side="left", padx=5)
+        self.rank_label = ttk.Label(controls_frame, text="")
+        self.rank_label.pack(side="left", padx=5)
+
+        # Create treeview for the board
+        columns = ("rank", "session_id", "timestamp", "value")
+        self.leaderboard_tree = ttk.Treeview(self.leaderboard_tab, columns=columns, show="headings")
+        self.leaderboard_tree.heading("rank", text="Rank")
+        self.leaderboard_tree.heading("session_id", text="Session ID")
+        self.leaderboard_tree.heading("timestamp", text="Date/Time")
+        self.leaderboard_tree.heading("value", text="Value")
+        self.leaderboard_tree.column("rank", width=50)
+        self.leaderboard_tree.column("session_id", width=150)
+        self.leaderboard_tree.column("timestamp", width=150)
+        self.leaderboard_tree.column("value", width=100)
+
+        scrollbar = ttk.Scrollbar(self.leaderboard_tab, orient="vertical", command=self.leaderboard_tree.yview)
+        self.leaderboard_tree.configure(yscrollcommand=scrollbar.set)
+        self.leaderboard_tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        self.populate_leaderboard_table()
+
+    def populate_leaderboard_table(self):
+        """Fill the leaderboard table from the top-k index (no pass over the history)"""
+        for item in self.leaderboard_tree.get_children():
+            self.leaderboard_tree.delete(item)
+
+        for entry in self.leaderboard.top(self.leaderboard_var.get()):
+            self.leaderboard_tree.insert("", "end", values=(
+                entry['rank'],
+                entry['session_id'],
+                entry['timestamp'][:16],
+                f"{entry['value']:g}"
+            ))
+
+    def show_session_rank(self):
+        """Show the entered session's rank on each board"""
+        session_id = self.rank_session_var.get().strip()
+        if not session_id:
+            return
+        # Sessions in the loaded range have their values at hand for ranks below the top k
+        matches = self.stats_df[self.stats_df['session_id'].astype(str) == session_id]
+        ranks = []
+        for metric, column in LEADERBOARD_METRICS.items():
+            value = matches[column].iloc[0] if len(matches) and pd.notna(matches[column].iloc[0]) else None
+            ranks.append(f"{metric} {self.leaderboard.describe_rank(session_id, metric, value, self.sketches)}")
+        self.rank_label.config(text=", ".join(ranks))
 
     def bind_mousewheel_to_canvas(self, canvas):
         """Bind mousewheel to canvas for better scrolling"""
@@ -382,63 +568,151 @@ class StatsWindow:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        # 1. Line Graph: Player Movement (Distance Traveled) over time
+        # 1. Line Graph: Player Movement over time, read from the rollups only
         distance_frame = ttk.LabelFrame(scrollable_frame, text="Distance Traveled Over Time")
         distance_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-        fig1, ax1 = plt.subplots(figsize=(8, 4))
-        distance_data = self.stats_df.drop_duplicates(subset=['session_id']).sort_values('timestamp')
-        ax1.plot(range(1, len(distance_data) + 1), distance_data['distance_traveled'], 'g-o', linewidth=2)
-        ax1.set_title('Player Movement Over Time')
-        ax1.set_xlabel('Session Number')
-        ax1.set_ylabel('Distance Traveled')
-        ax1.grid(True)
-
-        canvas1 = FigureCanvasTkAgg(fig1, master=distance_frame)
-        canvas1.draw()
-        canvas1.get_tk_widget().pack(fill="both", expand=True)
+        controls = ttk.Frame(distance_frame)
+        controls.pack(fill="x", padx=5, pady=5)
+        self.trend_metric = tk.StringVar(value='distance')
+        self.trend_granularity = tk.StringVar(value='daily')
+        self.trend_range = tk.StringVar(value='Last 30 days')
+        for label, variable, values in (("Metric:", self.trend_metric, list(ROLLUP_METRICS)),
+                                        ("Granularity:", self.trend_granularity, list(GRANULARITIES)),
+                                        ("Range:", self.trend_range, list(self.TREND_RANGES))):
+            ttk.Label(controls, text=label).pack(side="left", padx=(10, 5))
+            combobox = ttk.Combobox(controls, textvariable=variable, values=values, state="readonly", width=14)
+            combobox.pack(side="left")
+            combobox.bind("<<ComboboxSelected>>", lambda e: self.draw_trend_chart())
+
+        self.trend_fig, self.trend_ax = plt.subplots(figsize=(8, 4))
+        self.trend_canvas = FigureCanvasTkAgg(self.trend_fig, master=distance_frame)
+        self.draw_trend_chart()
+        self.trend_canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.redownsample_on_resize(self.trend_canvas, self.draw_trend_chart)
 
         # 2. Bar Chart: Coins Collected per session
         coins_frame = ttk.LabelFrame(scrollable_frame, text="Coins Collected per Session")
         coins_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-        fig2, ax2 = plt.subplots(figsize=(8, 4))
-        coins_data = self.stats_df.drop_duplicates(subset=['session_id']).sort_values('timestamp').tail(
-            15)  # Last 15 sessions
-        bars = ax2.bar(range(1, len(coins_data) + 1), coins_data['coins_collected'], color='gold')
-        ax2.set_title('Coins Collected (Last 15 Sessions)')
-        ax2.set_xlabel('Session Number')
-        ax2.set_ylabel('Coins Collected')
-        ax2.set_xticks(range(1, len(coins_data) + 1))
-
-        # Add value labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width() / 2., height + 0.1,
-                     f'{int(height)}', ha='center', va='bottom')
-
-        canvas2 = FigureCanvasTkAgg(fig2, master=coins_frame)
-        canvas2.draw()
-        canvas2.get_tk_widget().pack(fill="both", expand=True)
+        fig2, self.coins_ax = plt.subplots(figsize=(8, 4))
+        self.coins_ax.set_title('Coins Collected (Last 15 Sessions)')
+        self.coins_ax.set_xlabel('Session Number')
+        self.coins_ax.set_ylabel('Coins Collected')
+        self.coins_bars = []
+        self.coins_labels = []  # Value labels on top of the bars
+
+        self.coins_canvas = FigureCanvasTkAgg(fig2, master=coins_frame)
+        self.update_coins_chart()
+        self.coins_canvas.get_tk_widget().pack(fill="both", expand=True)
 
         # 3. Pie Chart: Death Causes
         death_frame = ttk.LabelFrame(scrollable_frame, text="Death Causes")
         death_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-        fig3, ax3 = plt.subplots(figsize=(7, 5))
+        fig3, self.death_ax = plt.subplots(figsize=(7, 5))
+        self.death_pie = None  # cause -> (wedge, label, percentage text)
+
+        self.death_canvas = FigureCanvasTkAgg(fig3, master=death_frame)
+        self.update_death_chart()
+        self.death_canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    def update_coins_chart(self):
+        """Show the last 15 sessions' coins, resizing the existing bars and adding any missing ones"""
+        ax = self.coins_ax
+        coins_data = self.stats_df.sort_values('timestamp').tail(15)['coins_collected']  # Last 15 sessions
+        for i, coins in enumerate(coins_data):
+            if i < len(self.coins_bars):
+                self.coins_bars[i].set_height(coins)
+                self.coins_labels[i].set_text(f'{int(coins)}')
+                self.coins_labels[i].set_y(coins + 0.1)
+            else:
+                bar = ax.bar(i + 1, coins, color='gold')[0]
+                self.coins_bars.append(bar)
+                # Add value labels on top of bars
+                self.coins_labels.append(ax.text(bar.get_x() + bar.get_width() / 2., coins + 0.1,
+                                                 f'{int(coins)}', ha='center', va='bottom'))
+        ax.set_xticks(range(1, len(self.coins_bars) + 1))
+        ax.relim()
+        ax.autoscale_view()
+        self.coins_canvas.draw_idle()
+
+    def update_death_chart(self):
+        """Show the death cause split, moving the existing wedges (a new cause gets its own wedge added)"""
+        ax = self.death_ax
         death_counts = self.stats_df['death_cause'].value_counts()
-        labels = death_counts.index
+        death_counts = death_counts[death_counts > 0]  # Categorical counts include unused causes
         sizes = death_counts.values
-        explode = [0.1] * len(labels)  # explode all slices
-
-        ax3.pie(sizes, explode=explode, labels=labels, autopct='%1.1f%%',
-                shadow=True, startangle=90, colors=['tomato', 'orange', 'gold'])
-        ax3.axis('equal')
-        ax3.set_title('Death Causes Distribution')
-
-        canvas3 = FigureCanvasTkAgg(fig3, master=death_frame)
-        canvas3.draw()
-        canvas3.get_tk_widget().pack(fill="both", expand=True)
+        explode = 0.1  # explode all slices
+
+        if self.death_pie is None:
+            # The frame Axes.pie sets up; the wedges are added below and only ever moved
+            ax.set(frame_on=False, xticks=[], yticks=[], xlim=(-1.25, 1.25), ylim=(-1.25, 1.25), aspect='equal')
+            ax.set_title('Death Causes Distribution')
+            self.death_pie = {}
+
+        # Same layout rules as Axes.pie(startangle=90, shadow=True); the shadows follow their wedges
+        theta = 90.0
+        for cause, size in zip(death_counts.index, sizes):
+            if cause not in self.death_pie:
+                color = self.DEATH_COLORS[len(self.death_pie) % len(self.DEATH_COLORS)]
+                wedge = ax.add_patch(mpatches.Wedge((0, 0), 1, theta, theta, facecolor=color, clip_on=False))
+                ax.add_patch(mpatches.Shadow(wedge, -0.02, -0.02, label='_nolegend_'))
+                label = ax.text(0, 0, cause, clip_on=False, verticalalignment='center')
+                percentage = ax.text(0, 0, '', clip_on=False, horizontalalignment='center',
+                                     verticalalignment='center')
+                self.death_pie[cause] = (wedge, label, percentage)
+            wedge, label, percentage = self.death_pie[cause]
+            share = size / sizes.sum()
+            middle = np.radians(theta + share * 180)
+            center = (explode * np.cos(middle), explode * np.sin(middle))
+            wedge.set_center(center)
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + share * 360)
+            label.set_position((center[0] + 1.1 * np.cos(middle), center[1] + 1.1 * np.sin(middle)))
+            label.set_horizontalalignment('left' if np.cos(middle) > 0 else 'right')
+            percentage.set_position((center[0] + 0.6 * np.cos(middle), center[1] + 0.6 * np.sin(middle)))
+            percentage.set_text(f'{share * 100:.1f}%')
+            theta += share * 360
+        self.death_canvas.draw_idle()
+
+    def draw_trend_chart(self):
+        """Plot the selected rollup metric's per-bucket mean and maximum for the selected time range"""
+        metric = self.trend_metric.get()
+        granularity = self.trend_granularity.get()
+        days = self.TREND_RANGES[self.trend_range.get()]
+
+        # Ranges end at the latest session so old histories still show their last stretch
+        latest = self.rollups.latest()
+        start = latest - pd.Timedelta(days=days) if latest is not None and days else None
+        times, means = self.rollups.series(granularity, metric, 'mean', start)
+        _, maxima = self.rollups.series(granularity, metric, 'max', start)
+
+        ax = self.trend_ax
+        # Hourly buckets over years are far more points than pixels: keep the visually important ones
+        mean_data = downsample_line(times, means, ax) if times else ([], [])
+        best_data = downsample_line(times, maxima, ax) if times else ([], [])
+        marker = 'o' if len(times) <= 60 else 'None'
+        if getattr(self, 'trend_lines', None) is None:
+            ax.xaxis_date()
+            mean_line, = ax.plot(*mean_data, 'g-', marker=marker, linewidth=2, label='Average per session')
+            best_line, = ax.plot(*best_data, color='darkgreen', linestyle=':', linewidth=1, label='Best session')
+            ax.set_xlabel('Time')
+            ax.grid(True)
+            ax.legend()
+            self.trend_lines = (mean_line, best_line)
+        else:
+            # Selections and new sessions reuse the same artists
+            mean_line, best_line = self.trend_lines
+            mean_line.set_data(*mean_data)
+            mean_line.set_marker(marker)
+            best_line.set_data(*best_data)
+        ax.set_title(f'{metric.title()} Over Time ({granularity})')
+        ax.set_ylabel(metric.title())
+        ax.relim()
+        ax.autoscale_view()
+        self.trend_fig.autofmt_xdate()
+        self.trend_canvas.draw_idle()
 
     def setup_detailed_graphs_tab(self):
         """Setup additional graphs tab with more visualizations"""
@@ -473,10 +747,17 @@ class StatsWindow:
         jump_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
         fig1, ax1 = plt.subplots(figsize=(8, 4))
-        jump_data = self.stats_df.drop_duplicates(subset=['session_id']).sort_values('timestamp')
-        scatter = ax1.scatter(range(1, len(jump_data) + 1), jump_data['jump_count'],
-                              c=jump_data['score'], cmap='viridis', alpha=0.7,
-                              s=100, edgecolors='black', linewidth=1)
+        jump_data = self.stats_df.sort_values('timestamp')
+        session_numbers = np.arange(1, len(jump_data) + 1)
+        binned = downsample_scatter(session_numbers, jump_data['jump_count'], ax1, jump_data['score'])
+        if binned is None:
+            scatter = ax1.scatter(session_numbers, jump_data['jump_count'],
+                                  c=jump_data['score'], cmap='viridis', alpha=0.7,
+                                  s=100, edgecolors='black', linewidth=1)
+        else:
+            # Too many sessions to draw one by one: one marker per occupied cell, colored by mean score
+            x, y, counts, scores = binned
+            scatter = ax1.scatter(x, y, c=scores, cmap='viridis', alpha=0.7, s=marker_sizes(counts, 10))
         ax1.set_title('Jump Frequency per Session')
         ax1.set_xlabel('Session Number')
         ax1.set_ylabel('Number of Jumps')
@@ -489,6 +770,8 @@ class StatsWindow:
         canvas1 = FigureCanvasTkAgg(fig1, master=jump_frame)
         canvas1.draw()
         canvas1.get_tk_widget().pack(fill="both", expand=True)
+        self.jump_plot = (ax1, scatter, canvas1)
+        self.redownsample_on_resize(canvas1, self.update_jump_plot)
 
         # 2. Histogram: Completion Time
         time_frame = ttk.LabelFrame(scrollable_frame, text="Completion Time Distribution")
@@ -500,11 +783,16 @@ class StatsWindow:
         # Create histogram without density curve
         n, bins, patches = ax2.hist(time_data, bins=10, alpha=0.7, color='skyblue', edgecolor='black')
 
-        # Add lines for mean and median
+        # Add lines for mean, median and p90 (percentiles from the sketches)
         mean_time = time_data.mean()
-        median_time = time_data.median()
-        ax2.axvline(mean_time, color='red', linestyle='--', linewidth=1.5, label=f'Mean: {mean_time:.1f}s')
-        ax2.axvline(median_time, color='green', linestyle='-.', linewidth=1.5, label=f'Median: {median_time:.1f}s')
+        time_percentiles = self.sketches.percentiles('completion_time')
+        marker_lines = {'mean': ax2.axvline(mean_time, color='red', linestyle='--', linewidth=1.5,
+                                            label=f'Mean: {mean_time:.1f}s')}
+        if time_percentiles[50] is not None:
+            marker_lines[50] = ax2.axvline(time_percentiles[50], color='green', linestyle='-.', linewidth=1.5,
+                                           label=f'Median: {time_percentiles[50]:.1f}s')
+            marker_lines[90] = ax2.axvline(time_percentiles[90], color='purple', linestyle=':', linewidth=1.5,
+                                           label=f'p90: {time_percentiles[90]:.1f}s')
 
         ax2.set_title('Distribution of Completion Times')
         ax2.set_xlabel('Completion Time (seconds)')
@@ -515,6 +803,7 @@ class StatsWindow:
         canvas2 = FigureCanvasTkAgg(fig2, master=time_frame)
         canvas2.draw()
         canvas2.get_tk_widget().pack(fill="both", expand=True)
+        self.time_plot = (ax2, bins, patches, marker_lines, canvas2)
 
         # 3. Combined graph: Score vs. Distance & Coins
         combined_frame = ttk.LabelFrame(scrollable_frame, text="Performance Correlation Analysis")
@@ -522,9 +811,15 @@ class StatsWindow:
 
         fig3, ax3 = plt.subplots(figsize=(8, 5))
 
-        # Primary scatter plot: Distance vs Score
-        scatter1 = ax3.scatter(self.stats_df['distance_traveled'], self.stats_df['score'],
-                               alpha=0.7, s=80, label='Score vs Distance', c='blue')
+        # Primary scatter plot: Distance vs Score (density binned when there are too many sessions)
+        distance = self.stats_df['distance_traveled']
+        binned = downsample_scatter(distance, self.stats_df['score'], ax3)
+        if binned is None:
+            scatter1 = ax3.scatter(distance, self.stats_df['score'],
+                                   alpha=0.7, s=80, label='Score vs Distance', c='blue')
+        else:
+            x, y, counts, _ = binned
+            scatter1 = ax3.scatter(x, y, alpha=0.7, s=marker_sizes(counts, 8), label='Score vs Distance', c='blue')
         ax3.set_xlabel('Distance Traveled')
         ax3.set_ylabel('Score', color='blue')
         ax3.tick_params(axis='y', labelcolor='blue')
@@ -532,8 +827,14 @@ class StatsWindow:
 
         # Create second y-axis for coins
         ax4 = ax3.twinx()
-        scatter2 = ax4.scatter(self.stats_df['distance_traveled'], self.stats_df['coins_collected'],
-                               alpha=0.7, s=60, label='Coins vs Distance', c='green', marker='s')
+        binned = downsample_scatter(distance, self.stats_df['coins_collected'], ax4)
+        if binned is None:
+            scatter2 = ax4.scatter(distance, self.stats_df['coins_collected'],
+                                   alpha=0.7, s=60, label='Coins vs Distance', c='green', marker='s')
+        else:
+            x, y, counts, _ = binned
+            scatter2 = ax4.scatter(x, y, alpha=0.7, s=marker_sizes(counts, 6), label='Coins vs Distance',
+                                   c='green', marker='s')
         ax4.set_ylabel('Coins Collected', color='green')
         ax4.tick_params(axis='y', labelcolor='green')
 
@@ -547,10 +848,137 @@ class StatsWindow:
         canvas3 = FigureCanvasTkAgg(fig3, master=combined_frame)
         canvas3.draw()
         canvas3.get_tk_widget().pack(fill="both", expand=True)
+        self.correlation_plot = (ax3, scatter1, ax4, scatter2, canvas3)
+        self.redownsample_on_resize(canvas3, self.update_correlation_plot)
+
+    def redownsample_on_resize(self, canvas, redraw):
+        """Redo a downsampled plot once its canvas widget has been resized (budgets follow its pixels)"""
+        def on_configure(event):
+            if self.resize_jobs.get(canvas):
+                self.window.after_cancel(self.resize_jobs[canvas])
+            self.resize_jobs[canvas] = self.window.after(self.RESIZE_DELAY_MS, resized)
+
+        def resized():
+            self.resize_jobs[canvas] = None
+            redraw()
+
+        # add='+' keeps the canvas's own handler, which resizes the figure first
+        canvas.get_tk_widget().bind("<Configure>", on_configure, add="+")
+
+    def update_jump_plot(self):
+        """Jump frequency: new offsets (and colors) for the same scatter"""
+        ax1, scatter, canvas1 = self.jump_plot
+        jump_data = self.stats_df.sort_values('timestamp')
+        self.update_scatter(scatter, ax1, np.arange(1, len(jump_data) + 1), jump_data['jump_count'], 100,
+                            jump_data['score'])
+        canvas1.draw_idle()
+
+    def update_correlation_plot(self):
+        """Correlation: both scatters get the current points"""
+        ax3, scatter1, ax4, scatter2, canvas3 = self.correlation_plot
+        distance = self.stats_df['distance_traveled']
+        self.update_scatter(scatter1, ax3, distance, self.stats_df['score'], 80)
+        self.update_scatter(scatter2, ax4, distance, self.stats_df['coins_collected'], 60)
+        canvas3.draw_idle()
+
+    def update_detailed_graphs(self):
+        """Extend the Additional Graphs tab's existing artists with the current sessions"""
+        self.update_jump_plot()
+
+        # Completion time: new bar heights over the original bins, and moved marker lines
+        ax2, bins, patches, marker_lines, canvas2 = self.time_plot
+        time_data = self.stats_df['completion_time'].dropna()
+        counts, _ = np.histogram(np.clip(time_data, bins[0], bins[-1]), bins=bins)
+        for patch, count in zip(patches, counts):
+            patch.set_height(count)
+        values = {'mean': time_data.mean(), **self.sketches.percentiles('completion_time')}
+        names = {'mean': 'Mean', 50: 'Median', 90: 'p90'}
+        for key, line in marker_lines.items():
+            line.set_xdata([values[key], values[key]])
+            line.set_label(f'{names[key]}: {values[key]:.1f}s')
+        ax2.legend()
+        ax2.relim()
+        ax2.autoscale_view()
+        canvas2.draw_idle()
+
+        self.update_correlation_plot()
+
+    @staticmethod
+    def update_scatter(scatter, ax, x, y, size, values=None):
+        """Point an existing scatter at new data, density binned when crowded (see plot_downsample)"""
+        binned = downsample_scatter(x, y, ax, values)
+        if binned is None:
+            offsets = np.column_stack([x, y])
+            sizes = [size]
+        else:
+            x, y, counts, values = binned
+            offsets = np.column_stack([x, y])
+            sizes = marker_sizes(counts, size / 10)
+        scatter.set_offsets(offsets)
+        scatter.set_sizes(sizes)
+        if values is not None:
+            scatter.set_array(np.asarray(values, dtype=float))
+            scatter.autoscale()  # Color scale follows the new values
+        # Collections aren't part of relim(); data only grows, so widening the limits is enough
+        ax.update_datalim(offsets)
+        ax.autoscale_view()
+
+    def poll_stats(self):
+        """Check the stats store for newly saved sessions, then schedule the next check"""
+        try:
+            new = self.watcher.poll()
+            if new is not None and not new.empty:
+                self.add_sessions(new)
+        except Exception as e:
+            print(f"Error updating stats: {e}")
+        self.poll_job = self.window.after(self.LIVE_POLL_MS, self.poll_stats)
+
+    def add_sessions(self, new):
+        """Fold newly saved sessions into every tab, updating widgets and artists in place"""
+        known = set(self.stats_df['session_id'].astype(str))
+        new = new[~new['session_id'].astype(str).isin(known)]
+        if new.empty:
+            return
+        self.stats_df = pd.concat([self.stats_df, new], ignore_index=True)
+        self.stats_df['death_cause'] = self.stats_df['death_cause'].astype('category')
+        self.latest_time = self.stats_df['timestamp'].max()
+
+        # The aggregate, sketches, rollups and leaderboard are all incremental
+        self.overview_aggregate.update(new)
+        rows = new.sort_values('timestamp').to_dict('records')
+        for row in rows:
+            self.sketches.add(row)
+            self.rollups.add(row)
+            self.leaderboard.add(row)
+
+        for group, texts in self.overview_texts().items():
+            for label, text in zip(self.overview_labels[group], texts):
+                label.configure(text=text)
+
+        # Newest first in the default (time, descending) order; otherwise at the end until re-sorted
+        newest_first = self.sort_var.get() == "timestamp" and not self.sort_ascending.get()
+        for row in rows:
+            self.insert_session_row(row, 0 if newest_first else "end")
+        self.populate_leaderboard_table()
+
+        if getattr(self, 'trend_lines', None) is not None:
+            self.draw_trend_chart()
+            self.update_coins_chart()
+            self.update_death_chart()
+        if getattr(self, 'correlation_plot', None) is not None:
+            self.update_detailed_graphs()
 
     def on_close(self):
         """Handle window close event"""
         try:
+            # Stop watching the stats store
+            if getattr(self, 'poll_job', None):
+                self.window.after_cancel(self.poll_job)
+                self.poll_job = None
+            for job in getattr(self, 'resize_jobs', {}).values():
+                if job:
+                    self.window.after_cancel(job)
+
             plt.close('all')  # Close all matplotlib figures
 
             # Unbind all mouse wheel bindings
@@ -0,0 +1,161 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+# Tournament games never open a window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from game_env import GameEnv
+from game_manager import GameManager
+from stats_store import SUMMARY_FILE, SAMPLES_FILE, prepare_stats_files
+from policies import POLICIES, make_policy
+
+
+# One environment per worker process, reused across games
+_worker_env = None
+
+
+def get_worker_env():
+    """Return this process's GameEnv, creating it on first use"""
+    global _worker_env
+    if _worker_env is None:
+        _worker_env = GameEnv()
+    return _worker_env
+
+
+def run_game(seed, policy_name, max_frames, session_prefix):
+    """Play one seeded headless game and return its result with its GameManager stats rows"""
+    env = get_worker_env()
+    env.reset(seed)
+    game_manager = env.window.game_manager
+    # Timestamps collide across thousands of games, so derive the id from the seed
+    game_manager.session_id = f"{session_prefix}{seed}"
+
+    policy = make_policy(policy_name, seed)
+    frames = 0
+    done = False
+    while not done and frames < max_frames:
+        _, _, done, _ = env.step(policy(env))
+        frames += 1
+
+    if not game_manager.game_over:
+        # Survived until the frame cap
+        game_manager.end_timer()
+
+    return {
+        'seed': seed,
+        'frames': frames,
+        'score': game_manager.score,
+        'death_cause': env.death_cause(),
+        'summary': game_manager.get_summary_row(env.window.player),
+        'samples': game_manager.data_points,
+    }
+
+
+def run_batch(seeds, policy_name, max_frames, session_prefix):
+    """Worker task: play a batch of seeds and report timing for throughput stats"""
+    start = time.perf_counter()
+    results = [run_game(seed, policy_name, max_frames, session_prefix) for seed in seeds]
+    return os.getpid(), time.perf_counter() - start, results
+
+
+def run_tournament(seeds, policy_name='jumper', workers=None, max_frames=36000, batch_size=8,
+                   progress=None):
+    """Play every seed on a process pool; returns (results sorted by seed, per-worker stats)
+
+    Each game depends only on its seed, so the results are identical for any
+    worker count or batch size.
+    """
+    session_prefix = datetime.now().strftime("%Y%m%d%H%M%S") + "_"
+    batches = [seeds[i:i + batch_size] for i in range(0, len(seeds), batch_size)]
+    results = []
+    worker_stats = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_batch, batch, policy_name, max_frames, session_prefix)
+                   for batch in batches]
+        # Stream results back as batches finish
+        for future in as_completed(futures):
+            pid, elapsed, batch_results = future.result()
+            stats = worker_stats.setdefault(pid, {'games': 0, 'frames': 0, 'seconds': 0.0})
+            stats['games'] += len(batch_results)
+            stats['frames'] += sum(result['frames'] for result in batch_results)
+            stats['seconds'] += elapsed
+            results.extend(batch_results)
+            if progress:
+                progress(len(results), len(seeds))
+
+    results.sort(key=lambda result: result['seed'])
+    return results, worker_stats
+
+
+def write_results(results, summary_file=SUMMARY_FILE, samples_file=SAMPLES_FILE):
+    """Write every game's stats rows in GameManager's format with one batched write per file"""
+    prepare_stats_files(summary_file, samples_file)
+
+    summaries = [result['summary'] for result in results]
+    samples = [row for result in results for row in result['samples']]
+    GameManager.write_stats_rows(summaries, samples, summary_file, samples_file)
+    return len(summaries), len(samples)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run seeded headless CoinDash games on a process pool")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play")
+    parser.add_argument('--seed-start', type=int, default=0, help="first seed (seeds are consecutive)")
+    parser.add_argument('--policy', choices=list(POLICIES), default='jumper', help="scripted input policy")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=8, help="games per worker task")
+    parser.add_argument('--max-frames', type=int, default=36000,
+                        help="frame cap per game (default: 10 minutes at 60 FPS)")
+    parser.add_argument('--output', default=SUMMARY_FILE,
+                        help=f"summary file to append to (default: {SUMMARY_FILE})")
+    parser.add_argument('--samples-output', default=SAMPLES_FILE,
+                        help=f"samples file to append to (default: {SAMPLES_FILE})")
+    parser.add_argument('--no-write', action='store_true', help="don't write results to the stats file")
+    args = parser.parse_args(argv)
+
+    seeds = list(range(args.seed_start, args.seed_start + args.games))
+    start = time.perf_counter()
+    last_report = [0.0]
+
+    def progress(done, total):
+        now = time.perf_counter()
+        if done == total or now - last_report[0] >= 1.0:
+            last_report[0] = now
+            rate = done / (now - start)
+            print(f"\r{done}/{total} games ({rate:,.1f} games/s)", end="", file=sys.stderr, flush=True)
+
+    results, worker_stats = run_tournament(seeds, args.policy, args.workers, args.max_frames,
+                                           args.batch_size, progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    print(f"Played {len(results)} games in {elapsed:.1f}s with policy '{args.policy}'")
+    for pid, stats in sorted(worker_stats.items()):
+        print(f"  worker {pid}: {stats['games']} games, "
+              f"{stats['frames'] / stats['seconds']:,.0f} frames/s, "
+              f"{stats['games'] / stats['seconds']:,.1f} games/s")
+
+    scores = [result['score'] for result in results]
+    if scores:
+        print(f"Average score: {sum(scores) / len(scores):.1f}  High score: {max(scores)}")
+    causes = {}
+    for result in results:
+        cause = result['death_cause'] or 'survived'
+        causes[cause] = causes.get(cause, 0) + 1
+    print("Outcomes: " + ", ".join(f"{cause}={count}" for cause, count in sorted(causes.items())))
+
+    if not args.no_write:
+        sessions, samples = write_results(results, args.output, args.samples_output)
+        print(f"Wrote {sessions} sessions to {args.output} and {samples} samples to {args.samples_output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
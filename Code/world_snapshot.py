@@ -0,0 +1,150 @@
+import base64
+
+import numpy as np
+
+from coin_field import COIN_RADIUS, COIN_VALUE, pickup_boxes
+from obstacle import Obstacle
+from platform_obj import Platform
+
+
+PLAYER_FIELDS = ('x', 'y', 'velocity_x', 'velocity_y', 'on_ground', 'facing_right', 'is_jumping',
+                 'score', 'coins_collected', 'jump_count', 'distance_traveled')
+
+WINDOW_FIELDS = ('camera_offset_x', 'scroll_speed', 'distance_traveled', 'distance_in_meters',
+                 'last_platform_x', 'last_main_platform', 'checked_segments', 'unreachable_segments',
+                 'current_delay', 'frame_count', 'combo_counter', 'combo_timer', 'paused')
+
+MANAGER_FIELDS = ('score', 'game_over', 'game_completed', 'death_count', 'completion_time',
+                  'start_time', 'last_data_collection')
+
+
+class WorldSnapshot:
+    """Copy of the mutable simulation state of a GameWindow.
+
+    Level geometry is shared with the live game: platforms, obstacles and
+    the coin field's position/radius/value arrays are referenced, never
+    copied, and only the fields the simulation mutates (the coins' collected
+    mask, moving obstacle positions and directions, player/camera/combo/
+    manager values and the RNG state) are duplicated. Particles are purely
+    visual and are not captured.
+    """
+
+    __slots__ = ('player', 'window', 'manager', 'death_causes', 'data_points', 'rng_state',
+                 'platforms', 'coins', 'coin_collected', 'obstacles', 'moving_obstacles', 'moving_state')
+
+    @classmethod
+    def capture(cls, game):
+        """Capture the current state of a GameWindow"""
+        snapshot = cls()
+        player = game.player
+        manager = game.game_manager
+        snapshot.player = tuple([getattr(player, field) for field in PLAYER_FIELDS])
+        snapshot.window = tuple([getattr(game, field) for field in WINDOW_FIELDS])
+        snapshot.manager = tuple([getattr(manager, field) for field in MANAGER_FIELDS])
+        snapshot.death_causes = tuple(manager.death_causes.items())
+        snapshot.data_points = tuple(manager.data_points)
+        snapshot.rng_state = game.rng.getstate()
+
+        # Entity lists are shared by reference; only their mutable fields are copied
+        snapshot.platforms = tuple(game.platforms)
+        snapshot.coins = game.coins.columns()
+        snapshot.coin_collected = game.coins.collected.copy()
+        snapshot.obstacles = tuple(game.obstacles)
+        snapshot.moving_obstacles = tuple(game.moving_obstacles)
+        snapshot.moving_state = tuple([(obstacle.x, obstacle.speed) for obstacle in snapshot.moving_obstacles])
+        return snapshot
+
+    def restore(self, game):
+        """Put a GameWindow back into the captured state"""
+        player = game.player
+        for field, value in zip(PLAYER_FIELDS, self.player):
+            setattr(player, field, value)
+        for field, value in zip(WINDOW_FIELDS, self.window):
+            setattr(game, field, value)
+
+        manager = game.game_manager
+        for field, value in zip(MANAGER_FIELDS, self.manager):
+            setattr(manager, field, value)
+        manager.death_causes = dict(self.death_causes)
+        manager.data_points = list(self.data_points)
+        if self.rng_state is not None:
+            game.rng.setstate(self.rng_state)
+
+        game.platforms = list(self.platforms)
+        x, y, radius, value, boxes = self.coins
+        game.coins.set_columns(x, y, radius, value, self.coin_collected.copy(), boxes)
+        game.obstacles = list(self.obstacles)
+        game.moving_obstacles = list(self.moving_obstacles)
+        for obstacle, (x, speed) in zip(self.moving_obstacles, self.moving_state):
+            obstacle.x = x
+            obstacle.speed = speed
+        game.particles = []
+
+    def to_dict(self):
+        """Plain-data copy of the snapshot (entities flattened to field lists) for saving to disk"""
+        window = dict(zip(WINDOW_FIELDS, self.window))
+        last_main = window['last_main_platform']
+        if last_main is not None:
+            window['last_main_platform'] = [last_main.x, last_main.y, last_main.width, last_main.height]
+
+        # Obstacles that also move are stored once, as an index into the moving list
+        moving_index = {id(obstacle): i for i, obstacle in enumerate(self.moving_obstacles)}
+        return {
+            'player': list(self.player),
+            'window': window,
+            'manager': list(self.manager),
+            'death_causes': dict(self.death_causes),
+            'data_points': list(self.data_points),
+            # The generator's 625 state words packed as base64 (about a third of their decimal size)
+            'rng_state': None if self.rng_state is None else [
+                self.rng_state[0], base64.b64encode(np.array(self.rng_state[1], dtype='<u4').tobytes()).decode(),
+                self.rng_state[2]],
+            'platforms': [[p.x, p.y, p.width, p.height] for p in self.platforms],
+            'coins': [[x, y, int(collected)] for x, y, collected in zip(self.coins[0].tolist(), self.coins[1].tolist(),
+                                                                        self.coin_collected.tolist())],
+            # Moving obstacles keep moving after capture, so use the captured x and speed
+            'moving': [[x, o.y, o.width, o.height, o.min_x, o.max_x, speed]
+                       for o, (x, speed) in zip(self.moving_obstacles, self.moving_state)],
+            'obstacles': [moving_index.get(id(o), [o.x, o.y, o.width, o.height]) for o in self.obstacles],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a snapshot (with fresh entity objects) from to_dict() output"""
+        snapshot = cls()
+        snapshot.player = tuple(data['player'])
+        window = dict(data['window'])
+        if window['last_main_platform'] is not None:
+            window['last_main_platform'] = Platform(*window['last_main_platform'])
+        snapshot.window = tuple([window[field] for field in WINDOW_FIELDS])
+        snapshot.manager = tuple(data['manager'])
+        snapshot.death_causes = tuple(data['death_causes'].items())
+        snapshot.data_points = tuple(data['data_points'])
+        rng_state = data['rng_state']
+        if rng_state is None:
+            snapshot.rng_state = None
+        else:
+            words = np.frombuffer(base64.b64decode(rng_state[1]), dtype='<u4')
+            snapshot.rng_state = (rng_state[0], tuple(words.tolist()), rng_state[2])
+
+        snapshot.platforms = tuple([Platform(*fields) for fields in data['platforms']])
+        count = len(data['coins'])
+        x = np.array([x for x, _, _ in data['coins']], dtype=np.float64)
+        y = np.array([y for _, y, _ in data['coins']], dtype=np.float64)
+        radius = np.full(count, COIN_RADIUS, dtype=np.float64)
+        snapshot.coins = (x, y, radius, np.full(count, COIN_VALUE, dtype=np.int64), pickup_boxes(x, y, radius))
+        snapshot.coin_collected = np.array([bool(collected) for _, _, collected in data['coins']], dtype=bool)
+
+        moving = []
+        for x, y, width, height, min_x, max_x, speed in data['moving']:
+            obstacle = Obstacle(x, y, width, height)
+            obstacle.min_x = min_x
+            obstacle.max_x = max_x
+            obstacle.speed = speed
+            obstacle.is_moving = True
+            moving.append(obstacle)
+        snapshot.moving_obstacles = tuple(moving)
+        snapshot.moving_state = tuple([(o.x, o.speed) for o in moving])
+        snapshot.obstacles = tuple([moving[entry] if isinstance(entry, int) else Obstacle(*entry)
+                                    for entry in data['obstacles']])
+        return snapshot